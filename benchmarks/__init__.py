@@ -0,0 +1,9 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Benchmarks for different parts of CutiePi. They run on any Linux box, hardware and cloud are replaced by
+local stand-ins (see 'stand_ins.py').
+To run (from project root directory):
+    python -m benchmarks.<benchmark_module>
+"""
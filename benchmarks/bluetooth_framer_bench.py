@@ -0,0 +1,112 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Throughput of Bluetooth reception. Hardware end of a socket pair sends signals in chunks of random size
+(several signals per chunk or a signal split across chunks), as a serial link does.
+Previous receiver (one recv per signal, then sleep of BLUETOOTH_SIGNAL_WAIT_TIME) runs for a few seconds,
+streaming receiver (poll and SignalFramer) till all signals arrive.
+    python -m benchmarks.bluetooth_framer_bench [signals] [--json results.json]
+"""
+
+import queue
+import random
+import sys
+import time
+from threading import Thread
+
+from benchmarks import report, stand_ins
+
+LEGACY_RUN_TIME = 3  # in seconds
+LEGACY_WAIT_TIME = 1  # in seconds, sleep after every recv in previous receiver
+
+
+def _signals(count):
+    return [b"%02d%d%03d%03d\r\n" % (i % 99, i % 4 + 1, i % 999, i % 1000) for i in range(count)]
+
+
+def _send(sock, signals, seed=7):
+    """Sends signals as one stream cut at random places."""
+    stream = b"".join(signals)
+    rng = random.Random(seed)
+    offset = 0
+    while offset < len(stream):
+        size = rng.randint(1, 64)
+        try:
+            sock.sendall(stream[offset:offset + size])
+        except OSError:
+            return  # Receiver closed connection.
+        offset += size
+
+
+def _legacy_receive(client, output_queue, deadline):
+    """Previous receive_signal: every recv is taken as one signal."""
+    while time.monotonic() < deadline:
+        signal_received = client.bt_sock.recv(100)
+        if client._is_valid_signal_received(signal_received):
+            output_queue.put(signal_received)
+        time.sleep(LEGACY_WAIT_TIME)
+
+
+def _run_legacy(signals):
+    from libraries import BluetoothClient
+    from benchmarks.stand_ins import FakeBluetoothSocket
+
+    client = BluetoothClient()
+    client._connect_to_hardware()
+    output_queue = queue.Queue()
+    sender = Thread(target=_send, args=(FakeBluetoothSocket.hardware_end, signals), daemon=True)
+    sender.start()
+    started = time.monotonic()
+    _legacy_receive(client, output_queue, started + LEGACY_RUN_TIME)
+    elapsed = time.monotonic() - started
+    client.bt_sock.close()
+    return {"sent": len(signals), "received": output_queue.qsize(), "seconds": elapsed,
+            "signals_per_sec": output_queue.qsize() / elapsed}
+
+
+def _run_streaming(signals):
+    from libraries import BluetoothClient
+    from benchmarks.stand_ins import FakeBluetoothSocket
+
+    client = BluetoothClient()
+    output_queue = queue.Queue()
+    client.set_output_queue(output_queue)
+    receiver = Thread(target=client.receive_signal, daemon=True)
+    receiver.start()
+    while FakeBluetoothSocket.hardware_end is None:
+        time.sleep(0.001)
+
+    started = time.monotonic()
+    _send(FakeBluetoothSocket.hardware_end, signals)
+    received = [output_queue.get(timeout=10)["message"] for _ in signals]
+    elapsed = time.monotonic() - started
+    client.terminate_connection()
+    receiver.join(2)
+
+    expected = [signal.strip().decode() for signal in signals]
+    return {"sent": len(signals), "received": len(received), "in_order": received == expected,
+            "rejected": client.rejected, "seconds": elapsed, "signals_per_sec": len(received) / elapsed}
+
+
+def run(count=50000):
+    stand_ins.install()
+    from benchmarks.stand_ins import FakeBluetoothSocket
+
+    signals = _signals(count)
+    results = {"legacy": _run_legacy(signals)}
+    FakeBluetoothSocket.hardware_end = None
+    results["streaming"] = _run_streaming(signals)
+    return results
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    json_file = report.json_path(arguments)
+    results = run(int(arguments[0]) if arguments else 50000)
+    for mode, result in results.items():
+        print("%-10s sent %6d  received %6d  in %6.2f s  %10.1f signals/s" % (
+            mode, result["sent"], result["received"], result["seconds"], result["signals_per_sec"]))
+    print("streaming: in order %s, rejected %d" % (results["streaming"]["in_order"], results["streaming"]["rejected"]))
+    if json_file:
+        report.save("bluetooth_framer", results, json_file)
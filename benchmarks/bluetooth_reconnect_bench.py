@@ -0,0 +1,84 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Time for Bluetooth reception to recover from a lost link. Hardware end of the link is closed and connections are
+refused for a given outage, then time till a signal sent by hardware reaches output queue is measured.
+(Previous receiver did not recover at all, till process was restarted.)
+    python -m benchmarks.bluetooth_reconnect_bench [outage seconds ...] [--json results.json]
+"""
+
+import queue
+import sys
+import time
+from threading import Thread
+
+from benchmarks import report, stand_ins
+
+
+def _signal(number):
+    """A different signal every time, so that every lost or repeated signal can be told apart."""
+    return b"0110%05d" % number
+
+
+def _wait_for(condition, timeout=60):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Condition not met in %s seconds." % timeout)
+        time.sleep(0.001)
+
+
+def _recover(client, output_queue, outage):
+    from benchmarks.stand_ins import FakeBluetoothSocket
+    from libraries.bluetooth_engine import STATE_CONNECTED
+
+    hardware_end = FakeBluetoothSocket.hardware_end
+    attempts = client.failed_attempts
+    lost_at = time.monotonic()
+    FakeBluetoothSocket.refuse_until = lost_at + outage
+    hardware_end.close()
+
+    _wait_for(lambda: FakeBluetoothSocket.hardware_end is not hardware_end and client.state == STATE_CONNECTED)
+    FakeBluetoothSocket.hardware_end.sendall(_signal(client.received))
+    output_queue.get(timeout=10)
+    recovered = time.monotonic() - lost_at
+    return {"outage_seconds": outage, "recovered_seconds": recovered, "overhead_seconds": recovered - outage,
+            "reported_recovery_seconds": client.last_recovery_seconds,
+            "failed_attempts": client.failed_attempts - attempts}
+
+
+def run(outages=(0, 2, 5, 10)):
+    stand_ins.install()
+    from benchmarks.stand_ins import FakeBluetoothSocket
+    from libraries import BluetoothClient
+
+    client = BluetoothClient()
+    output_queue = queue.Queue()
+    client.set_output_queue(output_queue)
+    receiver = Thread(target=client.receive_signal, daemon=True)
+    receiver.start()
+    _wait_for(lambda: FakeBluetoothSocket.hardware_end is not None)
+    FakeBluetoothSocket.hardware_end.sendall(_signal(0))
+    output_queue.get(timeout=10)
+
+    results = {"outage_%ss" % outage: _recover(client, output_queue, outage) for outage in outages}
+    results["connection_stats"] = client.connection_stats()
+    client.terminate_connection()
+    receiver.join(2)
+    return results
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    json_file = report.json_path(arguments)
+    results = run(tuple(float(argument) for argument in arguments) if arguments else (0, 2, 5, 10))
+    stats = results.pop("connection_stats")
+    for name, result in results.items():
+        print("outage %5.1f s  recovered in %6.2f s (overhead %5.2f s, %d failed attempts)" % (
+            result["outage_seconds"], result["recovered_seconds"], result["overhead_seconds"],
+            result["failed_attempts"]))
+    print("connection stats: %s" % stats)
+    results["connection_stats"] = stats
+    if json_file:
+        report.save("bluetooth_reconnect", results, json_file)
@@ -0,0 +1,48 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Messages per second for encrypting and decrypting cloud signals: a new Fernet per message (as before) against
+cached CipherEngine in each mode, single and batch (encrypt_many / decrypt_many) calls.
+    python -m benchmarks.cipher_bench [messages]
+"""
+
+import sys
+import time
+
+from benchmarks import stand_ins
+
+
+def _rate(messages, function, *args):
+    started = time.perf_counter()
+    function(*args)
+    return messages / (time.perf_counter() - started)
+
+
+def run(messages=20000):
+    stand_ins.install()
+    from os import environ as env
+    from cryptography.fernet import Fernet
+    import name_helper as nh
+    from helper import CipherEngine
+
+    signals = ["cloud/%02d/light/%03d/on" % (i % 99 + 1, i % 1000) for i in range(messages)]
+
+    def new_fernet_per_message():
+        tokens = [Fernet(env["SECRET_KEY"].encode()).encrypt(signal.encode()).decode() for signal in signals]
+        return [Fernet(env["SECRET_KEY"]).decrypt(token).decode() for token in tokens]
+
+    results = {"fernet_per_message": _rate(messages, new_fernet_per_message)}
+    for mode in (nh.CIPHER_MODE_FERNET, nh.CIPHER_MODE_AESGCM):
+        engine = CipherEngine([env["SECRET_KEY"]], mode)
+        tokens = engine.encrypt_many(signals)
+        results[mode + "_encrypt"] = _rate(messages, lambda: [engine.encrypt(signal) for signal in signals])
+        results[mode + "_decrypt"] = _rate(messages, lambda: [engine.decrypt(token) for token in tokens])
+        results[mode + "_encrypt_many"] = _rate(messages, engine.encrypt_many, signals)
+        results[mode + "_decrypt_many"] = _rate(messages, engine.decrypt_many, tokens)
+    return results
+
+
+if __name__ == "__main__":
+    for name, rate in run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000).items():
+        print("%-24s %12.0f msgs/s" % (name, rate))
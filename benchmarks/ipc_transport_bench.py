@@ -0,0 +1,93 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Transport of signals between processes: multiprocessing.Queue (before) against SharedRingQueue (after).
+A producer process puts signal dicts (as listeners do) and this process gets them:
+    throughput: signals per second when producer puts as fast as it can.
+    latency: time from put till get (monotonic_ns, same clock in both processes) at a paced rate.
+    python -m benchmarks.ipc_transport_bench [signals] [paced/s] [--json results.json]
+"""
+
+import sys
+import time
+from multiprocessing import Process, Queue
+
+from benchmarks import report, stand_ins
+
+TRANSPORTS = ("multiprocessing_queue", "shared_ring")
+
+
+def _new_queue(transport):
+    from libraries import SharedRingQueue
+    return SharedRingQueue() if transport == "shared_ring" else Queue()
+
+
+def _signal(number):
+    return {"sequence": number,
+            "message": "%02d3%03d%03d" % (number % 99 + 1, number % 999 + 1, number % 1000),
+            "protocol": "BLUETOOTH",
+            "source_type": "Bluetooth_Device",
+            "trace": {"id": "%016x" % number, "stages": [("received", time.monotonic_ns())]}}
+
+
+def _produce(signal_queue, count, rate):
+    started = time.monotonic()
+    for number in range(count):
+        if rate:
+            delay = started + number / rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        signal = _signal(number)
+        signal["sent_at"] = time.monotonic_ns()
+        signal_queue.put(signal)
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def measure(transport, count, rate=None):
+    """
+    :param rate: signals per second put by producer, None for as fast as it can.
+    :return: dict with signals per second and latency percentiles (milliseconds).
+    """
+    signal_queue = _new_queue(transport)
+    producer = Process(target=_produce, args=(signal_queue, count, rate), daemon=True)
+    latencies = []
+    started = time.monotonic()
+    producer.start()
+    for _ in range(count):
+        signal = signal_queue.get()
+        latencies.append(time.monotonic_ns() - signal["sent_at"])
+    elapsed = time.monotonic() - started
+    producer.join()
+    signal_queue.close()
+    return {"signals_per_sec": count / elapsed,
+            "p50_ms": _percentile(latencies, 50) / 1e6,
+            "p99_ms": _percentile(latencies, 99) / 1e6,
+            "max_ms": max(latencies) / 1e6}
+
+
+def run(signals=100000, paced_rate=1000):
+    stand_ins.install()
+    results = {"signals": signals, "paced_per_sec": paced_rate}
+    for transport in TRANSPORTS:
+        results[transport] = {"throughput": measure(transport, signals),
+                              "paced": measure(transport, min(signals, int(paced_rate * 5)), paced_rate)}
+    return results
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    json_file = report.json_path(arguments)
+    values = [int(float(argument)) for argument in arguments]
+    results = run(*values)
+    for transport in TRANSPORTS:
+        throughput, paced = results[transport]["throughput"], results[transport]["paced"]
+        print("%-22s %10.0f signals/s   paced %d/s: p50 %7.3f ms  p99 %7.3f ms  max %7.3f ms" % (
+            transport, throughput["signals_per_sec"], results["paced_per_sec"],
+            paced["p50_ms"], paced["p99_ms"], paced["max_ms"]))
+    if json_file:
+        report.save("ipc_transport", results, json_file)
@@ -0,0 +1,111 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Milliseconds per LCD update for typical status changes: clear and rewrite every character (as before) against
+writing only changed cells (shadow screen). GPIO is simulated, delays of LCD protocol are real.
+Also microseconds per byte written on data pins: bit by bit (as before) against one multi-pin write.
+    python -m benchmarks.lcd_render_bench [--json results.json]
+"""
+
+import sys
+import time
+
+from benchmarks import report, stand_ins
+
+# (previous message, new message)
+STATUS_CHANGES = {
+    "one_digit": ("Tank 12: 045%   Motor 3: ON", "Tank 12: 046%   Motor 3: ON"),
+    "one_word": ("Tank 12: 045%   Motor 3: ON", "Tank 12: 045%   Motor 3: OFF"),
+    "same_message": ("Tank 12: 045%   Motor 3: ON", "Tank 12: 045%   Motor 3: ON"),
+    "new_screen": ("Tank 12: 045%   Motor 3: ON", "Hello..! Welcome to the IoT world."),
+    "short_after_long": ("Hello..! Welcome to the IoT world.", "OK"),
+}
+
+
+def _full_redraw(lcd, message):
+    """Previous display_message: clear screen and write every character."""
+    lcd.lcd_clear()
+    count_chars = 0
+    for char in message:
+        if count_chars == 16:
+            lcd.go_to_second_line()
+        if count_chars == 32:
+            lcd.go_to_first_line()
+            count_chars = 0
+        lcd.display_char(char)
+        count_chars += 1
+
+
+def _measure(lcd, previous, message, display, gpio):
+    display(lcd, previous)
+    writes = gpio.writes
+    started = time.perf_counter()
+    display(lcd, message)
+    return {"ms": (time.perf_counter() - started) * 1000, "gpio_writes": gpio.writes - writes}
+
+
+def _bit_by_bit_write(gpio, pins, byte):
+    """Previous write_to_lcd_8_bits: binary string padded and reversed, one GPIO call per data pin."""
+    raw_bits = bin(byte).lstrip('0b')
+    bits = ('0' * (8 - len(raw_bits)) + raw_bits)[::-1]
+    for i in range(8):
+        gpio.output(int(pins["d" + str(i)]), bool(int(bits[i])))
+
+
+def _byte_write(gpio, rounds=20000):
+    import json
+    import os
+    from libraries.gpio_engine import OutputBus
+
+    with open(os.path.join(os.environ["CONFIG_DIR"], 'lcd_connection.json')) as lcd_conn:
+        pins = json.load(lcd_conn)
+    bus = OutputBus(gpio, [pins["d" + str(i)] for i in range(8)])
+    data = [byte % 256 for byte in range(rounds)]
+
+    started = time.perf_counter()
+    for byte in data:
+        _bit_by_bit_write(gpio, pins, byte)
+    bit_by_bit = (time.perf_counter() - started) / rounds * 1000000
+
+    started = time.perf_counter()
+    for byte in data:
+        bus.write(byte)
+    multi_pin = (time.perf_counter() - started) / rounds * 1000000
+    return {"bit_by_bit_us": bit_by_bit, "multi_pin_us": multi_pin}
+
+
+def run():
+    stand_ins.install()
+    import execute  # Imported first, as in app (monitor and execute import each other).
+    from monitor import LcdEngine
+    from libraries.gpio_engine import get_gpio
+
+    gpio = get_gpio()
+    lcd = LcdEngine()
+    lcd.prepare()
+
+    results = {}
+    for name, (previous, message) in STATUS_CHANGES.items():
+        results[name] = {
+            "full_redraw": _measure(lcd, previous, message, _full_redraw, gpio),
+            "diff": _measure(lcd, previous, message, LcdEngine.display_message, gpio),
+        }
+    results["byte_write"] = _byte_write(gpio)
+    return results
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    json_file = report.json_path(arguments)
+    results = run()
+    byte_write = results.pop("byte_write")
+    for name, result in results.items():
+        print("%-18s full redraw %7.1f ms (%4d GPIO writes)   diff %7.1f ms (%4d GPIO writes)" % (
+            name, result["full_redraw"]["ms"], result["full_redraw"]["gpio_writes"],
+            result["diff"]["ms"], result["diff"]["gpio_writes"]))
+    print("byte write         bit by bit %6.2f us   multi-pin %6.2f us" % (
+        byte_write["bit_by_bit_us"], byte_write["multi_pin_us"]))
+    results["byte_write"] = byte_write
+    if json_file:
+        report.save("lcd_render", results, json_file)
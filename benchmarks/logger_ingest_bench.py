@@ -0,0 +1,97 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Idle CPU usage and added latency of ReceivedSignalsLogger: 10 ms timeout polling of both queues (before)
+against blocking wait on both queues (after). Linux only (CPU time is read from /proc).
+    python -m benchmarks.logger_ingest_bench [idle_seconds] [signals]
+"""
+
+import os
+import queue as qq
+import sys
+import tempfile
+import time
+from multiprocessing import Queue
+
+from benchmarks import stand_ins
+
+
+def _cpu_seconds(pid):
+    with open("/proc/%d/stat" % pid) as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")  # utime + stime
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def _polling_logger_class():
+    import name_helper as nh
+    from core import ReceivedSignalsLogger
+
+    class PollingSignalsLogger(ReceivedSignalsLogger):
+        """Ingest loop as it was before: alternate get(timeout=QUEUE_WAIT_TIME) on both queues."""
+
+        def run(self):
+            from core.signal_package import SignalWriter
+            with SignalWriter(self._file) as signal_writer:
+                while True:
+                    try:
+                        self._log_cloud_signal(signal_writer,
+                                               self._from_cloud_queue.get(timeout=nh.QUEUE_WAIT_TIME))
+                    except qq.Empty:
+                        pass
+                    try:
+                        self._log_hardware_signal(signal_writer,
+                                                  self._from_hardware_queue.get(timeout=nh.QUEUE_WAIT_TIME))
+                    except qq.Empty:
+                        pass
+                    signal_writer.flush_if_due()
+
+    return PollingSignalsLogger
+
+
+def measure(logger_class, idle_seconds, signals):
+    cloud_queue, hardware_queue, to_process_queue = Queue(), Queue(), Queue()
+    logger = logger_class(cloud_queue, hardware_queue, to_process_queue)
+    logger.start()
+    time.sleep(0.5)  # Let process settle.
+
+    cpu_start = _cpu_seconds(logger.pid)
+    time.sleep(idle_seconds)
+    idle_cpu = (_cpu_seconds(logger.pid) - cpu_start) / idle_seconds * 100
+
+    latencies = []
+    for i in range(signals):
+        hardware_queue.put({"message": "hardware&0131001%03d" % (i % 1000), "protocol": "BLUETOOTH",
+                            "source_type": "Bluetooth_Device", "sequence": i, "sent_at": time.monotonic()})
+        _, signal = to_process_queue.get()
+        latencies.append((time.monotonic() - signal["sent_at"]) * 1000)
+        time.sleep(0.003)  # Arrive at random points of the polling cycle.
+
+    logger.terminate()
+    logger.join()
+    return {"idle_cpu_percent": idle_cpu,
+            "latency_ms_mean": sum(latencies) / len(latencies),
+            "latency_ms_p99": _percentile(latencies, 99)}
+
+
+def run(idle_seconds=5, signals=500):
+    stand_ins.install()
+    os.environ["HOME_DIR"] = tempfile.mkdtemp(prefix="cutiepi_bench_")
+    from core import ReceivedSignalsLogger
+    from core.signal_package import SignalFileHandler
+
+    SignalFileHandler().active_file()
+    return {"polling": measure(_polling_logger_class(), idle_seconds, signals),
+            "event_driven": measure(ReceivedSignalsLogger, idle_seconds, signals)}
+
+
+if __name__ == "__main__":
+    arguments = [float(sys.argv[1]) if len(sys.argv) > 1 else 5, int(sys.argv[2]) if len(sys.argv) > 2 else 500]
+    for mode, result in run(*arguments).items():
+        print("%-14s idle CPU %6.2f %%   latency mean %7.3f ms   p99 %7.3f ms" % (
+            mode, result["idle_cpu_percent"], result["latency_ms_mean"], result["latency_ms_p99"]))
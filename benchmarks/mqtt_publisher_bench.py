@@ -0,0 +1,52 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Throughput of MQTT transmission: connect-per-message (MqttClient.transmit_signal) against
+the persistent publisher (MqttPublisher.transmit_signal), both talking to local stand-in broker.
+    python -m benchmarks.mqtt_publisher_bench [messages]
+"""
+
+import sys
+import time
+
+from benchmarks import stand_ins
+
+
+def _rate(count, seconds):
+    return count / seconds if seconds else float("inf")
+
+
+def run(messages=2000, legacy_messages=5):
+    broker = stand_ins.install()
+    from paho.mqtt import client as mqtt
+    from libraries import MqttClient, MqttPublisher
+
+    started = time.perf_counter()
+    for i in range(legacy_messages):
+        MqttClient(mqtt.Client(client_id="bench_legacy")).transmit_signal("cutiepi/tx", "signal-%d" % i)
+    legacy_time = time.perf_counter() - started
+    legacy_connections = broker.connections
+
+    publisher = MqttPublisher(mqtt.Client(client_id="bench_persistent"))
+    started = time.perf_counter()
+    for i in range(messages):
+        publisher.transmit_signal("cutiepi/tx", "signal-%d" % i)
+    persistent_time = time.perf_counter() - started
+    publisher.stop()
+
+    return {
+        "connect_per_message": {"messages": legacy_messages, "seconds": legacy_time,
+                                "msgs_per_sec": _rate(legacy_messages, legacy_time),
+                                "connections": legacy_connections},
+        "persistent": {"messages": messages, "seconds": persistent_time,
+                       "msgs_per_sec": _rate(messages, persistent_time),
+                       "connections": broker.connections - legacy_connections},
+    }
+
+
+if __name__ == "__main__":
+    results = run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
+    for mode, result in results.items():
+        print("%-20s %6d msgs  %8.3f s  %10.1f msgs/s  %d connection(s)" % (
+            mode, result["messages"], result["seconds"], result["msgs_per_sec"], result["connections"]))
@@ -0,0 +1,174 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Load test of whole app: real Initiation (listeners, logger, processor with its workers, rf433 transmitter)
+runs against local stand-ins (MQTT Broker, Bluetooth socket, simulated GPIO). Encrypted cloud commands are
+published on reception channel and hardware telemetry is sent over Bluetooth link at given rates, then
+sustained throughput, queue depths and latencies of every stage (trace snapshots of each process) are reported.
+p99 of "command to RF" is total_transmitted: from reception of MQTT message till its rf433 code is sent.
+    python -m benchmarks.pipeline_load_bench [seconds] [cloud/s] [hardware/s] [--json results.json]
+"""
+
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+from threading import Thread
+
+from benchmarks import report, stand_ins
+
+DRAIN_TIMEOUT = 60  # in seconds, for queued signals to be handled after load stops
+SAMPLE_INTERVAL = 0.1  # in seconds, between two samples of queue depths
+
+
+def _cloud_commands(count):
+    from helper import encrypt_signal_for_cloud as encrypt
+    return [encrypt("cloud/%d/light/%d/%s" % (i % 99 + 1, i % 999 + 1, "on" if i % 2 else "off"))
+            for i in range(count)]
+
+
+def _hardware_signals(count):
+    # Values change with every signal, as readings of real sensors.
+    return [b"%02d3%03d%03d" % (i % 99 + 1, i % 999 + 1, i % 1000) for i in range(count)]
+
+
+def _paced(rate, items, send):
+    """Sends items at given rate (per second), deadlines are kept from start so delays do not add up."""
+    started = time.monotonic()
+    for i, item in enumerate(items):
+        delay = started + i / rate - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        send(item)
+
+
+def _sampler(cutie_pi, samples, stop):
+    while not stop:
+        depths = cutie_pi.queue_depths()
+        processor = cutie_pi.supervisor.instance("signal_processor")
+        depths["rf433_transmitter"] = int(processor.transmitter_stats()["depth"]) if processor else 0
+        samples.append(depths)
+        time.sleep(SAMPLE_INTERVAL)
+
+
+def _depth_summary(samples):
+    summary = {}
+    for name in samples[0]:
+        values = [sample[name] for sample in samples]
+        summary[name] = {"max": max(values), "mean": sum(values) / len(values)}
+    return summary
+
+
+def _drained(cutie_pi):
+    processor = cutie_pi.supervisor.instance("signal_processor")
+    return not any(cutie_pi.queue_depths().values()) and \
+        (processor is None or not processor.transmitter_stats()["depth"])
+
+
+def _trace_snapshots(directory):
+    snapshots = {}
+    for file_name in glob.glob(os.path.join(directory, "latency_*.json")):
+        with open(file_name) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+        snapshots[snapshot["process"]] = snapshot
+    return snapshots
+
+
+def run(seconds=10, cloud_rate=5, hardware_rate=20):
+    home_dir = tempfile.mkdtemp(prefix="cutiepi_load_")
+    os.environ["HOME_DIR"] = home_dir
+    broker = stand_ins.install()
+
+    import name_helper as nh
+    nh.TRACE_SNAPSHOT_INTERVAL = 0.5  # Inherited by every process of app.
+    from execute import Initiation
+    from benchmarks.stand_ins import FakeBluetoothSocket, FakeMqttClient
+
+    cloud = _cloud_commands(int(seconds * cloud_rate))
+    hardware = _hardware_signals(int(seconds * hardware_rate))
+
+    cutie_pi = Initiation()
+    cutie_pi.initiate()
+    deadline = time.monotonic() + 10
+    while FakeBluetoothSocket.hardware_end is None or not broker._subscribers:
+        if time.monotonic() > deadline:
+            raise TimeoutError("Listeners did not start.")
+        time.sleep(0.01)
+
+    user_app = FakeMqttClient(client_id="user_app")
+    user_app.connect(os.environ["MQTT_HOST"])
+    channel = os.environ["MQTT_RECEPTION_CHANNEL"]
+
+    samples, stop_sampling = [], []
+    sampler = Thread(target=_sampler, args=(cutie_pi, samples, stop_sampling), daemon=True)
+    generators = [Thread(target=_paced, args=(cloud_rate, cloud, lambda c: user_app.publish(channel, c)), daemon=True),
+                  Thread(target=_paced, args=(hardware_rate, hardware, FakeBluetoothSocket.hardware_end.sendall),
+                         daemon=True)]
+    started = time.monotonic()
+    sampler.start()
+    for generator in generators:
+        generator.start()
+    for generator in generators:
+        generator.join()
+    load_seconds = time.monotonic() - started
+
+    deadline = time.monotonic() + DRAIN_TIMEOUT
+    while not _drained(cutie_pi) and time.monotonic() < deadline:
+        time.sleep(SAMPLE_INTERVAL)
+    drain_seconds = time.monotonic() - started - load_seconds
+    stop_sampling.append(True)
+    sampler.join()
+    time.sleep(3 * nh.TRACE_SNAPSHOT_INTERVAL)  # Let every process write its final numbers.
+
+    processor = cutie_pi.supervisor.instance("signal_processor")
+    transmitter = processor.transmitter_stats()
+    snapshots = _trace_snapshots(os.path.join(home_dir, nh.TRACE_SNAPSHOT_DIR))
+    cutie_pi.stop()
+
+    stages = {}
+    for snapshot in snapshots.values():
+        for stage, summary in snapshot["stages"].items():
+            stages.setdefault(stage, []).append(summary)
+    total_seconds = load_seconds + drain_seconds
+    return {
+        "offered": {"seconds": seconds, "cloud_per_sec": cloud_rate, "hardware_per_sec": hardware_rate,
+                    "cloud_sent": len(cloud), "hardware_sent": len(hardware)},
+        "load_seconds": load_seconds,
+        "drain_seconds": drain_seconds,
+        "throughput": {
+            "rf433_codes_per_sec": transmitter["transmitted"] / total_seconds,
+            "rf433_airtime_ratio": transmitter["airtime_ratio"],
+            "processed_per_sec": sum(stat["processed"] for stat in processor.worker_stats()) / total_seconds,
+        },
+        "transmitter": transmitter,
+        "queue_depths": _depth_summary(samples),
+        "command_to_rf_p99_ms": max((summary["p99_ms"] for summary in stages.get("total_transmitted", [])),
+                                    default=None),
+        # Stages recorded by several processes (workers) are listed once per process.
+        "stages": stages,
+        "counters": {name: snapshot["counters"] for name, snapshot in snapshots.items() if snapshot["counters"]},
+    }
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    json_file = report.json_path(arguments)
+    values = [float(argument) for argument in arguments]
+    results = run(*values)
+    offered = results["offered"]
+    print("offered %.0f s of %.1f cloud/s + %.1f hardware/s, drained %.2f s after load" % (
+        offered["seconds"], offered["cloud_per_sec"], offered["hardware_per_sec"], results["drain_seconds"]))
+    for name, value in results["throughput"].items():
+        print("%-24s %8.2f" % (name, value))
+    for name, depth in results["queue_depths"].items():
+        print("queue %-18s max %5d  mean %8.2f" % (name, depth["max"], depth["mean"]))
+    for stage, summaries in sorted(results["stages"].items()):
+        for summary in summaries:
+            print("stage %-18s %6d  p50 %9.3f ms  p95 %9.3f ms  p99 %9.3f ms" % (
+                stage, summary["count"], summary["p50_ms"], summary["p95_ms"], summary["p99_ms"]))
+    print("command to RF p99: %s ms" % results["command_to_rf_p99_ms"])
+    if json_file:
+        report.save("pipeline_load", results, json_file)
@@ -0,0 +1,39 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Saves benchmark results as JSON, so results of different versions can be compared.
+"""
+
+import json
+import platform
+import sys
+import time
+
+
+def save(name, results, file_path):
+    """
+    :param name: Name of benchmark.
+    :param results: JSON serializable results.
+    :param file_path: Path of JSON file to write.
+    :return: None
+    """
+    report = {
+        "benchmark": name,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(file_path, "w") as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
+
+
+def json_path(arguments):
+    """:return: value of '--json <path>' in command line arguments, None if not given."""
+    if "--json" in arguments:
+        index = arguments.index("--json")
+        arguments.pop(index)
+        return arguments.pop(index)
+    return None
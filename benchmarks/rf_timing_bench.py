@@ -0,0 +1,99 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Accuracy of rf433 pulse widths. Edges recorded by simulated GPIO are time stamped and achieved pulse widths are
+compared with compiled ones, for previous sleep (time.time() in 1/100-delay slices) and PrecisionTimer.
+    python -m benchmarks.rf_timing_bench [codes] [--json results.json]
+"""
+
+import sys
+import time
+
+from benchmarks import report, stand_ins
+
+
+def _legacy_sleep(delay):
+    _delay = delay / 100
+    end = time.time() + delay - _delay
+    while time.time() < end:
+        time.sleep(_delay)
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def _errors(edges, pulses):
+    """Absolute difference (us) between achieved and compiled width of every pulse but last of each frame."""
+    return [abs((edges[i + 1] - edges[i]) / 1000 - pulses[i][1]) for i in range(len(pulses) - 1)]
+
+
+def _drift(edges, pulses):
+    """Difference (us) between achieved and compiled position (from start of frame) of last edge."""
+    return abs((edges[-1] - edges[0]) / 1000 - sum(duration for _, duration in pulses[:-1]))
+
+
+def _summary(errors, drifts, cpu_seconds, wall_seconds):
+    return {"pulses": len(errors), "mean_error_us": sum(errors) / len(errors),
+            "p99_error_us": _percentile(errors, 99), "max_error_us": max(errors),
+            "max_frame_drift_us": max(drifts), "cpu_share": cpu_seconds / wall_seconds}
+
+
+def run(codes=20):
+    stand_ins.install()
+    from libraries import RadioSignalClient
+    from libraries.gpio_engine import get_gpio
+    from libraries.rf433_engine import compile_waveform
+
+    gpio = get_gpio()
+
+    def edges():
+        return [timestamp for timestamp, _, _ in gpio.edges]
+
+    client = RadioSignalClient()
+    client.enable_transmission()
+    code_list = [7110000 + i for i in range(codes)]
+    results = {}
+
+    # Previous implementation: pulse by pulse, each with its own sleep.
+    legacy_errors, legacy_drifts = [], []
+    cpu, wall = time.process_time(), time.perf_counter()
+    for code in code_list:
+        pulses = compile_waveform(code, 1, 350, 24, 3)
+        gpio.edges.clear()
+        for level, duration in pulses:
+            gpio.output(client.target_pin, level)
+            _legacy_sleep(duration / 1000000)
+        legacy_errors.extend(_errors(edges(), pulses))
+        legacy_drifts.append(_drift(edges(), pulses))
+    results["legacy_sleep"] = _summary(legacy_errors, legacy_drifts,
+                                       time.process_time() - cpu, time.perf_counter() - wall)
+
+    precision_errors, precision_drifts = [], []
+    client.timer.reset_jitter()
+    cpu, wall = time.process_time(), time.perf_counter()
+    for code in code_list:
+        gpio.edges.clear()
+        client.transmit_code(code)
+        pulses = compile_waveform(code, 1, 350, 24, 3)
+        precision_errors.extend(_errors(edges(), pulses))
+        precision_drifts.append(_drift(edges(), pulses))
+    results["precision_timer"] = _summary(precision_errors, precision_drifts,
+                                          time.process_time() - cpu, time.perf_counter() - wall)
+    results["precision_timer"]["self_reported_jitter"] = client.timer.jitter()
+    return results
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    json_file = report.json_path(arguments)
+    results = run(int(arguments[0]) if arguments else 20)
+    for mode, result in results.items():
+        print("%-16s %6d pulses  width error mean %7.2f us  p99 %7.2f us  max %8.2f us  "
+              "frame drift max %8.2f us  CPU %5.1f %%" % (
+                  mode, result["pulses"], result["mean_error_us"], result["p99_error_us"], result["max_error_us"],
+                  result["max_frame_drift_us"], result["cpu_share"] * 100))
+    if json_file:
+        report.save("rf_timing", results, json_file)
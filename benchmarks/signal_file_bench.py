@@ -0,0 +1,84 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Disk usage and write throughput of signal files for realistic traffic (encrypted cloud commands and hardware
+telemetry, half each) written through SignalWriter in its usual batches: uncompressed file with PyTables' default
+chunks (as before) against compressed files with chunks tuned to row size.
+    python -m benchmarks.signal_file_bench [rows] [--json results.json]
+"""
+
+import base64
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import report, stand_ins
+
+# name: (complib, complevel, tuned chunks)
+CONFIGURATIONS = {
+    "uncompressed_default_chunks": (None, 0, False),
+    "zlib_5": ("zlib", 5, True),
+    "blosc_lz4_5": ("blosc:lz4", 5, True),
+    "blosc_zstd_5": ("blosc:zstd", 5, True),
+}
+
+
+def _cloud_messages(count):
+    """Fernet tokens of cloud signals (random bytes in same layout if cryptography is not installed)."""
+    signals = [b"cloud/%d/light/%d/%s" % (i % 99 + 1, i % 50, b"on" if i % 2 else b"off") for i in range(count)]
+    try:
+        from cryptography.fernet import Fernet
+        fernet = Fernet(os.environ["SECRET_KEY"])
+        return [fernet.encrypt(signal).decode() for signal in signals]
+    except ImportError:
+        return [base64.urlsafe_b64encode(b"\x80" + os.urandom(56 + len(signal) // 16 * 16 + 16)).decode()
+                for signal in signals]
+
+
+def _hardware_messages(count):
+    return ["%02d%d%03d%03d" % (i % 99 + 1, i % 2 + 2, i % 40, (i * 7) % 1000) for i in range(count)]
+
+
+def _write(file_name, complib, complevel, tuned, cloud, hardware):
+    import tables as tb
+    import name_helper as nh
+    from core.signal_package import SignalFileHandler, SignalWriter
+
+    filters = SignalFileHandler.filters(complib, complevel) if complevel else tb.Filters(complevel=0)
+    SignalFileHandler.create_file(file_name, filters=filters, chunk_bytes=nh.SIGNAL_FILE_CHUNK_BYTES if tuned else None)
+    started = time.perf_counter()
+    with SignalWriter(file_name) as signal_writer:
+        for i, (cloud_message, hardware_message) in enumerate(zip(cloud, hardware)):
+            signal_writer.save_cloud_signal(2 * i, cloud_message, "MQTT", "Remote_MQTT_Broker")
+            signal_writer.save_hardware_signal(2 * i + 1, hardware_message, "BLUETOOTH", "Bluetooth_Device")
+    elapsed = time.perf_counter() - started
+    return {"rows_per_sec": 2 * len(cloud) / elapsed, "file_mb": os.path.getsize(file_name) / 1e6,
+            "complib": filters.complib if filters.complevel else None}
+
+
+def run(rows=200000):
+    stand_ins.install()
+    cloud, hardware = _cloud_messages(rows // 2), _hardware_messages(rows // 2)
+    results = {"rows": rows}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (complib, complevel, tuned) in CONFIGURATIONS.items():
+            results[name] = _write(os.path.join(directory, name + ".h5"), complib, complevel, tuned, cloud, hardware)
+    baseline = results["uncompressed_default_chunks"]["file_mb"]
+    for name in CONFIGURATIONS:
+        results[name]["disk_saving_percent"] = (1 - results[name]["file_mb"] / baseline) * 100
+    return results
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    json_file = report.json_path(arguments)
+    results = run(int(arguments[0]) if arguments else 200000)
+    print("%d signals (half cloud, half hardware):" % results["rows"])
+    for name in CONFIGURATIONS:
+        result = results[name]
+        print("%-28s %8.1f MB  saving %5.1f %%  %9.0f rows/s  (%s)" % (
+            name, result["file_mb"], result["disk_saving_percent"], result["rows_per_sec"], result["complib"]))
+    if json_file:
+        report.save("signal_file", results, json_file)
@@ -0,0 +1,105 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Query "all signals of zone 12 in last hour" on a signal file with a month of hardware signals, answered from
+column indexes (SignalQuery) against same query on a file without indexes (in-kernel scan) and a python scan.
+    python -m benchmarks.signal_query_bench [rows] [--json results.json]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import report, stand_ins
+
+DAYS = 30
+
+
+def _fill(file_name, rows, indexed):
+    import numpy as np
+    import tables as tb
+    import name_helper as nh
+    from core.signal_package import SignalFileHandler, SignalQuery
+
+    SignalFileHandler.create_file(file_name)
+
+    now = time.time()
+    rng = np.random.default_rng(3)
+    with tb.open_file(file_name, "r+") as signals_file:
+        table = signals_file.get_node("/%s/%s" % (nh.HARDWARE_SIGNAL_GROUP_NAME, nh.HARDWARE_SIGNAL_TABLE_NAME))
+        if not indexed:
+            for column in nh.SIGNAL_INDEXED_COLUMNS:
+                if column in table.colnames:
+                    table.cols._f_col(column).remove_index()
+        started = time.perf_counter()
+        for chunk_start in range(0, rows, 100000):
+            size = min(100000, rows - chunk_start)
+            records = np.zeros(size, dtype=table.dtype)
+            records["name"] = np.arange(chunk_start, chunk_start + size)
+            records["incoming_time"] = now - DAYS * 86400 + (np.arange(chunk_start, chunk_start + size) *
+                                                              (DAYS * 86400 / rows))
+            records["zone"] = rng.integers(1, 100, size)
+            records["entity"] = rng.integers(1, 5, size)
+            records["device_id"] = rng.integers(0, 1000, size)
+            records["message"] = [b"%02d%d%03d050" % (z, e, d) for z, e, d in
+                                  zip(records["zone"], records["entity"], records["device_id"])]
+            records["protocol"] = b"BLUETOOTH"
+            records["device_type"] = b"Bluetooth_Device"
+            table.append(records)
+        table.flush()
+        fill_seconds = time.perf_counter() - started
+    if indexed:
+        with tb.open_file(file_name, "r+") as signals_file:
+            SignalQuery.create_indexes(signals_file)
+    return now, fill_seconds
+
+
+def _timed(query, repeat=5):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = query()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return {"ms": best * 1000, "rows": result}
+
+
+def run(rows=1000000):
+    stand_ins.install()
+    import tables as tb
+    import name_helper as nh
+    from core.signal_package import SignalQuery
+
+    results = {"rows": rows}
+    with tempfile.TemporaryDirectory() as directory:
+        for indexed in (True, False):
+            file_name = os.path.join(directory, "indexed.h5" if indexed else "plain.h5")
+            now, fill_seconds = _fill(file_name, rows, indexed)
+            key = "indexed" if indexed else "not_indexed"
+            with SignalQuery(file_name) as query:
+                results[key] = _timed(lambda: SignalQuery.count(query.hardware_signals(start=now - 3600, zone=12)))
+            results[key]["file_mb"] = os.path.getsize(file_name) / 1e6
+
+        def python_scan():
+            with tb.open_file(os.path.join(directory, "plain.h5")) as signals_file:
+                table = signals_file.get_node("/%s/%s" % (nh.HARDWARE_SIGNAL_GROUP_NAME,
+                                                          nh.HARDWARE_SIGNAL_TABLE_NAME))
+                return sum(1 for row in table if row["incoming_time"] >= now - 3600 and row["zone"] == 12)
+
+        results["python_scan"] = _timed(python_scan, repeat=1)
+    return results
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    json_file = report.json_path(arguments)
+    results = run(int(arguments[0]) if arguments else 1000000)
+    print("%d hardware signals over %d days, zone 12 in last hour:" % (results["rows"], DAYS))
+    for mode in ("indexed", "not_indexed", "python_scan"):
+        result = results[mode]
+        print("%-12s %9.2f ms  %5d rows%s" % (mode, result["ms"], result["rows"],
+                                              "  file %.1f MB" % result["file_mb"] if "file_mb" in result else ""))
+    if json_file:
+        report.save("signal_query", results, json_file)
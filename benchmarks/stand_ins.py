@@ -0,0 +1,289 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Local stand-ins for external parts (MQTT Broker, paho client, Bluetooth and env_settings) used by benchmarks.
+GPIO is simulated by libraries.gpio_engine.SimulatedGpio (GPIO_BACKEND=simulated).
+'install()' must be called before importing any CutiePi module.
+"""
+
+import os
+import queue
+import socket
+import sys
+import time
+import types
+from itertools import count
+from threading import Thread, Lock, current_thread
+
+
+class FakeBroker(Thread):
+    """
+    In-process MQTT Broker. Every connection costs 'connect_latency' seconds (TCP + auth handshake) and
+    every published message is confirmed after 'round_trip' seconds.
+    A forked process gets a broker of its own, messages do not cross processes but publishing works.
+    """
+
+    def __init__(self, connect_latency=0.05, round_trip=0.002):
+        self.connect_latency = connect_latency
+        self.round_trip = round_trip
+        self.connections = 0
+        self.received = []
+        self._subscribers = []  # [(topic filter, client)]
+        self._lock = Lock()
+        self._deliveries = queue.Queue()
+        self._pid = os.getpid()
+        Thread.__init__(self, name="fake_broker", daemon=True)
+        self.start()
+
+    def _ensure_running(self):
+        """Delivery thread of parent process does not exist after fork, a new one is started."""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._lock = Lock()
+        self._deliveries = queue.Queue()
+        self._subscribers = []
+        self.received = []
+        Thread(target=self.run, name="fake_broker", daemon=True).start()
+
+    def run(self):
+        while True:
+            due, deliver = self._deliveries.get()
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            deliver()
+
+    def connect(self, client):
+        self._ensure_running()
+        time.sleep(self.connect_latency)
+        with self._lock:
+            self.connections += 1
+
+    def subscribe(self, client, topic):
+        self._ensure_running()
+        with self._lock:
+            self._subscribers.append((topic, client))
+
+    def unsubscribe_all(self, client):
+        with self._lock:
+            self._subscribers = [(topic, sub) for topic, sub in self._subscribers if sub is not client]
+
+    def publish(self, client, topic, payload, mid):
+        self._ensure_running()
+        due = time.monotonic() + self.round_trip
+        with self._lock:
+            self.received.append((topic, payload))
+            receivers = [sub for topic_filter, sub in self._subscribers if topic_matches(topic_filter, topic)]
+        for receiver in receivers:
+            self._deliveries.put((due, lambda r=receiver: r.deliver_message(topic, payload)))
+        self._deliveries.put((due, lambda: client.confirm_publish(mid)))
+
+
+def topic_matches(topic_filter, topic):
+    filter_parts = topic_filter.split("/")
+    topic_parts = topic.split("/")
+    for i, part in enumerate(filter_parts):
+        if part == "#":
+            return True
+        if i >= len(topic_parts) or (part != "+" and part != topic_parts[i]):
+            return False
+    return len(filter_parts) == len(topic_parts)
+
+
+class _MessageInfo:
+    def __init__(self, rc, mid):
+        self.rc = rc
+        self.mid = mid
+
+
+class _Message:
+    def __init__(self, topic, payload):
+        self.topic = topic
+        self.payload = payload if isinstance(payload, bytes) else str(payload).encode()
+        self.qos = 0
+
+
+class FakeMqttClient:
+    """Subset of paho.mqtt.client.Client used by CutiePi, talking to FakeBroker."""
+
+    broker = None
+
+    def __init__(self, client_id="", clean_session=True, userdata=None, *args, **kwargs):
+        self._client_id = client_id
+        self._userdata = userdata
+        self._mids = count(1)
+        self._events = queue.Queue()
+        self._loop_thread = None
+        self._connect_args = None
+        self.connected = False
+        self.on_connect = self.on_disconnect = self.on_publish = None
+        self.on_subscribe = self.on_message = self.on_log = None
+
+    # Configuration
+    def username_pw_set(self, username, password=None):
+        pass
+
+    def reconnect_delay_set(self, min_delay=1, max_delay=120):
+        pass
+
+    # Connection
+    def connect(self, host, port=1883, keepalive=60, *args, **kwargs):
+        self.broker.connect(self)
+        self.connected = True
+        self._events.put(lambda: self.on_connect and self.on_connect(self, self._userdata, {}, 0))
+        return 0
+
+    def connect_async(self, host, port=1883, keepalive=60, *args, **kwargs):
+        self._connect_args = (host, port, keepalive)
+
+    def disconnect(self):
+        self.broker.unsubscribe_all(self)
+        self.connected = False
+        self._events.put(lambda: self.on_disconnect and self.on_disconnect(self, self._userdata, 0))
+        return 0
+
+    # Network loop
+    def _loop(self):
+        if self._connect_args and not self.connected:
+            self.connect(*self._connect_args)
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            event()
+
+    def loop_start(self):
+        if self._loop_thread is None:
+            self._loop_thread = Thread(target=self._loop, daemon=True)
+            self._loop_thread.start()
+        return 0
+
+    def loop_stop(self, force=False):
+        if self._loop_thread is not None:
+            self._events.put(None)
+            if self._loop_thread is not current_thread():
+                self._loop_thread.join()
+            self._loop_thread = None
+        return 0
+
+    def loop_forever(self, *args, **kwargs):
+        self._loop()
+
+    # Messages
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        if not self.connected:
+            return _MessageInfo(4, 0)  # MQTT_ERR_NO_CONN
+        mid = next(self._mids)
+        self.broker.publish(self, topic, payload, mid)
+        return _MessageInfo(0, mid)
+
+    def subscribe(self, topic, qos=0):
+        topics = topic if isinstance(topic, list) else [(topic, qos)]
+        mid = next(self._mids)
+        for topic_filter, _ in topics:
+            self.broker.subscribe(self, topic_filter)
+        self._events.put(lambda: self.on_subscribe and self.on_subscribe(self, self._userdata, mid, (qos,)))
+        return 0, mid
+
+    def confirm_publish(self, mid):
+        self._events.put(lambda: self.on_publish and self.on_publish(self, self._userdata, mid))
+
+    def deliver_message(self, topic, payload):
+        self._events.put(lambda: self.on_message and self.on_message(self, self._userdata, _Message(topic, payload)))
+
+
+class BluetoothError(IOError):
+    pass
+
+
+class FakeBluetoothSocket:
+    """
+    Subset of bluetooth.BluetoothSocket backed by a local socket pair.
+    Bytes written to 'FakeBluetoothSocket.hardware_end' are received by the connected socket.
+    Connections are refused till 'FakeBluetoothSocket.refuse_until' (time.monotonic()), to simulate an outage.
+    """
+
+    hardware_end = None
+    refuse_until = 0.0
+
+    def __init__(self, proto=None):
+        self._sock = None
+
+    def connect(self, address):
+        if time.monotonic() < FakeBluetoothSocket.refuse_until:
+            raise BluetoothError("Host is down")
+        local_end, FakeBluetoothSocket.hardware_end = socket.socketpair()
+        self._sock = local_end
+
+    def recv(self, size):
+        try:
+            return self._sock.recv(size)
+        except OSError as error:
+            raise BluetoothError(str(error))
+
+    def send(self, data):
+        return self._sock.send(data)
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def setblocking(self, flag):
+        self._sock.setblocking(flag)
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def default_env():
+    return {
+        "HOME_DIR": "/tmp",
+        "CONFIG_DIR": os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config"),
+        "SECRET_KEY": "ZmDfcTF7_60GrrY167zsiPd67pEvs0aGOv2oasOM1Pg=",
+        "CLOUD_SOURCE": "cloud",
+        "HARDWARE_SOURCE": "hardware",
+        "MQTT_USERNAME": "bench",
+        "MQTT_PASSWORD": "bench",
+        "MQTT_HOST": "localhost",
+        "MQTT_PORT": "1883",
+        "MQTT_KEEPALIVE": "60",
+        "MQTT_TRANSMISSION_CHANNEL": "cutiepi/tx",
+        "MQTT_RECEPTION_CHANNEL": "cutiepi/rx",
+        "A_HC05_DEVICE_ID": "00:00:00:00:00:00",
+        "A_HC05_PORT": "1",
+        "GPIO_BACKEND": "simulated",
+    }
+
+
+def install(broker=None):
+    """
+    Replaces paho client, bluetooth and env_settings with local stand-ins.
+    :param broker: FakeBroker object, a new one is created if not given.
+    :return: FakeBroker object in use.
+    """
+    FakeMqttClient.broker = broker or FakeBroker()
+
+    client_module = _module("paho.mqtt.client", Client=FakeMqttClient, MQTT_ERR_SUCCESS=0)
+    mqtt_module = _module("paho.mqtt", client=client_module)
+    _module("paho", mqtt=mqtt_module)
+
+    def set_env_variables():
+        for key, value in default_env().items():
+            os.environ.setdefault(key, value)
+
+    btcommon_module = _module("bluetooth.btcommon", BluetoothError=BluetoothError)
+    _module("bluetooth", BluetoothSocket=FakeBluetoothSocket, RFCOMM=3, btcommon=btcommon_module)
+
+    _module("env_settings", set_env_variables=set_env_variables)
+    set_env_variables()
+
+    return FakeMqttClient.broker
@@ -0,0 +1,146 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Startup time of the app, from launch of python process till first cloud message is received by the listener
+(and till it is processed), with local stand-ins. Every run is a new process:
+    fresh: no signal file yet.
+    existing_file: a signal file of today with signals, it must be opened and kept (rows are counted after run).
+    eager_imports: fresh, but PyTables/NumPy and cryptography imported first (as main process used to).
+    python -m benchmarks.startup_bench [runs] [--json results.json]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import report, stand_ins
+
+PROBE_INTERVAL = 0.005  # in seconds, between two probe messages
+PROBES = 2000
+EXISTING_ROWS = 100000
+HEAVY_MODULES = ("tables", "numpy", "cryptography")
+SCENARIOS = ("fresh", "existing_file", "eager_imports")
+
+
+def _child(launched_ns, probe_file, eager):
+    """Runs in launched process: starts app and probes it, prints timings (seconds from launch) as JSON."""
+    started = time.monotonic_ns()
+    if eager:
+        import tables, numpy, cryptography.fernet  # noqa: F401
+    stand_ins.install()
+    from execute import Initiation
+    from benchmarks.stand_ins import FakeMqttClient
+    import trace_helper
+    imported = time.monotonic_ns()
+
+    cutie_pi = Initiation()
+    constructed = time.monotonic_ns()
+    cutie_pi.initiate()
+    initiated = time.monotonic_ns()
+
+    with open(probe_file) as probes:
+        tokens = json.load(probes)
+    user_app = FakeMqttClient(client_id="user_app")
+    user_app.connect(os.environ["MQTT_HOST"])
+    received = processed = None
+    for token in tokens:
+        user_app.publish(os.environ["MQTT_RECEPTION_CHANNEL"], token)
+        time.sleep(PROBE_INTERVAL)
+        if received is None and trace_helper.get_tracer().snapshot()["counters"].get("received"):
+            received = time.monotonic_ns()
+        processor = cutie_pi.supervisor.instance("signal_processor")
+        if processor and sum(stat["processed"] for stat in processor.worker_stats()):
+            processed = time.monotonic_ns()
+            break
+    heavy = [module for module in HEAVY_MODULES if module in sys.modules]
+    cutie_pi.stop()
+
+    def since_launch(moment):
+        return (moment - launched_ns) / 1e9 if moment else None
+
+    print(json.dumps({
+        "interpreter_seconds": since_launch(started),
+        "imported_seconds": since_launch(imported),
+        "constructed_seconds": since_launch(constructed),
+        "initiated_seconds": since_launch(initiated),
+        "first_received_seconds": since_launch(received),
+        "first_processed_seconds": since_launch(processed),
+        "heavy_modules_in_main": heavy,
+    }))
+
+
+def _fill_signal_file(home_dir, rows):
+    from core.signal_package import SignalFileHandler, SignalWriter
+    file_handler = SignalFileHandler(os.path.join(home_dir, "signals"))
+    with SignalWriter(file_handler.active_file()) as signal_writer:
+        for i in range(rows):
+            signal_writer.save_hardware_signal(i, "%02d3%03d%03d" % (i % 99 + 1, i % 999, i % 1000),
+                                               "BLUETOOTH", "Bluetooth_Device")
+
+
+def _count_rows(home_dir):
+    import tables as tb
+    import name_helper as nh
+    from core.signal_package import SignalFileHandler
+    rows = 0
+    for file_name in SignalFileHandler(os.path.join(home_dir, "signals")).signal_files():
+        with tb.open_file(file_name) as signals_file:
+            rows += signals_file.get_node("/%s/%s" % (nh.HARDWARE_SIGNAL_GROUP_NAME,
+                                                      nh.HARDWARE_SIGNAL_TABLE_NAME)).nrows
+    return rows
+
+
+def _launch(scenario, probe_file):
+    home_dir = tempfile.mkdtemp(prefix="cutiepi_startup_")
+    if scenario == "existing_file":
+        _fill_signal_file(home_dir, EXISTING_ROWS)
+    env = dict(os.environ, HOME_DIR=home_dir)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    launched = time.monotonic_ns()
+    output = subprocess.run([sys.executable, "-m", "benchmarks.startup_bench", "--child", str(launched), probe_file,
+                             "eager" if scenario == "eager_imports" else "lazy"],
+                            env=env, cwd=root, capture_output=True, text=True, timeout=120)
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    if scenario == "existing_file":
+        result["rows_kept"] = _count_rows(home_dir) >= EXISTING_ROWS
+    return result
+
+
+def run(runs=3):
+    stand_ins.install()
+    from helper import encrypt_signal_for_cloud as encrypt
+
+    results = {"runs": runs}
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as probes:
+        json.dump([encrypt("cloud/1/light/%d/on" % (i % 999 + 1)) for i in range(PROBES)], probes)
+    try:
+        for scenario in SCENARIOS:
+            samples = [_launch(scenario, probes.name) for _ in range(runs)]
+            best = min(samples, key=lambda sample: sample["first_received_seconds"] or float("inf"))
+            results[scenario] = dict(best, samples=samples)
+    finally:
+        os.remove(probes.name)
+    return results
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    if arguments and arguments[0] == "--child":
+        _child(int(arguments[1]), arguments[2], arguments[3] == "eager")
+        sys.exit(0)
+
+    json_file = report.json_path(arguments)
+    results = run(int(arguments[0]) if arguments else 3)
+    print("best of %d runs, seconds from launch:" % results["runs"])
+    for scenario in SCENARIOS:
+        result = results[scenario]
+        print("%-14s imported %6.3f  initiated %6.3f  first received %6.3f  first processed %6.3f  heavy in main %s%s"
+              % (scenario, result["imported_seconds"], result["initiated_seconds"], result["first_received_seconds"],
+                 result["first_processed_seconds"], result["heavy_modules_in_main"] or "none",
+                 "  rows kept %s" % result["rows_kept"] if "rows_kept" in result else ""))
+    if json_file:
+        report.save("startup", results, json_file)
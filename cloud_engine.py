@@ -7,98 +7,78 @@ MQTT broker.
 (MQTT Broker: Mode of exchanging messages between end user app and hardware.)
 """
 
-from threading import Thread
+import os
+from threading import Thread, Lock
 
 from execute.cutiepi_exceptions import CloudConnectionError
+import name_helper as nh
+import trace_helper
+
+# One publisher per process (signal processor runs in its own process).
+_publisher = None
+_publisher_pid = None
+_publisher_lock = Lock()
+
+
+def _get_publisher():
+    """
+    Returns the long lived MQTT publisher of current process, creates and connects it on first use.
+    A publisher inherited from parent process (after fork) is not reused, its network thread does not exist here.
+    :return: libraries.MqttPublisher object
+    """
+    global _publisher, _publisher_pid
+    with _publisher_lock:
+        if _publisher is None or _publisher_pid != os.getpid():
+            from paho.mqtt import client as mqtt
+            from libraries import MqttPublisher
+
+            # Client id must be unique per connection, broker drops older connection with same id.
+            _publisher = MqttPublisher(mqtt.Client(client_id="Cloud_Tx_%d" % os.getpid()))
+            _publisher_pid = os.getpid()
+        return _publisher
 
 
 class CloudClient(Thread):
     """
     This class should only be accessed from "CloudSignal" class defined below this class.
-    This class is used to create threads which eventually transmit and receive signals to cloud.
+    This class is used to create the thread which receives signals from cloud.
+    Signals are transmitted by the long lived publisher of the process (see "_get_publisher").
     """
 
-    def __init__(self, name, mode):
+    def __init__(self, name):
         """
         :param name: Name of client
-        :param mode: Type of client "SEND" or "RECEIVE
         """
-        import inspect
         from paho.mqtt import client as mqtt
         from libraries import MqttClient
-        from execute.cutiepi_exceptions import InvalidObjectCreation
-
-        '''
-        Get class name of caller method
-        For python 3.5+
-        inspect.stack() : A list of named tuples FrameInfo(frame, filename, lineno, function, code_context, index)
-        inspect.stack()[1][0]: Frame object of caller.
-        '''
-
-        caller_frame_info = inspect.stack()[1]
-        caller_id = caller_frame_info[0].f_locals['self'].__class__.__name__ + "." + caller_frame_info[3]
-        if caller_id not in ["CloudSignal.transmit_signal", "CloudSignal.start_reception"]:
-            # TODO: Need to think some alternative to hard coding the caller's <class>.<method> value.
-            raise InvalidObjectCreation("Can not create object of class.")
 
         self.__CLOUD_CLIENT = MqttClient(mqtt.Client(client_id=name))
-        self.__signal = None
         self.__channel = None
 
-        if mode.strip() not in ('SEND', 'RECEIVE'):
-            raise ValueError("Invalid Mode. Mode should be 'SEND' or 'RECEIVE'.")
-        else:
-            self.__client_type = mode
-
-        Thread.__init__(self)
-
-    def __set_channel(self):
-        from os import environ as env
-        if self.__client_type == 'SEND':
-            self.__channel = env['MQTT_TRANSMISSION_CHANNEL']
-        else:
-            self.__channel = env['MQTT_RECEPTION_CHANNEL']
-
-    def transmit(self, signal=""):
-        assert (signal != "" and len(signal) > 0, "Not a valid signal %s" % signal)
-        self.__set_channel()
-        self.__signal = signal
+        # Receiver runs for lifetime of the app, it must not keep the process alive on shutdown.
+        Thread.__init__(self, daemon=True)
 
-        Thread.start(self)
-
-    def receive(self, reception_queue):
-        self.__set_channel()
-        self.__CLOUD_CLIENT.set_output_queue(reception_queue)
+    def receive(self, router):
+        """
+        :param router: libraries.TopicRouter object, its topic filters are subscribed.
+        """
+        self.__channel = router.topic_filters()
+        self.__CLOUD_CLIENT.set_router(router)
         Thread.start(self)
 
     def run(self):
-        if self.__client_type == "SEND":
-            # This part runs the mqtt client (Thread) as Publisher (Transmitter).
-            try:
-                self.__CLOUD_CLIENT.transmit_signal(self.__channel, self.__signal)
-            except CloudConnectionError:
-                # TODO: Log error while transmitting signal
-                self.disconnect()
-
-        elif self.__client_type == "RECEIVE":
-            # This part runs the mqtt client (Thread) as Subscriber (Receptor).
-            try:
-                self.__CLOUD_CLIENT.receive_signal(self.__channel)
-            except CloudConnectionError:
-                # TODO: Log Error during reception of signal from Cloud.
-                self.disconnect()
-        else:
-            raise CloudConnectionError("Not a valid type of Cloud connector (It should be SEND or RECEIVE)")
-
-    def is_published(self):
-        # return self._CLOUD_CLIENT._pub_result
-        pass
+        # This runs the mqtt client (Thread) as Subscriber (Receptor).
+        try:
+            self.__CLOUD_CLIENT.receive_signal(self.__channel)
+        except CloudConnectionError:
+            # TODO: Log Error during reception of signal from Cloud.
+            self.disconnect()
 
     def get_subscribed_messages(self):
         # return self._CLOUD_CLIENT._sub_msgs
         pass
 
-    def disconnect(self):  # Use it only for subscriber, not for publisher.
+    def disconnect(self):
         self.__CLOUD_CLIENT.disconnect_from_cloud()
 
 
@@ -115,6 +95,8 @@ class CloudSignal:
     def transmit_signal(self, signal):
         """
         It encrypts the Signal and then transmit over a respective channel.
+        Transmission reuses the persistent connection of this process and returns once broker confirms delivery
+        (marked on trace of signal being handled by this thread).
         :param signal: signal to transmit
         :return: None
         """
@@ -122,15 +104,32 @@ class CloudSignal:
             raise ValueError("Invalid signal inputted.")
 
         from helper import encrypt_signal_for_cloud as encrypt
-        self.__cloud_client = CloudClient(name="Cloud_Tx", mode="SEND")
-        self.__cloud_client.transmit(encrypt(signal))
+        _get_publisher().transmit_signal(os.environ['MQTT_TRANSMISSION_CHANNEL'], encrypt(signal))
+        trace_helper.mark(trace_helper.current(), nh.TRACE_STAGE_PUBLISHED)
 
-    def start_reception(self, output_queue):
+    @staticmethod
+    def control_topics():
         """
-        This starts the reception of cloud signal on decided channel and
+        Topics carrying signals for this app: MQTT_RECEPTION_CHANNEL and optional MQTT_RECEPTION_TOPICS
+        (comma separated topic filters, e.g. per zone topics "cutiepi/zone/+/control").
+        :return: list of topic filters
+        """
+        topics = [os.environ['MQTT_RECEPTION_CHANNEL']]
+        topics.extend(topic.strip() for topic in os.environ.get('MQTT_RECEPTION_TOPICS', '').split(',')
+                      if topic.strip())
+        return topics
+
+    def start_reception(self, output_queue, routes=None):
+        """
+        This starts the reception of cloud signal on decided channels and
         starts a respective thread.
-        :param output_queue: multiprocessing.Queue object, where to put messages after reception.
-        :return: None
+        :param output_queue: multiprocessing.Queue object, where to put messages of control topics after reception.
+        :param routes: list of (topic filter, queue or callable) for other traffic, routed at reception.
+        :return: Started receiver thread (CloudClient object).
         """
-        self.__cloud_client = CloudClient(name="Cloud_Tx", mode="RECEIVE")
-        self.__cloud_client.receive(output_queue)
+        from libraries import TopicRouter
+
+        router = TopicRouter([(topic, output_queue) for topic in self.control_topics()] + list(routes or ()))
+        self.__cloud_client = CloudClient(name="Cloud_Rx")
+        self.__cloud_client.receive(router)
+        return self.__cloud_client
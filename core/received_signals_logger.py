@@ -4,54 +4,89 @@
 """
 File to record all received signals from both cloud and hardware.
 It uses Process from multiprocessing module.
-It keeps on checking queues for signals received, store to .h5 file and
-puts the messages (in distinguishable format) to signals_to_process_queue.
+It sleeps until a signal arrives on any of the queues (or buffered signals are due for writing), stores all
+ready signals to .h5 file and puts them (in distinguishable format) to signals_to_process_queue.
+Signals are written to .h5 file in batches (see SignalWriter), pending ones are written when process terminates.
 """
 
 from multiprocessing import Process, Queue
+from multiprocessing.connection import wait
 import queue as qq  # For using queue.Empty exception
-import tables as tb
-from os import environ as env, path
+import signal as os_signal
+import sys
 
 import name_helper as nh
+import trace_helper
 
 
 class ReceivedSignalsLogger(Process):
     def __init__(self, from_cloud_queue, from_hardware_queue, to_process_queue):
-        self._file = path.join(env["HOME_DIR"], nh.SIGNAL_FILE)
+        self._file = None  # Rotating signal files (see SignalFileHandler).
         self._from_cloud_queue = from_cloud_queue
         self._from_hardware_queue = from_hardware_queue
         self._to_process_queue = to_process_queue
         Process.__init__(self)
 
     def run(self):
-        from .signal_package import SignalFileHandler
-        signal_handler = SignalFileHandler()
+        from .signal_package import SignalWriter
+        import profile_helper
+
+        # Process.terminate() sends SIGTERM, exit normally so that buffered signals are written to file.
+        # SIGINT (Ctrl+C reaches whole process group) is left to supervisor, which stops processes in order.
+        os_signal.signal(os_signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        os_signal.signal(os_signal.SIGINT, os_signal.SIG_IGN)
+        profile_helper.install()
+
+        # Reading end of each queue's pipe becomes readable as soon as a signal is put onto that queue.
+        queues = {self._from_cloud_queue._reader: (self._from_cloud_queue, self._log_cloud_signal),
+                  self._from_hardware_queue._reader: (self._from_hardware_queue, self._log_hardware_signal)}
+
+        with SignalWriter(self._file) as signal_writer:
+            # Signals may be waiting already (e.g. when restarted after a crash): a shared memory ring rings its
+            # doorbell only for a consumer which found it empty, so queues are drained once before first wait.
+            for from_queue, log_signal in queues.values():
+                self._drain(from_queue, log_signal, signal_writer)
+
+            while True:
+                # Block until any queue has data, wake up only to write buffered signals on time.
+                for reader in wait(list(queues), timeout=signal_writer.time_to_flush()):
+                    from_queue, log_signal = queues[reader]
+                    self._drain(from_queue, log_signal, signal_writer)
+
+                signal_writer.flush_if_due()
+
+    @staticmethod
+    def _drain(from_queue, log_signal, signal_writer):
+        """
+        Logs every signal which is ready on the queue.
+        :param from_queue: multiprocessing.Queue object
+        :param log_signal: method to log a signal from this queue.
+        :param signal_writer: SignalWriter object
+        :return: None
+        """
         while True:
-            with tb.open_file(self._file, "r+") as signals_file:
-                try:
-                    cloud_signal = self._from_cloud_queue.get(timeout=nh.QUEUE_WAIT_TIME)
-                    signal_handler.save_cloud_signal(signals_file,
-                                                     1,  # TODO: Need to provide dynamic Serial Number
-                                                     cloud_signal["message"],
-                                                     cloud_signal["protocol"],
-                                                     cloud_signal["source_type"]
-                                                     )
-                    self._to_process_queue.put((nh.CLOUD_SIGNAL_PREFIX, cloud_signal))
-                except qq.Empty:
-                    pass
-
-                try:
-                    hw_signal = self._from_hardware_queue.get(timeout=nh.QUEUE_WAIT_TIME)
-                    signal_handler.save_hardware_signal(signals_file,
-                                                        2,  # TODO: Need to provide dynamic Serial Number
-                                                        hw_signal["message"],
-                                                        hw_signal["protocol"],
-                                                        hw_signal["source_type"]
-                                                        )
-                    self._to_process_queue.put((nh.HARDWARE_SIGNAL_PREFIX, hw_signal))
-                except qq.Empty:
-                    pass
+            try:
+                log_signal(signal_writer, from_queue.get_nowait())
+            except qq.Empty:
+                return
+
+    def _log_cloud_signal(self, signal_writer, cloud_signal):
+        signal_writer.save_cloud_signal(cloud_signal.get("sequence", 0),
+                                        cloud_signal["message"],
+                                        cloud_signal["protocol"],
+                                        cloud_signal["source_type"]
+                                        )
+        trace_helper.mark(cloud_signal.get("trace"), nh.TRACE_STAGE_LOGGED)
+        self._to_process_queue.put((nh.CLOUD_SIGNAL_PREFIX, cloud_signal))
+
+    def _log_hardware_signal(self, signal_writer, hw_signal):
+        signal_writer.save_hardware_signal(hw_signal.get("sequence", 0),
+                                           hw_signal["message"],
+                                           hw_signal["protocol"],
+                                           hw_signal["source_type"]
+                                           )
+        trace_helper.mark(hw_signal.get("trace"), nh.TRACE_STAGE_LOGGED)
+        self._to_process_queue.put((nh.HARDWARE_SIGNAL_PREFIX, hw_signal))
 
     def terminate(self):
         Process.terminate(self)
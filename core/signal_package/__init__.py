@@ -3,4 +3,6 @@
 
 from .signal import CloudSignal
 from .signal import HardwareSignal
+from .signal_query import SignalQuery
 from .signal_file_handler import SignalFileHandler
+from .signal_writer import SignalWriter
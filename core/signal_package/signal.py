@@ -12,7 +12,7 @@ class BaseSignal(tb.IsDescription):
     """
     Base class for signals
     """
-    name = tb.UInt64Col()
+    name = tb.Int64Col()  # Signed, PyTables can not index or query 64-bit unsigned columns.
     message = tb.StringCol(128)
     protocol = tb.StringCol(32)
     incoming_time = tb.Time64Col()
@@ -29,6 +29,9 @@ class CloudSignal(BaseSignal):
 class HardwareSignal(BaseSignal):
     """
     Hardware signal schema.
-    Defines additional fields to BaseSignal
+    Defines additional fields to BaseSignal, device fields are decoded from message (0 if message is invalid).
     """
     device_type = tb.StringCol(64)
+    zone = tb.UInt8Col()
+    entity = tb.UInt8Col()
+    device_id = tb.UInt16Col()
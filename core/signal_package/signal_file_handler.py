@@ -3,23 +3,50 @@
 
 """
 This file handle all file operations where signals are logging.
+Signals go to the active signal file of SIGNAL_FILE_DIR. A new file is started every day and whenever active file
+reaches SIGNAL_FILE_MAX_SIZE, old files are deleted as per retention policy. Tables are compressed (Blosc or zlib)
+and chunked to SIGNAL_FILE_CHUNK_BYTES.
 """
 
+import glob
+import os
 import tables as tb
 import time
 from os import environ as env, path
 
 import name_helper as nh
 from . import CloudSignal, HardwareSignal
+from .signal_query import SignalQuery
 
 
 class SignalFileHandler:
-    def __init__(self):
-        pass
+    def __init__(self, directory=None):
+        """
+        :param directory: Directory of signal files, default is SIGNAL_FILE_DIR in HOME_DIR.
+        """
+        self.directory = directory or path.join(env["HOME_DIR"], nh.SIGNAL_FILE_DIR)
+
+    @staticmethod
+    def filters(complib=nh.SIGNAL_FILE_COMPLIB, complevel=nh.SIGNAL_FILE_COMPLEVEL):
+        """:return: tables.Filters object, None for no compression."""
+        if not complevel:
+            return None
+        if complib.startswith("blosc") and tb.which_lib_version(complib.split(":")[0]) is None:
+            # TODO: Log Blosc is not available.
+            complib = "zlib"
+        return tb.Filters(complevel=complevel, complib=complib, shuffle=True)
 
     @staticmethod
-    def create_file():
-        with tb.open_file(path.join(env["HOME_DIR"], nh.SIGNAL_FILE), "w", nh.SIGNAL_FILE_TITLE) as signals_file:
+    def create_file(file_name, filters=None, chunk_bytes=nh.SIGNAL_FILE_CHUNK_BYTES):
+        """
+        Creates signal file (replaces existing one) with both signal tables, indexed for queries.
+        :param file_name: Path of signal file.
+        :param filters: tables.Filters object for tables, default as per SIGNAL_FILE_COMPLIB/SIGNAL_FILE_COMPLEVEL.
+        :param chunk_bytes: Approximate size of a chunk of table, None for PyTables' default.
+        :return: None
+        """
+        filters = filters if filters is not None else SignalFileHandler.filters()
+        with tb.open_file(file_name, "w", nh.SIGNAL_FILE_TITLE) as signals_file:
 
             cloud_group = signals_file.create_group(signals_file.root,
                                                     nh.CLOUD_SIGNAL_GROUP_NAME,
@@ -28,14 +55,120 @@ class SignalFileHandler:
                                                  nh.HARDWARE_SIGNAL_GROUP_NAME,
                                                  nh.HARDWARE_SIGNAL_GROUP_TITLE)
 
-            cloud_signals = signals_file.create_table(cloud_group,
-                                                      nh.CLOUD_SIGNAL_TABLE_NAME,
-                                                      CloudSignal,
-                                                      nh.CLOUD_SIGNAL_TABLE_TITLE)
-            hw_signals = signals_file.create_table(hw_group,
-                                                   nh.HARDWARE_SIGNAL_TABLE_NAME,
-                                                   HardwareSignal,
-                                                   nh.HARDWARE_SIGNAL_TABLE_TITLE)
+            # Table objects are not kept, an indexed table must not outlive its file (it flushes when deleted).
+            for group, table_name, description, title in (
+                    (cloud_group, nh.CLOUD_SIGNAL_TABLE_NAME, CloudSignal, nh.CLOUD_SIGNAL_TABLE_TITLE),
+                    (hw_group, nh.HARDWARE_SIGNAL_TABLE_NAME, HardwareSignal, nh.HARDWARE_SIGNAL_TABLE_TITLE)):
+                row_size = tb.Description(description().columns)._v_itemsize
+                chunkshape = (max(1, chunk_bytes // row_size),) if chunk_bytes else None
+                signals_file.create_table(group, table_name, description, title,
+                                          filters=filters, chunkshape=chunkshape)
+            SignalQuery.create_indexes(signals_file)
+
+    @staticmethod
+    def check_file(file_name):
+        """
+        Opens an existing signal file (read only) and checks that both signal tables are there with expected columns.
+        :return: True if signals can be appended to file_name.
+        """
+        try:
+            with tb.open_file(file_name, "r") as signals_file:
+                for group, table_name, description in (
+                        (nh.CLOUD_SIGNAL_GROUP_NAME, nh.CLOUD_SIGNAL_TABLE_NAME, CloudSignal),
+                        (nh.HARDWARE_SIGNAL_GROUP_NAME, nh.HARDWARE_SIGNAL_TABLE_NAME, HardwareSignal)):
+                    table = signals_file.get_node("/%s/%s" % (group, table_name))
+                    if table.dtype != tb.Description(description().columns)._v_dtype:
+                        return False
+            return True
+        except (tb.HDF5ExtError, tb.NoSuchNodeError, OSError):
+            return False
+
+    def signal_files(self):
+        """:return: Paths of all signal files, oldest first (by day, then sequence number: _999 before _1000)."""
+        return sorted(glob.glob(path.join(self.directory, nh.SIGNAL_FILE_PREFIX + "*.h5")),
+                      key=lambda file_name: (self.file_day(file_name), self.file_sequence(file_name)))
+
+    @staticmethod
+    def file_day(file_name):
+        """:return: Day (YYYYMMDD) of signal file, from its name."""
+        return path.basename(file_name)[len(nh.SIGNAL_FILE_PREFIX):].split("_")[0]
+
+    @staticmethod
+    def file_sequence(file_name):
+        """:return: Sequence number of signal file within its day, from its name."""
+        return int(path.splitext(file_name)[0].rsplit("_", 1)[1])
+
+    @staticmethod
+    def day_start(day):
+        """:return: Seconds since epoch at start of day (YYYYMMDD, local time)."""
+        return time.mktime(time.strptime(day, "%Y%m%d"))
+
+    def rotation_due(self, file_name, now=None):
+        """:return: True if signals should no more be written to file_name."""
+        now = time.time() if now is None else now
+        if nh.SIGNAL_FILE_ROTATE_DAILY and self.file_day(file_name) != time.strftime("%Y%m%d", time.localtime(now)):
+            return True
+        return bool(nh.SIGNAL_FILE_MAX_SIZE) and path.getsize(file_name) >= nh.SIGNAL_FILE_MAX_SIZE
+
+    def written_file(self, now=None):
+        """
+        Signal file the logger appends to now (newest file of today, unless rotation is due). Unlike active_file,
+        nothing is created or checked.
+        :return: Path of signal file, None if there is none.
+        """
+        now = time.time() if now is None else now
+        day = time.strftime("%Y%m%d", time.localtime(now))
+        todays_files = [file_name for file_name in self.signal_files() if self.file_day(file_name) == day]
+        if todays_files and not self.rotation_due(todays_files[-1], now):
+            return todays_files[-1]
+        return None
+
+    def active_file(self, now=None):
+        """
+        Returns signal file to write to now, it is created if needed. Existing file is never replaced: it is opened
+        and checked, a damaged one (e.g. by power cut while writing) is renamed (SIGNAL_FILE_DAMAGED_SUFFIX) and
+        kept for inspection, next file is started.
+        :return: Path of signal file.
+        """
+        now = time.time() if now is None else now
+        day = time.strftime("%Y%m%d", time.localtime(now))
+        todays_files = [file_name for file_name in self.signal_files() if self.file_day(file_name) == day]
+        if todays_files and not self.rotation_due(todays_files[-1], now):
+            if self.check_file(todays_files[-1]):
+                return todays_files[-1]
+            # TODO: Log damaged signal file.
+            os.replace(todays_files[-1], todays_files[-1] + nh.SIGNAL_FILE_DAMAGED_SUFFIX)
+
+        sequence = self.file_sequence(todays_files[-1]) + 1 if todays_files else 0
+        file_name = path.join(self.directory, "%s%s_%03d.h5" % (nh.SIGNAL_FILE_PREFIX, day, sequence))
+        os.makedirs(self.directory, exist_ok=True)
+        self.create_file(file_name)
+        return file_name
+
+    def apply_retention(self, active_file=None, now=None):
+        """
+        Deletes signal files older than SIGNAL_FILE_RETENTION_DAYS and oldest ones beyond SIGNAL_FILES_MAX_TOTAL_SIZE.
+        Active file is never deleted.
+        :return: list of deleted files.
+        """
+        now = time.time() if now is None else now
+        files = [file_name for file_name in self.signal_files() if file_name != active_file]
+        deleted = []
+        if nh.SIGNAL_FILE_RETENTION_DAYS is not None:
+            oldest_day = time.strftime("%Y%m%d", time.localtime(now - nh.SIGNAL_FILE_RETENTION_DAYS * 86400))
+            deleted.extend(file_name for file_name in files if self.file_day(file_name) < oldest_day)
+        if nh.SIGNAL_FILES_MAX_TOTAL_SIZE is not None:
+            kept = [file_name for file_name in files if file_name not in deleted]
+            total = sum(path.getsize(file_name) for file_name in kept + ([active_file] if active_file else []))
+            for file_name in kept:
+                if total <= nh.SIGNAL_FILES_MAX_TOTAL_SIZE:
+                    break
+                total -= path.getsize(file_name)
+                deleted.append(file_name)
+
+        for file_name in deleted:
+            os.remove(file_name)
+        return deleted
 
     def save_cloud_signal(self, file, name=0, message="", protocol="mqtt", source_type="MQTT Broker"):
         cloud_signals = self._get_signal_table(file, nh.CLOUD_SIGNAL_GROUP_NAME)
@@ -0,0 +1,144 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Reads signals back from the signal file.
+Columns listed in SIGNAL_INDEXED_COLUMNS are indexed (see create_indexes), so that queries by time range, serial
+number or device are answered from the index instead of a scan of whole table. Results are streamed in chunks
+(structured numpy arrays of at most chunk_size rows). Matching rows are found per window of
+SIGNAL_QUERY_WINDOW_ROWS rows of table and read in chunks, so memory needed does not depend on number of
+matching rows.
+Queries run over all signal files (oldest first), files of days outside asked time range are skipped. The file
+being written by the logger is skipped too (see SignalFileHandler.written_file): it is appended by another process
+and HDF5 does not support reading it meanwhile (no SWMR for PyTables), so its signals are available to queries
+once the logger has moved to next file.
+"""
+
+import tables as tb
+
+import name_helper as nh
+
+
+class SignalQuery:
+    def __init__(self, file_name=None, chunk_size=nh.SIGNAL_QUERY_CHUNK_SIZE):
+        """
+        :param file_name: Path of a signal file, default is all signal files (see SignalFileHandler). It must not be
+        the file being written by the logger.
+        :param chunk_size: Maximum number of rows in one chunk of results.
+        """
+        self._file_name = file_name
+        self._chunk_size = chunk_size
+        self._files = {}  # path: open tables.File object
+
+    @staticmethod
+    def create_indexes(signals_file):
+        """
+        Indexes SIGNAL_INDEXED_COLUMNS of both signal tables, if not indexed yet.
+        Indexes are kept up to date by PyTables on every append.
+        :param signals_file: tables.File object opened for writing.
+        :return: None
+        """
+        for group, table_name in ((nh.CLOUD_SIGNAL_GROUP_NAME, nh.CLOUD_SIGNAL_TABLE_NAME),
+                                  (nh.HARDWARE_SIGNAL_GROUP_NAME, nh.HARDWARE_SIGNAL_TABLE_NAME)):
+            table = signals_file.get_node("/%s/%s" % (group, table_name))
+            for column in nh.SIGNAL_INDEXED_COLUMNS:
+                if column in table.colnames and not table.cols._f_col(column).is_indexed:
+                    table.cols._f_col(column).create_index()
+
+    def open(self):
+        """Files are opened when first queried, close() closes all of them."""
+        return self
+
+    def close(self):
+        for signals_file in self._files.values():
+            signals_file.close()
+        self._files = {}
+
+    def _signal_files(self, start, end):
+        """:return: Paths of signal files which may hold signals received in [start, end)."""
+        if self._file_name:
+            return [self._file_name]
+
+        from .signal_file_handler import SignalFileHandler
+        file_handler = SignalFileHandler()
+        written_file = file_handler.written_file()
+        file_names = []
+        for file_name in file_handler.signal_files():
+            if file_name == written_file:
+                continue
+            day_start = file_handler.day_start(file_handler.file_day(file_name))
+            # A file holds one day of signals, plus a few buffered at midnight: rows received just before midnight
+            # may be flushed to next day's file, rows received just after it to previous day's file.
+            if (end is None or day_start - nh.SIGNAL_FILE_DAY_SLACK < end) and \
+                    (start is None or day_start + 86400 + nh.SIGNAL_FILE_DAY_SLACK > start):
+                file_names.append(file_name)
+        return file_names
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def cloud_signals(self, start=None, end=None, name=None, protocol=None, source_type=None):
+        """
+        Cloud signals received in [start, end) (seconds since epoch, None for no limit) matching all given fields.
+        :return: generator of structured numpy arrays.
+        """
+        return self._query(nh.CLOUD_SIGNAL_GROUP_NAME, nh.CLOUD_SIGNAL_TABLE_NAME, start, end,
+                           {"name": name, "protocol": protocol, "source_type": source_type})
+
+    def hardware_signals(self, start=None, end=None, name=None, protocol=None, device_type=None,
+                         zone=None, entity=None, device_id=None):
+        """
+        Hardware signals received in [start, end) (seconds since epoch, None for no limit) matching all given fields.
+        e.g. all signals of zone 12 in last hour: hardware_signals(start=time.time() - 3600, zone=12)
+        :return: generator of structured numpy arrays.
+        """
+        return self._query(nh.HARDWARE_SIGNAL_GROUP_NAME, nh.HARDWARE_SIGNAL_TABLE_NAME, start, end,
+                           {"name": name, "protocol": protocol, "device_type": device_type,
+                            "zone": zone, "entity": entity, "device_id": device_id})
+
+    @staticmethod
+    def count(chunks):
+        """:return: Number of rows in query results (consumes them)."""
+        return sum(len(chunk) for chunk in chunks)
+
+    @staticmethod
+    def _condition(start, end, fields):
+        """
+        :return: (condition for Table.where, its variables), condition is None when nothing is filtered.
+        Values are passed as variables, never formatted into condition.
+        """
+        terms, condvars = [], {}
+        if start is not None:
+            terms.append("(incoming_time >= start)")
+            condvars["start"] = float(start)
+        if end is not None:
+            terms.append("(incoming_time < end)")
+            condvars["end"] = float(end)
+        for column, value in fields.items():
+            if value is None:
+                continue
+            terms.append("(%s == value_%s)" % (column, column))
+            condvars["value_" + column] = value.encode() if isinstance(value, str) else value
+        return (" & ".join(terms) or None), condvars
+
+    def _query(self, group, table_name, start, end, fields):
+        condition, condvars = self._condition(start, end, fields)
+        for file_name in self._signal_files(start, end):
+            if file_name not in self._files:
+                self._files[file_name] = tb.open_file(file_name, "r", NODE_CACHE_SLOTS=nh.SIGNAL_FILE_NODE_CACHE_SLOTS)
+            table = self._files[file_name].get_node("/%s/%s" % (group, table_name))
+
+            if condition is None:
+                for chunk_start in range(0, table.nrows, self._chunk_size):
+                    yield table.read(chunk_start, chunk_start + self._chunk_size)
+                continue
+
+            # Rows are found (from index, if any) and read as arrays, not fetched one by one.
+            for window_start in range(0, table.nrows, nh.SIGNAL_QUERY_WINDOW_ROWS):
+                coordinates = table.get_where_list(condition, condvars, start=window_start,
+                                                   stop=window_start + nh.SIGNAL_QUERY_WINDOW_ROWS, sort=True)
+                for chunk_start in range(0, len(coordinates), self._chunk_size):
+                    yield table.read_coordinates(coordinates[chunk_start:chunk_start + self._chunk_size])
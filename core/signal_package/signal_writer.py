@@ -0,0 +1,155 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Buffered writer for the signal file.
+It keeps the file and table handles open, collects rows in memory and writes them to the tables in batches
+(as structured numpy arrays). A full buffer is appended to its table, file is flushed (to disk, with indexes
+brought up to date) when oldest row not yet flushed has waited for flush interval and on close. Flushing an
+indexed table is costly, so it is done at most once per flush interval however busy the writer is.
+Without a file name, it writes to the active signal file of SignalFileHandler and moves to a new one when
+rotation is due (checked at every flush).
+"""
+
+import time
+
+import numpy as np
+import tables as tb
+
+import name_helper as nh
+from .signal import CloudSignal, HardwareSignal
+
+# Width (in bytes) of text columns of each table. Text is encoded (UTF-8) and cut to fit when a row is added, so
+# that one odd message can not fail a whole batch when it is written.
+_TEXT_WIDTHS = {group: {column: dtype.itemsize for column, (dtype, _) in
+                        tb.Description(description().columns)._v_dtype.fields.items() if dtype.kind == "S"}
+                for group, description in ((nh.CLOUD_SIGNAL_GROUP_NAME, CloudSignal),
+                                           (nh.HARDWARE_SIGNAL_GROUP_NAME, HardwareSignal))}
+
+
+class SignalWriter:
+    def __init__(self, file_name=None, buffer_size=nh.SIGNAL_WRITER_BUFFER_SIZE,
+                 flush_interval=nh.SIGNAL_WRITER_FLUSH_INTERVAL):
+        """
+        :param file_name: Path of signal file (no rotation), default is active file of rotating signal files.
+        :param buffer_size: Number of buffered rows (per table) which triggers writing.
+        :param flush_interval: Seconds after which buffered rows are written, even if buffer is not full.
+        """
+        from .signal_file_handler import SignalFileHandler
+
+        self._file_handler = None if file_name else SignalFileHandler()
+        self._file_name = file_name
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._file = None
+        self._tables = {}
+        self._buffers = {nh.CLOUD_SIGNAL_GROUP_NAME: [], nh.HARDWARE_SIGNAL_GROUP_NAME: []}
+        self._oldest_row_time = None
+
+    def open(self):
+        if self._file is None:
+            if self._file_handler:
+                self._file_name = self._file_handler.active_file()
+                self._file_handler.apply_retention(self._file_name)
+            self._file = tb.open_file(self._file_name, "r+", NODE_CACHE_SLOTS=nh.SIGNAL_FILE_NODE_CACHE_SLOTS)
+            self._tables = {
+                nh.CLOUD_SIGNAL_GROUP_NAME: self._file.get_node(
+                    "/%s/%s" % (nh.CLOUD_SIGNAL_GROUP_NAME, nh.CLOUD_SIGNAL_TABLE_NAME)),
+                nh.HARDWARE_SIGNAL_GROUP_NAME: self._file.get_node(
+                    "/%s/%s" % (nh.HARDWARE_SIGNAL_GROUP_NAME, nh.HARDWARE_SIGNAL_TABLE_NAME)),
+            }
+        return self
+
+    def save_cloud_signal(self, name=0, message="", protocol="mqtt", source_type="MQTT Broker"):
+        self._add_row(nh.CLOUD_SIGNAL_GROUP_NAME,
+                      {"name": name, "message": message, "protocol": protocol, "source_type": source_type})
+
+    def save_hardware_signal(self, name=0, message="", protocol="Bluetooth", device_type="B/T"):
+        row = {"name": name, "message": message, "protocol": protocol, "device_type": device_type}
+        row.update(self._device_fields(message))
+        self._add_row(nh.HARDWARE_SIGNAL_GROUP_NAME, row)
+
+    @staticmethod
+    def _device_fields(message):
+        """
+        :param message: hardware signal (zzeiiivvv), zone, entity and id of device are decoded for indexing.
+        :return: dict of device fields, all 0 if message is not a valid hardware signal.
+        """
+        if len(message) == nh.HARDWARE_SIGNAL_LENGTH and message.isascii() and message.isdecimal():
+            return {"zone": int(message[:2]), "entity": int(message[2]), "device_id": int(message[3:6])}
+        return {"zone": 0, "entity": 0, "device_id": 0}
+
+    @staticmethod
+    def _fit_text(value, width):
+        """:return: value as UTF-8 bytes of at most width bytes, a character cut in the middle is dropped."""
+        if isinstance(value, bytes):
+            return value[:width]
+        data = str(value).encode("utf-8", "replace")
+        return data if len(data) <= width else data[:width].decode("utf-8", "ignore").encode("utf-8")
+
+    def _add_row(self, group, row):
+        for column, width in _TEXT_WIDTHS[group].items():
+            row[column] = self._fit_text(row[column], width)
+        row["incoming_time"] = time.time()
+        self._buffers[group].append(row)
+        if self._oldest_row_time is None:
+            self._oldest_row_time = time.monotonic()
+        if len(self._buffers[group]) >= self._buffer_size:
+            self._append_buffers()
+
+    def time_to_flush(self):
+        """
+        :return: Seconds left before rows must be flushed to file, None if there is nothing to flush.
+        """
+        if self._oldest_row_time is None:
+            return None
+        return max(0.0, self._oldest_row_time + self._flush_interval - time.monotonic())
+
+    def flush_if_due(self):
+        if self.time_to_flush() == 0.0:
+            self.flush()
+
+    def _append_buffers(self):
+        """Appends buffered rows to their tables, without flushing file."""
+        for group, rows in self._buffers.items():
+            if not rows:
+                continue
+            table = self._tables[group]
+            records = np.zeros(len(rows), dtype=table.dtype)
+            for column in table.colnames:
+                records[column] = [row[column] for row in rows]
+            table.append(records)
+            rows.clear()
+
+    def flush(self):
+        """Writes all buffered rows to their tables and flushes file."""
+        if self._oldest_row_time is None:
+            return
+        if self._file_handler and self._file_handler.rotation_due(self._file_name):
+            self._close_file()  # Rows appended already are flushed to old file.
+            self.open()
+
+        self._append_buffers()
+        self._file.flush()
+        self._oldest_row_time = None
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._close_file()
+
+    def _close_file(self):
+        self._tables = {}
+        self._file.close()
+        self._file = None
+
+    @property
+    def file_name(self):
+        """Path of signal file being written."""
+        return self._file_name
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -4,3 +4,4 @@
 from .output_queue_processor import OutputSignalQueueProcessor
 from .process_signal import ProcessCloudSignal
 from .process_signal import ProcessHardwareSignal
+from .signal_codec import SignalCodec
@@ -4,40 +4,262 @@
 """
 It runs as a parallel process (multiprocessing.Process).
 It keeps on checking signals_to_process_queue, differentiate types of signals and
-sends for further processing.
+sends them to a pool of worker processes for further processing.
+Cloud signals are decrypted (hardware ones decoded) in parallel by a pool of decoder processes, so one slow signal
+does not hold back decryption of the others. Device is known only once a signal is decrypted, so decoded signals
+are handed to workers in order of arrival.
+Signals are partitioned by the device they address (zone, entity, id), so signals for same device are
+processed in order by one worker while signals for different devices are processed in parallel.
+Workers hand over rf433 codes to the single RadioTransmitter of this process, the only owner of transmitter pin.
 """
 
-from multiprocessing import Process
+from multiprocessing import Process, Queue, Array, Value, Pool
+import queue as qq
+import signal as os_signal
+import sys
+import time
+import zlib
+from threading import Lock, Thread
 
+from hw_controller import RadioTransmitter
 import name_helper as nh
+import trace_helper
+
+# Layout of per worker statistics in shared array.
+_STATS_PER_WORKER = 3
+_PROCESSED, _FAILED, _BUSY_SECONDS = range(_STATS_PER_WORKER)
+
+_decoder = None  # (decrypt, decode, codec) of a decoder process.
+
+
+def _start_decoder():
+    """Initializer of decoder processes."""
+    global _decoder
+    import profile_helper
+    from helper import decrypt_signal_from_cloud as decrypt, decode_hardware_signal as decode
+    from .process_signal import get_codec
+
+    # Stopped by its processor, not by Ctrl+C.
+    os_signal.signal(os_signal.SIGINT, os_signal.SIG_IGN)
+    profile_helper.install()
+    _decoder = (decrypt, decode, get_codec())
+
+
+def _decode_signal(prefix, message):
+    """
+    Runs in a decoder process.
+    :return: (signal text, device key), device key is None if signal addresses no device.
+    """
+    decrypt, decode, codec = _decoder
+    if prefix == nh.CLOUD_SIGNAL_PREFIX:
+        signal_text = decrypt(message)
+        return signal_text, codec.cloud_device_key(signal_text)
+    signal_text = decode(message)
+    return signal_text, codec.hardware_device_key(signal_text)
+
+
+class _SignalWorker(Process):
+    """
+    Processes signals from its own queue, one at a time. "None" on queue stops the worker.
+    """
+
+    def __init__(self, index, worker_queue, code_queue, stats):
+        self._index = index
+        self._worker_queue = worker_queue
+        self._code_queue = code_queue
+        self._stats = stats
+        Process.__init__(self, name="signal_worker_%d" % index, daemon=True)
+
+    def run(self):
+        import hw_controller
+        from .process_signal import ProcessCloudSignal, ProcessHardwareSignal
+
+        import profile_helper
+        hw_controller.set_transmit_queue(self._code_queue)
+
+        # Stopped by its processor (None on queue), not by Ctrl+C.
+        os_signal.signal(os_signal.SIGINT, os_signal.SIG_IGN)
+        profile_helper.install()
+        handlers = {nh.CLOUD_SIGNAL_PREFIX: ProcessCloudSignal().process_decrypted_signal,
+                    nh.HARDWARE_SIGNAL_PREFIX: ProcessHardwareSignal().process_decoded_signal}
+        offset = self._index * _STATS_PER_WORKER
+
+        while True:
+            work = self._worker_queue.get()
+            if work is None:
+                return
+
+            started = time.perf_counter()
+            prefix, signal_text, trace = work
+            trace_helper.mark(trace, nh.TRACE_STAGE_PROCESSING)
+            trace_helper.set_current(trace)  # Marked further by transmitters.
+            try:
+                handlers[prefix](signal_text)
+                self._stats[offset + _PROCESSED] += 1
+            except Exception:
+                # TODO: Log error while processing signal.
+                self._stats[offset + _FAILED] += 1
+            trace_helper.set_current(None)
+            self._stats[offset + _BUSY_SECONDS] += time.perf_counter() - started
 
 
 class OutputSignalQueueProcessor(Process):
-    def __init__(self, queue_signals_to_process):
+    def __init__(self, queue_signals_to_process, workers=nh.SIGNAL_PROCESSOR_WORKERS,
+                 decoders=nh.SIGNAL_DECODER_PROCESSES):
         """
         :param queue_signals_to_process: multiprocessing.Queue object
+        :param workers: Number of worker processes.
+        :param decoders: Number of decoder processes (decryption of cloud signals).
         """
         self._queue_signals_to_process = queue_signals_to_process
+        self._workers_count = workers
+        self._decoders_count = decoders
+        # Shared with parent process, so that throughput can be read from outside.
+        self._stats = Array('d', workers * _STATS_PER_WORKER, lock=False)
+        self._dispatched = Array('Q', workers, lock=False)
+        self._rejected = Value('Q', 0, lock=False)
+        self._rejected_lock = None  # Counted by dispatcher and router threads (of run).
+        self._started_at = Value('d', 0.0, lock=False)
+        self._tx_stats = RadioTransmitter.shared_stats()
+        self._worker_queues = []
+        self._workers = []
+        self._code_queue = None
         Process.__init__(self)
 
     def run(self):
+        # SIGINT (Ctrl+C reaches whole process group) is left to supervisor, which stops processes in order.
+        # On SIGTERM, exit normally so that workers finish signals already given to them.
+        os_signal.signal(os_signal.SIGINT, os_signal.SIG_IGN)
+        os_signal.signal(os_signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        import profile_helper
+        profile_helper.install()
+
+        self._started_at.value = time.monotonic()
+        self._rejected_lock = Lock()
+        self._code_queue = Queue()
+        for index in range(self._workers_count):
+            self._worker_queues.append(Queue())
+            self._workers.append(self._start_worker(index))
+
+        # Signals are decrypted/decoded in parallel by decoders, router hands them to workers in order of arrival.
+        decoders = Pool(self._decoders_count, initializer=_start_decoder)
+
+        # Transmitter thread of this process is the only owner of rf433 pin, workers only put codes on code_queue.
+        transmitter = RadioTransmitter(self._code_queue, self._tx_stats)
+        transmitter.start()
+
+        decoded = qq.Queue(maxsize=nh.SIGNAL_DECODER_BACKLOG * self._decoders_count)
+        router = Thread(target=self._route, args=(decoded,), name="signal_router")
+        router.start()
+
+        try:
+            while True:
+                signal_from_queue = self._queue_signals_to_process.get()
+                try:
+                    prefix = signal_from_queue[0].strip()
+                    message, trace = signal_from_queue[1]["message"], signal_from_queue[1].get("trace")
+                except Exception:
+                    # TODO: Log invalid signal got from queue
+                    self._reject()
+                    continue
+                if prefix not in (nh.CLOUD_SIGNAL_PREFIX, nh.HARDWARE_SIGNAL_PREFIX):
+                    # TODO: Log invalid signal got from queue
+                    self._reject()
+                    continue
+                decoded.put((decoders.apply_async(_decode_signal, (prefix, message)), prefix, trace))
+        finally:
+            decoded.put(None)
+            router.join(nh.SIGNAL_PROCESSOR_STOP_TIMEOUT)
+            decoders.terminate()
+            self._stop_workers()
+            transmitter.stop()
+            transmitter.join(nh.SIGNAL_PROCESSOR_STOP_TIMEOUT)
+
+    def _route(self, decoded):
+        """
+        Takes decoded signals in order of arrival and dispatches them, so signals for a device keep their order.
+        A slow signal holds back the ones after it only till it is decoded, they are decoded meanwhile.
+        :param decoded: queue.Queue of (AsyncResult of _decode_signal, prefix, trace), None to stop.
+        """
         while True:
+            item = decoded.get()
+            if item is None:
+                return
+            result, prefix, trace = item
             try:
-                signal_from_queue = self._queue_signals_to_process.get()
-                if signal_from_queue[0].strip() == nh.CLOUD_SIGNAL_PREFIX:
-                    from .process_signal import ProcessCloudSignal
-                    ProcessCloudSignal().process_signal(signal_from_queue[1])
+                signal_text, device_key = result.get(nh.SIGNAL_DECODE_TIMEOUT)
+            except Exception:
+                # A malformed signal (undecryptable, undecodable, bad fields) must not stop this process, nor a
+                # signal lost with a crashed decoder (timeout).
+                # TODO: Log error while decrypting/decoding signal.
+                self._reject()
+                continue
 
-                elif signal_from_queue[0].strip() == nh.HARDWARE_SIGNAL_PREFIX:
-                    from .process_signal import ProcessHardwareSignal
-                    ProcessHardwareSignal().process_signal(signal_from_queue[1])
+            trace_helper.mark(trace, nh.TRACE_STAGE_DISPATCHED)
+            self._dispatch(prefix, signal_text, device_key, trace)
 
-                else:
-                    # TODO: Log invalid signal got from queue
-                    pass
-            except:
-                pass
-                #TODO: Handle thread Error.
+    def _reject(self):
+        with self._rejected_lock:
+            self._rejected.value += 1
+
+    def _start_worker(self, index):
+        worker = _SignalWorker(index, self._worker_queues[index], self._code_queue, self._stats)
+        worker.start()
+        return worker
+
+    def _dispatch(self, prefix, signal_text, device_key, trace=None):
+        """
+        Puts signal on queue of the worker which owns the device.
+        Invalid signals (no device) are spread by their text, worker reports them as invalid.
+        """
+        key = "/".join(device_key) if device_key else str(signal_text)
+        index = zlib.crc32(key.encode()) % self._workers_count
+        if not self._workers[index].is_alive():
+            # TODO: Log crash of signal worker.
+            self._workers[index] = self._start_worker(index)
+
+        self._worker_queues[index].put((prefix, signal_text, trace))
+        self._dispatched[index] += 1
+
+    def _stop_workers(self):
+        for worker_queue in self._worker_queues:
+            worker_queue.put(None)
+        deadline = time.monotonic() + nh.SIGNAL_PROCESSOR_STOP_TIMEOUT
+        for worker in self._workers:
+            worker.join(max(0, deadline - time.monotonic()))
+
+    def worker_stats(self):
+        """
+        Statistics of each worker. Can be called from the process which created this processor.
+        :return: list of dict (one per worker)
+        """
+        elapsed = time.monotonic() - self._started_at.value if self._started_at.value else 0
+        stats = []
+        for index in range(self._workers_count):
+            offset = index * _STATS_PER_WORKER
+            processed = int(self._stats[offset + _PROCESSED])
+            busy_seconds = self._stats[offset + _BUSY_SECONDS]
+            stats.append({
+                "worker": index,
+                "dispatched": self._dispatched[index],
+                "processed": processed,
+                "failed": int(self._stats[offset + _FAILED]),
+                "busy_seconds": busy_seconds,
+                "msgs_per_sec": processed / elapsed if elapsed else 0.0,
+                "msgs_per_busy_sec": processed / busy_seconds if busy_seconds else 0.0,
+            })
+        return stats
+
+    def transmitter_stats(self):
+        """
+        Statistics of rf433 transmitter queue. Can be called from the process which created this processor.
+        :return: dict (see RadioTransmitter.read_stats)
+        """
+        return RadioTransmitter.read_stats(self._tx_stats)
+
+    def rejected(self):
+        """Number of signals which could not be decrypted or were of unknown type."""
+        return self._rejected.value
 
     def terminate(self):
-        self.terminate()
+        Process.terminate(self)
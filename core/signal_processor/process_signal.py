@@ -7,11 +7,21 @@ This module provides functionality to process cloud signals, change to hardware
 
 from os import environ as env
 
-from helper import decrypt_signal_from_cloud as decrypt, decode_hardware_signal as decode
 from execute.cutiepi_exceptions import InvalidCloudSignal, DecryptionError
 from execute.cutiepi_exceptions import InvalidHardwareSignal, CloudConnectionError
 import name_helper as nh
 import message_conversion_helper as msg_hlp
+from .signal_codec import SignalCodec
+
+_codec = None
+
+
+def get_codec():
+    """Signal codec of current process, its lookup tables are built on first use."""
+    global _codec
+    if _codec is None:
+        _codec = SignalCodec()
+    return _codec
 
 
 class ProcessCloudSignal:
@@ -24,36 +34,29 @@ class ProcessCloudSignal:
         :param signal: dict type
         :return: None
         """
+        from helper import decrypt_signal_from_cloud as decrypt
+
+        try:
+            self.process_decrypted_signal(decrypt(signal["message"]))
+        except DecryptionError:
+            # TODO: Log error while decrypting signal received from cloud.
+            pass
+
+    def process_decrypted_signal(self, decrypted_signal):
+        """
+        :param decrypted_signal: cloud signal after decryption (str)
+        :return: None
+        """
         try:
             from hw_controller import HardwareSignal
-            decrypted_signal = decrypt(signal["message"])
-            formatted_signal_for_hardware = self.__create_signal_for_hw(decrypted_signal)
+            formatted_signal_for_hardware = get_codec().cloud_to_hardware(decrypted_signal)
 
             # Transmit signal to hardware
             HardwareSignal().transmit(formatted_signal_for_hardware)
-        except DecryptionError:
-            # TODO: Log error while decrypting signal received from cloud.
-            pass
         except InvalidCloudSignal:
             # TODO: Log error while concerting cloud signal to command for hardware.
             pass
 
-    def __create_signal_for_hw(self, signal):
-        is_valid_signal, signal_parts = self._is_valid_signal(signal)
-        if is_valid_signal:
-            return _SignalConversion().create_hardware_signal(signal_parts)
-        return None
-
-    @staticmethod
-    def _is_valid_signal(signal):
-        try:
-            signal_parts = signal.split("/")
-            if signal_parts[0] == env["CLOUD_SOURCE"] and len(signal_parts) == nh.CLOUD_SIGNAL_NO_OF_PARTS:
-                return True, signal_parts
-            return False, None
-        except AttributeError:
-            return False, None
-
 
 class ProcessHardwareSignal:
     """
@@ -66,11 +69,18 @@ class ProcessHardwareSignal:
         :param signal: dict type
         :return: None
         """
+        from helper import decode_hardware_signal as decode
+        self.process_decoded_signal(decode(signal["message"]))
+
+    def process_decoded_signal(self, decoded_signal):
+        """
+        :param decoded_signal: hardware signal after decoding (str)
+        :return: None
+        """
         from cloud_engine import CloudSignal
 
         try:
-            decoded_signal = decode(signal["message"])
-            formatted_signal = self.__create_signal_for_cloud(decoded_signal)
+            formatted_signal = get_codec().hardware_to_cloud(decoded_signal)
 
             # Transmit signal to cloud
             CloudSignal().transmit_signal(formatted_signal)
@@ -81,24 +91,12 @@ class ProcessHardwareSignal:
             # TODO: Log error while transmitting signal to cloud.
             pass
 
-    def __create_signal_for_cloud(self, signal):
-        is_valid_signal, signal_in_parts = self._is_valid(signal)
-        if is_valid_signal:
-            return _SignalConversion().create_cloud_signal(signal_in_parts)
-        return None
-
-    @staticmethod
-    def _is_valid(signal):
-        try:
-            signal_parts = signal.split("&")
-            if signal_parts[0] == env["HARDWARE_SOURCE"] and len(signal_parts[1]) == nh.HARDWARE_SIGNAL_LENGTH:
-                return True, signal_parts
-            return False, None
-        except AttributeError:
-            return False, None
-
 
 class _SignalConversion:
+    """
+    Field by field conversion. SignalCodec uses it for signals which are not found in its lookup tables.
+    """
+
     def __init__(self):
         pass
 
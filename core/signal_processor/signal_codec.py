@@ -0,0 +1,176 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Table driven conversion of signals between cloud and hardware formats (formats are described in
+_SignalConversion in process_signal.py).
+Lookup tables (zones, entities, ids, actions) are built once, so a signal is validated and converted in one pass.
+Signals which miss the tables are handed to _SignalConversion, which raises the exact error
+(or converts unusual but valid spellings like "+7" for zone).
+Batch methods convert many signals (e.g. recorded ones, for replay and analytics) at once using numpy.
+"""
+
+from os import environ as env
+
+from execute.cutiepi_exceptions import InvalidCloudSignal, InvalidHardwareSignal
+import name_helper as nh
+import message_conversion_helper as msg_hlp
+
+HARDWARE_SIGNAL_SEPARATOR = "&"
+CLOUD_SIGNAL_SEPARATOR = "/"
+
+
+class SignalCodec:
+    def __init__(self):
+        self._cloud_source = env["CLOUD_SOURCE"]
+        self._hardware_source = env["HARDWARE_SOURCE"]
+
+        # Cloud -> Hardware: each part of cloud signal maps directly to its part of hardware command.
+        self._zones = {}
+        for zone in range(1, msg_hlp.MAX_ZONES + 1):
+            padded_zone = str(zone).zfill(msg_hlp.ZONE_NUMBERS_PADDING)
+            self._zones[str(zone)] = padded_zone
+            self._zones[padded_zone] = padded_zone
+
+        self._entities = {nh.CLOUD_SIGNAL_LIGHT_ENTITY: str(nh.CLOUD_SIGNAL_LIGHT_ENTITY_NUMBER),
+                          nh.CLOUD_SIGNAL_MOTOR_ENTITY: str(nh.CLOUD_SIGNAL_MOTOR_ENTITY_NUMBER)}
+
+        self._entity_ids = {}  # id -> <all_or_id><id>
+        for entity_id in range(0, msg_hlp.MAX_ENTITY_ID + 1):
+            padded_id = str(entity_id).zfill(msg_hlp.ENTITY_ID_PADDING)
+            all_or_id = ("0" if entity_id == 0 else "1") + padded_id
+            self._entity_ids[str(entity_id)] = all_or_id
+            self._entity_ids[padded_id] = all_or_id
+
+        self._actions = {nh.ON: "1", nh.OFF: "0"}
+
+        # Hardware -> Cloud: fixed width parts of hardware signal.
+        self._hw_zones = {str(zone).zfill(msg_hlp.ZONE_NUMBERS_PADDING) for zone in range(1, msg_hlp.MAX_ZONES + 1)}
+        self._hw_entities = {str(nh.CLOUD_SIGNAL_TANK_ENTITY_NUMBER): nh.CLOUD_SIGNAL_TANK_ENTITY,
+                             str(nh.CLOUD_SIGNAL_DUSTBIN_ENTITY_NUMBER): nh.CLOUD_SIGNAL_DUSTBIN_ENTITY}
+        self._hw_entity_ids = {str(entity_id).zfill(msg_hlp.ENTITY_ID_PADDING)
+                               for entity_id in range(0, msg_hlp.MAX_ENTITY_ID + 1)}
+        self._hw_values = {str(value).zfill(msg_hlp.ANALOG_VALUE_PADDING)
+                           for value in range(0, msg_hlp.MAX_ANALOG_VALUE + 1)}
+        self._cloud_signal_prefix = self._cloud_source + CLOUD_SIGNAL_SEPARATOR
+
+    def cloud_to_hardware(self, signal):
+        """
+        :param signal: decrypted cloud signal, e.g. <source>/<zone>/<entity>/<id or all>/<action>
+        :return: command to send to hardware.
+        """
+        try:
+            parts = signal.split(CLOUD_SIGNAL_SEPARATOR)
+        except AttributeError:
+            raise InvalidCloudSignal("Invalid cloud signal.")
+        if len(parts) != nh.CLOUD_SIGNAL_NO_OF_PARTS or parts[0] != self._cloud_source:
+            raise InvalidCloudSignal("Invalid cloud signal.")
+
+        try:
+            return self._zones[parts[1]] + self._entities[parts[2]] + self._entity_ids[parts[3]] + \
+                self._actions[parts[4]]
+        except KeyError:
+            from .process_signal import _SignalConversion
+            return _SignalConversion.create_hardware_signal(parts)
+
+    def hardware_to_cloud(self, signal):
+        """
+        :param signal: decoded hardware signal, e.g. <source>&zzeiiivvv
+        :return: signal to transmit to cloud, e.g. <source>/<zone>/<entity>/<id or group>/<status>
+        """
+        try:
+            source, _, payload = signal.partition(HARDWARE_SIGNAL_SEPARATOR)
+        except AttributeError:
+            raise InvalidHardwareSignal("Invalid signal from Hardware.")
+        if source != self._hardware_source or len(payload) != nh.HARDWARE_SIGNAL_LENGTH:
+            raise InvalidHardwareSignal("Invalid signal from Hardware.")
+
+        zone, entity, entity_id, value = payload[:2], payload[2], payload[3:6], payload[6:]
+        if zone in self._hw_zones and entity in self._hw_entities and entity_id in self._hw_entity_ids \
+                and value in self._hw_values:
+            return self._cloud_signal_prefix + zone + CLOUD_SIGNAL_SEPARATOR + self._hw_entities[entity] + \
+                CLOUD_SIGNAL_SEPARATOR + entity_id + CLOUD_SIGNAL_SEPARATOR + value
+
+        from .process_signal import _SignalConversion
+        return _SignalConversion.create_cloud_signal([source, payload])
+
+    def cloud_device_key(self, signal):
+        """
+        :param signal: decrypted cloud signal.
+        :return: (zone, entity, id) addressed by signal, None if signal is not valid.
+        """
+        try:
+            parts = signal.split(CLOUD_SIGNAL_SEPARATOR)
+            return self._zones[parts[1]], self._entities[parts[2]], self._entity_ids[parts[3]][1:]
+        except (AttributeError, IndexError, KeyError):
+            return None
+
+    def hardware_device_key(self, signal):
+        """
+        :param signal: decoded hardware signal.
+        :return: (zone, entity, id) which sent the signal, None if signal is not valid.
+        """
+        try:
+            payload = signal.partition(HARDWARE_SIGNAL_SEPARATOR)[2]
+        except AttributeError:
+            return None
+        if len(payload) != nh.HARDWARE_SIGNAL_LENGTH:
+            return None
+        return payload[:2], payload[2], payload[3:6]
+
+    def cloud_to_hardware_many(self, signals):
+        """
+        :param signals: Iterable of decrypted cloud signals.
+        :return: (numpy array of hardware commands, numpy bool array), command is "" where signal is invalid.
+        """
+        import numpy as np
+
+        commands = []
+        for signal in signals:
+            try:
+                commands.append(self.cloud_to_hardware(signal))
+            except InvalidCloudSignal:
+                commands.append("")
+        commands = np.array(commands, dtype=str)
+        return commands, commands != ""
+
+    def hardware_to_cloud_many(self, signals):
+        """
+        Converts hardware signals with array operations only (no python loop per signal).
+        :param signals: numpy array (bytes or str, e.g. 'message' column of signal file) or list of signals.
+        :return: (numpy array of cloud signals, numpy bool array), cloud signal is "" where signal is invalid.
+        """
+        import numpy as np
+
+        raw = np.asarray(signals)
+        if raw.dtype.kind == "U":
+            raw = np.char.encode(raw)
+        elif raw.dtype.kind != "S":
+            raw = raw.astype("S")
+
+        prefix = (self._hardware_source + HARDWARE_SIGNAL_SEPARATOR).encode()
+        width = len(prefix) + nh.HARDWARE_SIGNAL_LENGTH
+        valid = (np.char.str_len(raw) == width) & np.char.startswith(raw, prefix)
+
+        payload = raw.astype("S%d" % width).view(np.uint8).reshape(-1, width)[:, len(prefix):]
+        digits = payload.astype(np.int16) - ord("0")
+        valid &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+
+        zone = digits[:, 0] * 10 + digits[:, 1]
+        entity = np.clip(digits[:, 2], 0, 9)
+        entity_id = digits[:, 3] * 100 + digits[:, 4] * 10 + digits[:, 5]
+        value = digits[:, 6] * 100 + digits[:, 7] * 10 + digits[:, 8]
+
+        entity_names = np.array([self._hw_entities.get(str(number), "") for number in range(10)])
+        valid &= (zone > 0) & (zone <= msg_hlp.MAX_ZONES) & (entity_names[entity] != "") & \
+            (entity_id <= msg_hlp.MAX_ENTITY_ID) & (value <= msg_hlp.MAX_ANALOG_VALUE)
+
+        def part(start, end):
+            return np.ascontiguousarray(payload[:, start:end]).view("S%d" % (end - start)).ravel().astype("U")
+
+        converted = np.char.add(self._cloud_signal_prefix, np.char.add(part(0, 2), CLOUD_SIGNAL_SEPARATOR))
+        converted = np.char.add(converted, np.char.add(entity_names[entity], CLOUD_SIGNAL_SEPARATOR))
+        converted = np.char.add(converted, np.char.add(part(3, 6), CLOUD_SIGNAL_SEPARATOR))
+        converted = np.char.add(converted, part(6, 9))
+        converted[~valid] = ""
+        return converted, valid
@@ -7,4 +7,5 @@ To start: run 'start.py' file.
 """
 
 from .initiate import Initiation
+from .supervisor import Supervisor
 from .cutiepi_exceptions import *
@@ -3,56 +3,87 @@
 
 """
 This file initiate different parts.
+Heavy modules (PyTables/NumPy, cryptography) are not imported here, processes which use them import them.
 """
 
-import RPi.GPIO as GPIO
 from multiprocessing import Queue as que
+from threading import Thread
 
 from .cutiepi_exceptions import *
+from .supervisor import Supervisor
 from monitor import LcdEngine
+from libraries.gpio_engine import get_gpio
+from libraries.shared_ring_buffer import SharedRingQueue
 import env_settings as ev
+import name_helper as nh
 
 
 class Initiation:
     def __init__(self):
-        GPIO.setmode(GPIO.BOARD)
-        GPIO.setwarnings(False)
+        gpio = get_gpio()
+        gpio.setmode(gpio.BOARD)
+        gpio.setwarnings(False)
         ev.set_env_variables()
 
+        import profile_helper
+        profile_helper.install()  # SIGUSR1 profiles this process, child processes install their own.
+
         self.lcd = LcdEngine()
+        self.display = None  # LcdDisplayService, started with monitor.
+        self.monitor_error = None  # Set if monitor could not be initiated.
+        self.supervisor = Supervisor()
 
         # Set queues for different sections.
-        self.__cloud_signal_receiver_queue = que()
-        self.__hardware_signal_receiver_queue = que()
-        self.__signals_to_process_queue = que()
+        self.__cloud_signal_receiver_queue = self.__new_queue()
+        self.__hardware_signal_receiver_queue = self.__new_queue()
+        self.__signals_to_process_queue = self.__new_queue()
+        # Signal file is opened (checked, created if needed) by signal recorder process, earlier signals are kept.
 
-        # Signal file create.
-        from core.signal_package import SignalFileHandler
-        file_handler = SignalFileHandler()
-        file_handler.create_file()
+    @staticmethod
+    def __new_queue():
+        """:return: Queue for signals passed between processes, as per SIGNAL_QUEUE_TRANSPORT."""
+        if nh.SIGNAL_QUEUE_TRANSPORT == "shared_memory":
+            return SharedRingQueue()
+        return que()
 
     def __initiate_monitor(self):
-        from monitor import SevenSegment, Led
+        from monitor import SevenSegment, Led, LcdDisplayService
         svn_seg = SevenSegment()
         led = Led()
 
-        if self.lcd.prepare():
-            self.lcd.display_message("Hello..! Welcome to the IoT world.")
-        else:
+        if not self.lcd.prepare():
             raise MonitorInitiationError("Error while initiating LCD.")
+
+        # LCD is drawn by display thread only, messages are posted to it without waiting.
+        def start():
+            self.display = LcdDisplayService(self.lcd)
+            self.display.start()
+            return self.display
+
+        self.supervisor.add("lcd_display", start, stop=lambda display: display.stop(), stop_order=3)
+        self.display.post("Hello..! Welcome to the IoT world.")
         # TODO: Initiate Seven segment display and LEDs
         return True
 
     def __start_signal_recorder(self):
         """
         It starts a parallel process for recording signals received from cloud and hardware.
+        It is stopped after listeners, once the queues from listeners are empty.
         :return: None
         """
         from core import ReceivedSignalsLogger
-        signal_recorder = ReceivedSignalsLogger(self.__cloud_signal_receiver_queue,
-                                                self.__hardware_signal_receiver_queue,
-                                                self.__signals_to_process_queue)
-        signal_recorder.start()
+
+        def start():
+            signal_recorder = ReceivedSignalsLogger(self.__cloud_signal_receiver_queue,
+                                                    self.__hardware_signal_receiver_queue,
+                                                    self.__signals_to_process_queue)
+            signal_recorder.start()
+            return signal_recorder
+
+        self.supervisor.add("signal_recorder", start,
+                            drained=lambda: (self.__cloud_signal_receiver_queue.empty() and
+                                             self.__hardware_signal_receiver_queue.empty()),
+                            stop_order=1)
 
     def __start_cloud_listener(self):
         """
@@ -60,8 +91,10 @@ class Initiation:
         :return: None
         """
         from cloud_engine import CloudSignal
-        cloud_signal_thread = CloudSignal()
-        cloud_signal_thread.start_reception(self.__cloud_signal_receiver_queue)
+        self.supervisor.add("cloud_listener",
+                            lambda: CloudSignal().start_reception(self.__cloud_signal_receiver_queue),
+                            stop=lambda cloud_client: cloud_client.disconnect(),
+                            stop_order=0)
 
     def __start_hardware_listener(self):
         """
@@ -69,22 +102,92 @@ class Initiation:
         :return: None
         """
         from hw_controller import HardwareSignal
-        hardware_signal_thread = HardwareSignal()
-        hardware_signal_thread.start_reception(self.__hardware_signal_receiver_queue)
+        self.supervisor.add("hardware_listener",
+                            lambda: HardwareSignal().start_reception(self.__hardware_signal_receiver_queue),
+                            stop=lambda hardware_client: hardware_client.stop(),
+                            stop_order=0)
+
+    def __start_rf_listener(self):
+        """
+        It starts a thread to receive codes via rf433 receiver, if receiver is enabled in rf433_config.json.
+        :return: None
+        """
+        from libraries import RadioSignalClient
+        from hw_controller import HardwareSignal
+        if not RadioSignalClient.reception_configured():
+            return
+        self.supervisor.add("rf_listener",
+                            lambda: HardwareSignal().start_rf_reception(self.__hardware_signal_receiver_queue),
+                            stop=lambda hardware_client: hardware_client.stop(),
+                            stop_order=0)
 
     def __start_signal_processor(self):
         """
-        It starts parallel process to process signals in "signals_to_process_queue"
+        It starts parallel process to process signals in "signals_to_process_queue".
+        It is stopped last, once "signals_to_process_queue" is empty.
         :return: None
         """
         from core.signal_processor import OutputSignalQueueProcessor
-        signal_processor = OutputSignalQueueProcessor(self.__signals_to_process_queue)
-        signal_processor.start()
+
+        def start():
+            signal_processor = OutputSignalQueueProcessor(self.__signals_to_process_queue)
+            signal_processor.start()
+            return signal_processor
+
+        self.supervisor.add("signal_processor", start,
+                            drained=self.__signals_to_process_queue.empty,
+                            stop_order=2)
+
+    def __initiate_monitor_safely(self):
+        try:
+            self.__initiate_monitor()
+        except MonitorInitiationError as error:
+            # TODO: Log error while initiating monitor. Signals are handled without it.
+            self.monitor_error = error
 
     def initiate(self):
-        # Order of calling methods matters.
-        self.__initiate_monitor()  # TODO: It could raise MonitorInitiationError. Need to handle
+        """
+        Starts all parts. Monitor (LCD) is initiated in parallel, listeners do not wait for it.
+        It returns once every part is started.
+        """
+        # Order of calling methods matters. Processes are forked first, while this process has no other thread: a
+        # lock held by a thread (LCD, GPIO, logging, MQTT) at fork time would stay held in child process for ever.
+        # Consumers of queues are then ready before listeners put signals onto them.
         self.__start_signal_recorder()
+        self.__start_signal_processor()
+
+        monitor = Thread(target=self.__initiate_monitor_safely, name="monitor_init")
+        monitor.start()
         self.__start_cloud_listener()
         self.__start_hardware_listener()
-        self.__start_signal_processor()
+        self.__start_rf_listener()
+        monitor.join()
+
+    def queue_depths(self):
+        """
+        :return: dict with number of signals waiting in each queue (approximate, as per multiprocessing.Queue.qsize).
+        """
+        return {"cloud_received": self.__cloud_signal_receiver_queue.qsize(),
+                "hardware_received": self.__hardware_signal_receiver_queue.qsize(),
+                "to_process": self.__signals_to_process_queue.qsize()}
+
+    def supervise(self):
+        """
+        Blocks until app is asked to stop (SIGTERM or SIGINT), restarting crashed parts meanwhile.
+        :return: None
+        """
+        self.supervisor.run()
+        self.__close_queues()
+
+    def stop(self):
+        """
+        Stops all parts and frees queues, for when app is run without supervise (e.g. embedded in a benchmark).
+        :return: None
+        """
+        self.supervisor.stop()
+        self.__close_queues()
+
+    def __close_queues(self):
+        for signal_queue in (self.__cloud_signal_receiver_queue, self.__hardware_signal_receiver_queue,
+                             self.__signals_to_process_queue):
+            signal_queue.close()
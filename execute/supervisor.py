@@ -0,0 +1,139 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Supervisor for worker processes and threads of CutiePi.
+It keeps the main process blocked (without using CPU) while workers run, restarts crashed workers with
+exponential backoff and stops all of them, in order, on SIGTERM or SIGINT.
+"""
+
+import os
+import signal as os_signal
+import time
+from multiprocessing import Process
+from multiprocessing.connection import wait
+
+import name_helper as nh
+
+
+class _Worker:
+    def __init__(self, name, start, stop, drained, stop_order):
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.drained = drained
+        self.stop_order = stop_order
+        self.instance = None  # Running Process or Thread object.
+        self.started_at = None
+        self.failures = 0
+        self.restart_at = None
+
+    def is_process(self):
+        return isinstance(self.instance, Process)
+
+    def is_alive(self):
+        return self.instance is not None and self.instance.is_alive()
+
+
+class Supervisor:
+    def __init__(self):
+        self.__workers = []
+        self.__stopping = False
+        self.__wakeup_read, self.__wakeup_write = os.pipe()
+        self.restarts = 0
+
+    def add(self, name, start, stop=None, drained=None, stop_order=0):
+        """
+        Starts a worker and keeps track of it.
+        :param name: Name of worker.
+        :param start: callable, starts the worker and returns started Process or Thread object.
+        :param stop: callable accepting worker's Process/Thread object, to stop it.
+            Default terminates a process, a thread is left to die with main process (should be daemon).
+        :param drained: callable returning True when nothing is left for worker to handle (checked before stop).
+        :param stop_order: Workers are stopped in ascending order of this value.
+        :return: Started Process or Thread object.
+        """
+        worker = _Worker(name, start, stop, drained, stop_order)
+        self.__workers.append(worker)
+        self.__start(worker)
+        return worker.instance
+
+    def instance(self, name):
+        """:return: Running Process or Thread object of worker with given name, None if not running."""
+        for worker in self.__workers:
+            if worker.name == name and worker.is_alive():
+                return worker.instance
+        return None
+
+    def __start(self, worker):
+        worker.instance = worker.start()
+        worker.started_at = time.monotonic()
+        worker.restart_at = None
+
+    def __schedule_restart(self, worker):
+        if time.monotonic() - worker.started_at >= nh.SUPERVISOR_STABLE_RUN_TIME:
+            worker.failures = 0
+        # Exponent is capped, a worker crashing for long must not overflow the float multiply.
+        delay = min(nh.SUPERVISOR_RESTART_MIN_DELAY * 2 ** min(worker.failures, 16), nh.SUPERVISOR_RESTART_MAX_DELAY)
+        worker.failures += 1
+        worker.restart_at = time.monotonic() + delay
+        # TODO: Log crash of worker and restart delay.
+
+    def __on_stop_signal(self, signum, frame):
+        self.__stopping = True
+        os.write(self.__wakeup_write, b"\0")
+
+    def __next_timeout(self):
+        timeouts = [worker.restart_at - time.monotonic() for worker in self.__workers if worker.restart_at]
+        if any(not worker.is_process() for worker in self.__workers if worker.restart_at is None):
+            timeouts.append(nh.SUPERVISOR_THREAD_CHECK_INTERVAL)
+        return max(0, min(timeouts)) if timeouts else None
+
+    def run(self):
+        """
+        Blocks until SIGTERM or SIGINT is received, then stops every worker.
+        Process exits are noticed immediately (via their sentinels), threads are checked periodically.
+        :return: None
+        """
+        os_signal.signal(os_signal.SIGTERM, self.__on_stop_signal)
+        os_signal.signal(os_signal.SIGINT, self.__on_stop_signal)
+
+        while not self.__stopping:
+            sentinels = [worker.instance.sentinel for worker in self.__workers
+                         if worker.restart_at is None and worker.is_process()]
+            wait(sentinels + [self.__wakeup_read], timeout=self.__next_timeout())
+            if self.__stopping:
+                break
+
+            for worker in self.__workers:
+                if worker.restart_at is None and not worker.is_alive():
+                    self.__schedule_restart(worker)
+                elif worker.restart_at is not None and worker.restart_at <= time.monotonic():
+                    self.__start(worker)
+                    self.restarts += 1
+
+        self.stop()
+
+    def stop(self):
+        """
+        Stops workers in their stop order. Before stopping a worker it waits (bounded) for its input to drain.
+        :return: None
+        """
+        for worker in sorted(self.__workers, key=lambda w: w.stop_order):
+            if not worker.is_alive():
+                continue
+
+            if worker.drained:
+                deadline = time.monotonic() + nh.SUPERVISOR_DRAIN_TIMEOUT
+                while not worker.drained() and time.monotonic() < deadline:
+                    time.sleep(0.05)
+
+            if worker.stop:
+                worker.stop(worker.instance)
+            elif worker.is_process():
+                worker.instance.terminate()
+
+            if worker.is_process():
+                worker.instance.join(nh.SUPERVISOR_DRAIN_TIMEOUT)
+            else:
+                worker.instance.join(nh.SUPERVISOR_THREAD_CHECK_INTERVAL)
@@ -5,19 +5,115 @@
 Helper Module. Main functionality includes encrypting/decrypting messages for MQTT Broker, logging the events etc.
 """
 
-from cryptography.fernet import Fernet
+import base64
+import os
 from os import environ as env
 
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, MultiFernet, InvalidToken
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
 from execute import EncryptionError, DecryptionError
+import name_helper as nh
+
+
+class CipherEngine:
+    """
+    Encrypts and decrypts signals exchanged with cloud. Keys are loaded once and cipher objects are reused.
+    Modes:
+        "fernet" (default): Fernet tokens. Encrypts with first key, decrypts with any key (key rotation).
+        "aesgcm": AES-256-GCM (AEAD) with same keys, lower overhead than Fernet.
+            Token is url-safe base64 of nonce followed by cipher text.
+    """
+
+    def __init__(self, keys, mode=nh.CIPHER_MODE_FERNET):
+        """
+        :param keys: List of url-safe base64 encoded 32-byte keys. First one is current key, rest are old keys.
+        :param mode: "fernet" or "aesgcm"
+        """
+        if not keys:
+            raise EncryptionError("No key given for cipher.")
+
+        self.mode = mode
+        if mode == nh.CIPHER_MODE_FERNET:
+            self.__fernet = MultiFernet([Fernet(key) for key in keys])
+        elif mode == nh.CIPHER_MODE_AESGCM:
+            self.__aead_ciphers = [AESGCM(base64.urlsafe_b64decode(key)) for key in keys]
+        else:
+            raise ValueError("Invalid cipher mode. Mode should be 'fernet' or 'aesgcm'.")
+
+    def encrypt(self, raw_signal):
+        if not raw_signal:
+            raise EncryptionError("Invalid signal to encrypt.")
+
+        data = raw_signal if isinstance(raw_signal, bytes) else str(raw_signal).encode()
+        if self.mode == nh.CIPHER_MODE_FERNET:
+            return self.__fernet.encrypt(data).decode()
+
+        nonce = os.urandom(nh.AESGCM_NONCE_SIZE)
+        return base64.urlsafe_b64encode(nonce + self.__aead_ciphers[0].encrypt(nonce, data, None)).decode()
+
+    def decrypt(self, encrypted_signal):
+        if not isinstance(encrypted_signal, (str, bytes)):
+            raise DecryptionError("Invalid signal type received. Can not decrypt")
+
+        token = encrypted_signal.encode() if isinstance(encrypted_signal, str) else encrypted_signal
+        if self.mode == nh.CIPHER_MODE_FERNET:
+            try:
+                return self.__fernet.decrypt(token).decode()
+            except (InvalidToken, UnicodeDecodeError):
+                raise DecryptionError("Invalid signal received. Can not decrypt")
+
+        try:
+            data = base64.urlsafe_b64decode(token)
+        except ValueError:
+            raise DecryptionError("Invalid signal received. Can not decrypt")
+        # Nonce and (at least) authentication tag are needed, anything shorter is not a token.
+        if len(data) <= nh.AESGCM_NONCE_SIZE:
+            raise DecryptionError("Invalid signal received. Can not decrypt")
+
+        nonce, cipher_text = data[:nh.AESGCM_NONCE_SIZE], data[nh.AESGCM_NONCE_SIZE:]
+        for cipher in self.__aead_ciphers:
+            try:
+                plain_text = cipher.decrypt(nonce, cipher_text, None)
+            except (InvalidTag, ValueError):
+                continue
+            try:
+                return plain_text.decode()
+            except UnicodeDecodeError:
+                raise DecryptionError("Invalid signal received. Decrypted signal is not text")
+        raise DecryptionError("Invalid signal received. Can not decrypt")
+
+    def encrypt_many(self, raw_signals):
+        encrypt = self.encrypt
+        return [encrypt(raw_signal) for raw_signal in raw_signals]
+
+    def decrypt_many(self, encrypted_signals):
+        decrypt = self.decrypt
+        return [decrypt(encrypted_signal) for encrypted_signal in encrypted_signals]
+
+
+_cipher_engine = None
+
+
+def get_cipher_engine():
+    """
+    Cipher engine of current process, created on first use from environment:
+        SECRET_KEY: current key.
+        OLD_SECRET_KEYS: (optional) comma separated old keys, still accepted for decryption.
+        CIPHER_MODE: (optional) "fernet" (default) or "aesgcm".
+    :return: CipherEngine object
+    """
+    global _cipher_engine
+    if _cipher_engine is None:
+        keys = [env["SECRET_KEY"]] + [key.strip() for key in env.get("OLD_SECRET_KEYS", "").split(",") if key.strip()]
+        _cipher_engine = CipherEngine(keys, env.get("CIPHER_MODE", nh.CIPHER_MODE_FERNET))
+    return _cipher_engine
 
 
 # Encrypt the Signal to transmit to cloud
 def encrypt_signal_for_cloud(raw_signal):
-    if not raw_signal:
-        raise EncryptionError("Invalid signal to encrypt.")
-
-    signal = str(raw_signal)
-    return Fernet(env["SECRET_KEY"].encode()).encrypt(signal.encode()).decode()
+    return get_cipher_engine().encrypt(raw_signal)
 
 
 # Decrypt the signal received from cloud
@@ -25,7 +121,7 @@ def decrypt_signal_from_cloud(encrypted_signal):
     if not isinstance(encrypted_signal, str):
         raise DecryptionError("Invalid signal type received. Can not decrypt")
 
-    return Fernet(env["SECRET_KEY"]).decrypt(encrypted_signal).decode()
+    return get_cipher_engine().decrypt(encrypted_signal)
 
 
 # Decode signal from hardware
@@ -6,58 +6,245 @@ This is entry point for sensors and actuators (or bridge between Pi and Arduino)
 Module which is responsible for controlling and monitoring actuators and sensors.
 """
 
-from threading import Thread
+import queue as qq
+import time
+from collections import OrderedDict
+from multiprocessing import Array
+from threading import Thread, Lock, Event
+
+import name_helper as nh
+import trace_helper
+
+# Layout of transmitter statistics in shared array.
+_TX_STATS = ("depth", "transmitted", "coalesced", "airtime_seconds", "started_at")
+
+
+class RadioTransmitter(Thread):
+    """
+    The only owner of rf433 transmitter pin. Codes are transmitted one after the other from a queue,
+    so waveforms of different codes never overlap. A code which is already waiting in the queue is not
+    queued again (coalescing), traces of both are marked when the code is transmitted. If other codes were
+    queued after it, the code moves behind them: the last command for a device is always transmitted last.
+    Codes can be submitted from other processes when a multiprocessing.Queue is given.
+    """
+
+    def __init__(self, code_queue=None, stats=None):
+        """
+        :param code_queue: Queue of codes (queue.Queue or multiprocessing.Queue), created if not given.
+        :param stats: multiprocessing.Array('d', 5) to publish statistics to other processes, created if not given.
+        """
+        self._code_queue = code_queue if code_queue is not None else qq.Queue()
+        self._stats = stats if stats is not None else self.shared_stats()
+        self._pending = OrderedDict()  # code: traces of signals asking for it, in order of arrival.
+        Thread.__init__(self, name="rf433_tx", daemon=True)
+
+    @staticmethod
+    def shared_stats():
+        """:return: Array to share statistics of a transmitter (running in other process)."""
+        return Array('d', len(_TX_STATS), lock=False)
+
+    @staticmethod
+    def read_stats(stats):
+        """
+        :param stats: Array used by transmitter for its statistics.
+        :return: dict with queue depth, transmitted and coalesced codes, airtime (seconds and share of time).
+        """
+        stats = dict(zip(_TX_STATS, stats[:]))
+        started_at = stats.pop("started_at")
+        elapsed = time.monotonic() - started_at if started_at else 0
+        stats["airtime_ratio"] = stats["airtime_seconds"] / elapsed if elapsed else 0.0
+        return stats
+
+    def submit(self, code, trace=None):
+        """
+        :param code: code to transmit (int)
+        :param trace: trace of signal which asked for the code (see trace_helper), None if not traced.
+        """
+        self._code_queue.put((code, trace))
+
+    def stop(self):
+        """Transmits codes already submitted and stops."""
+        self._code_queue.put(None)
+
+    def _collect(self, block):
+        """
+        Moves codes from queue to pending codes. A code already pending is not added again, it is moved to the end
+        (e.g. ON, OFF, ON is transmitted as OFF, ON).
+        :return: False if stop was requested.
+        """
+        running = True
+        while True:
+            try:
+                item = self._code_queue.get(block=block)
+            except qq.Empty:
+                break
+            block = False
+            if item is None:
+                running = False
+                continue
+            code, trace = item
+            if code in self._pending:
+                self._stats[_TX_STATS.index("coalesced")] += 1
+                self._pending[code].append(trace)
+                self._pending.move_to_end(code)
+            else:
+                self._pending[code] = [trace]
+        self._stats[_TX_STATS.index("depth")] = len(self._pending)
+        return running
+
+    def run(self):
+        from libraries import RadioSignalClient
+
+        rf_client = RadioSignalClient()
+        rf_client.enable_transmission()
+        self._stats[_TX_STATS.index("started_at")] = time.monotonic()
+
+        running = True
+        try:
+            while running or self._pending:
+                if running:
+                    running = self._collect(block=not self._pending)
+                if not self._pending:
+                    continue
+
+                code, traces = self._pending.popitem(last=False)
+                self._stats[_TX_STATS.index("depth")] = len(self._pending)
+                for trace in traces:
+                    trace_helper.mark(trace, nh.TRACE_STAGE_TX_START)
+                started = time.perf_counter()
+                rf_client.transmit_code(code)
+                for trace in traces:
+                    trace_helper.mark(trace, nh.TRACE_STAGE_TRANSMITTED)
+                self._stats[_TX_STATS.index("airtime_seconds")] += time.perf_counter() - started
+                self._stats[_TX_STATS.index("transmitted")] += 1
+        finally:
+            rf_client.cleanup()
+
+    def stats(self):
+        return self.read_stats(self._stats)
+
+
+_transmitter = None
+_transmitter_lock = Lock()
+_code_queue = None  # Set in processes which hand over codes to transmitter of another process.
+
+
+def set_transmit_queue(code_queue):
+    """
+    Codes transmitted from this process are put on code_queue (for the RadioTransmitter of another process)
+    instead of being transmitted by a transmitter of this process.
+    :param code_queue: multiprocessing.Queue object
+    :return: None
+    """
+    global _code_queue
+    _code_queue = code_queue
+
+
+def _get_transmitter():
+    global _transmitter
+    with _transmitter_lock:
+        if _transmitter is None:
+            _transmitter = RadioTransmitter()
+            _transmitter.start()
+        return _transmitter
 
 
 class _HardwareClient(Thread):
     def __init__(self, name, mode):
         self._name = name
         self._mode = mode
-        self._signal = None
         self._output_queue = None
-        Thread.__init__(self)
+        self._bt_client = None
+        self._rf_client = None
+        self._stop_event = Event()
+        # Receiver runs for lifetime of the app, it must not keep the process alive on shutdown.
+        Thread.__init__(self, daemon=(mode in ("RECEIVE", "RF_RECEIVE")))
 
     def receive(self, output_queue):
         self._output_queue = output_queue
         Thread.start(self)
 
-    def transmit(self, signal=""):
-        assert (signal != "" and len(signal) > 0, "Not a valid signal %s" % signal)
-        try:
-            self._signal = int(signal)
-            Thread.start(self)
-        except ValueError:
-            pass
-            # TODO: Log invalid signal for hardware.
-
     def run(self):
         if self._mode == "RECEIVE":
             from libraries import BluetoothClient
-            bt_client = BluetoothClient()
-            bt_client.set_output_queue(self._output_queue)
-            bt_client.receive_signal()
+            self._bt_client = BluetoothClient()
+            self._bt_client.set_output_queue(self._output_queue)
+            self._bt_client.receive_signal()
 
-        elif self._mode == "SEND":
-            """Signal transmits via rf433 transmitter."""
+        elif self._mode == "RF_RECEIVE":
+            # Codes are decoded and put onto output queue by GPIO edge callbacks, this thread only owns the receiver.
             from libraries import RadioSignalClient
-            rf_client = RadioSignalClient()
-            rf_client.enable_transmission()
-            rf_client.transmit_code(self._signal)
-            rf_client.cleanup()
+            self._rf_client = RadioSignalClient()
+            self._rf_client.set_output_queue(self._output_queue)
+            if self._rf_client.enable_reception():
+                self._stop_event.wait()
+            self._rf_client.cleanup()
 
         else:
             # TODO: Log error of invalid hardware operation.
             pass
 
+    def stop(self):
+        """Stops reception by closing the Bluetooth connection or releasing rf433 receiver."""
+        self._stop_event.set()
+        if self._bt_client:
+            self._bt_client.terminate_connection()
+
+    def connection_stats(self):
+        """
+        :return: dict with Bluetooth connection state and recovery times (see BluetoothClient.connection_stats).
+        """
+        if not self._bt_client:
+            return {}
+        return self._bt_client.connection_stats()
+
+    def rf_stats(self):
+        """
+        :return: dict with number of decoded, rejected, duplicate and dropped rf433 frames.
+        """
+        if not self._rf_client:
+            return {"decoded": 0, "rejected": 0, "duplicates": 0, "dropped": 0}
+        return {"decoded": self._rf_client.rx_decoded, "rejected": self._rf_client.rx_rejected,
+                "duplicates": self._rf_client.rx_duplicates, "dropped": self._rf_client.rx_dropped}
+
 
 class HardwareSignal:
     def __init__(self):
         self.__hardware_client = None
 
     def transmit(self, signal):
-        self.__hardware_client = _HardwareClient(name="hardware_tx", mode="SEND")
-        self.__hardware_client.transmit(signal)
+        """
+        Hands over signal to rf433 transmitter (RadioTransmitter), it returns without waiting for transmission.
+        Trace of signal being handled by this thread (trace_helper.current) goes with the code.
+        :param signal: command for hardware (string of digits)
+        :return: None
+        """
+        try:
+            code = int(signal)
+        except (TypeError, ValueError):
+            # TODO: Log invalid signal for hardware.
+            return
+
+        if _code_queue is not None:
+            _code_queue.put((code, trace_helper.current()))
+        else:
+            _get_transmitter().submit(code, trace_helper.current())
 
     def start_reception(self, output_queue):
+        """
+        :param output_queue: multiprocessing.Queue object, where to put signals after reception.
+        :return: Started receiver thread.
+        """
         self.__hardware_client = _HardwareClient(name="hardware_rx", mode="RECEIVE")
         self.__hardware_client.receive(output_queue)
+        return self.__hardware_client
+
+    def start_rf_reception(self, output_queue):
+        """
+        Starts receiving codes via rf433 receiver.
+        :param output_queue: multiprocessing.Queue object, where to put codes after reception.
+        :return: Started receiver thread.
+        """
+        self.__hardware_client = _HardwareClient(name="rf433_rx", mode="RF_RECEIVE")
+        self.__hardware_client.receive(output_queue)
+        return self.__hardware_client
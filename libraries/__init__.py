@@ -6,8 +6,15 @@ This modules provides the ability to integrate different modes of communication
 'bluetooth_engine.py':  To use Bluetooth functionality.
 'mqtt_engine.py': To publish and subscribe messages via mqtt protocol.
 'rf433_engine': To transmit or receive radio frequency signals (433 MHz band)
+'precision_timer': Low jitter timing of pulses for bit-banged waveforms.
+'gpio_engine': GPIO pins of Raspberry Pi or simulated ones.
+'idempotency_cache': Sequence numbers of received signals and dropping of duplicate ones.
+'shared_ring_buffer': Passing signals between processes through shared memory.
 """
 
-from .mqtt_engine import MqttClient
+from .mqtt_engine import MqttClient, MqttPublisher, TopicRouter
 from .bluetooth_engine import BluetoothClient
 from .rf433_engine import RadioSignalClient
+from .precision_timer import PrecisionTimer
+from .idempotency_cache import IdempotencyCache, SequenceCounter
+from .shared_ring_buffer import SharedRingBuffer, SharedRingQueue, offer_signal
@@ -3,19 +3,125 @@
 
 """
 This file provides various methods which can be used to harness the capability of Bluetooth.
+Bytes are read as soon as they arrive and split into signals by SignalFramer, a read may carry
+several signals or only a part of one. A lost connection is made again by BluetoothClient itself.
 """
 
 from os import environ as env
-from time import sleep
+import random
+import select
+import time
+from threading import Event
 import bluetooth as bt
 
 import name_helper as nh
+import trace_helper
+from .idempotency_cache import IdempotencyCache, SequenceCounter
+from .shared_ring_buffer import offer_signal
+
+_MAX_BACKOFF_EXPONENT = 16  # Reconnect delay stops doubling long before, at BLUETOOTH_RECONNECT_MAX_DELAY.
+
+# Bytes skipped between fixed length signals (line endings sent by hardware).
+_SEPARATOR_BYTES = b" \t\r\n"
+
+STATE_CONNECTING = "connecting"
+STATE_CONNECTED = "connected"
+STATE_DISCONNECTED = "disconnected"
+STATE_STOPPED = "stopped"
+
+
+class SignalFramer:
+    """
+    Splits a byte stream into signals, either of fixed length or ended by a delimiter.
+    Bytes of a partial signal are kept in the buffer till rest of it arrives. The buffer is reused, remaining bytes
+    are moved to its start only when its end is reached.
+    """
+
+    def __init__(self, frame_length=nh.HARDWARE_SIGNAL_LENGTH, delimiter=nh.BLUETOOTH_SIGNAL_DELIMITER,
+                 capacity=nh.BLUETOOTH_BUFFER_SIZE):
+        """
+        :param frame_length: Length of signal in bytes, used when there is no delimiter.
+        :param delimiter: bytes ending each signal or None.
+        :param capacity: Size of buffer in bytes, a signal longer than this is dropped.
+        """
+        self._frame_length = frame_length
+        self._delimiter = delimiter
+        self._buffer = bytearray(capacity)
+        self._start = 0  # First byte not framed yet.
+        self._end = 0  # End of received bytes.
+        self.dropped_bytes = 0
+
+    def pending(self):
+        """:return: Number of bytes received but not framed yet."""
+        return self._end - self._start
+
+    def _make_room(self, size):
+        if self._end + size <= len(self._buffer):
+            return
+        pending = self._end - self._start
+        self._buffer[:pending] = self._buffer[self._start:self._end]
+        self._start, self._end = 0, pending
+        if self._end + size > len(self._buffer):
+            # Nothing in buffer makes a signal, start afresh.
+            self.dropped_bytes += self._end
+            self._start = self._end = 0
+
+    def feed(self, data):
+        """
+        :param data: bytes received.
+        :return: list of complete signals (bytes) found so far.
+        """
+        frames = []
+        for offset in range(0, len(data), len(self._buffer)):
+            chunk = data[offset:offset + len(self._buffer)]
+            self._make_room(len(chunk))
+            self._buffer[self._end:self._end + len(chunk)] = chunk
+            self._end += len(chunk)
+            frames.extend(self._split())
+        return frames
+
+    def _split(self):
+        buffer, frames = self._buffer, []
+        if self._delimiter:
+            while True:
+                position = buffer.find(self._delimiter, self._start, self._end)
+                if position < 0:
+                    return frames
+                frames.append(bytes(buffer[self._start:position]).strip(b"\r"))
+                self._start = position + len(self._delimiter)
+
+        while True:
+            while self._start < self._end and buffer[self._start] in _SEPARATOR_BYTES:
+                self._start += 1
+            if self._end - self._start < self._frame_length:
+                return frames
+            frames.append(bytes(buffer[self._start:self._start + self._frame_length]))
+            self._start += self._frame_length
 
 
 class BluetoothClient:
+    """
+    Keeps a connection with hardware. A broken or silent (BLUETOOTH_LINK_TIMEOUT, if set) link is closed and
+    connection is made again, with exponentially growing (jittered) delay between failed attempts.
+    """
+
     def __init__(self):
-        self.bt_sock = bt.BluetoothSocket(bt.RFCOMM)
+        self.bt_sock = None
         self.__output_queue = None
+        self.__framer = None
+        self.__stop_event = Event()
+        self.__sequence = SequenceCounter("bluetooth")
+        # Dropping of repeated frames is opt-in, see BLUETOOTH_DUPLICATE_TTL.
+        self.__recent = IdempotencyCache(nh.BLUETOOTH_DUPLICATE_TTL) if nh.BLUETOOTH_DUPLICATE_TTL else None
+        self.state = STATE_DISCONNECTED
+        self.received = 0
+        self.rejected = 0
+        self.dropped = 0  # Valid signals not handed over (queue full or too big).
+        self.connects = 0
+        self.failed_attempts = 0
+        self.last_recovery_seconds = None  # Time from loss of link till it was made again.
+        self.max_recovery_seconds = 0.0
+        self.__disconnected_at = None
 
     def set_output_queue(self, output_queue):
         self.__output_queue = output_queue
@@ -25,21 +131,26 @@ class BluetoothClient:
         It accepts the raw signal string received and convert to dict format with additional info
         and puts the formatted signal onto the queue for further processing.
         :param signal: raw signal string or sting in form of bytes.
-        :return: None
+        :return: True if signal was put onto queue, False if it was dropped.
         """
         signal = {
             "message": signal.decode(),
             "protocol": "BLUETOOTH",
-            "source_type": "Bluetooth_Device"
+            "source_type": "Bluetooth_Device",
+            "sequence": self.__sequence.next(),
+            "trace": trace_helper.start_trace()
         }
-        self.__output_queue.put(signal)
+        return offer_signal(self.__output_queue, signal)
 
     def _connect_to_hardware(self):
+        # A closed socket can not connect again, every attempt uses a new one.
+        self.bt_sock = bt.BluetoothSocket(bt.RFCOMM)
         try:
             self.bt_sock.connect((env["A_HC05_DEVICE_ID"], int(env["A_HC05_PORT"])))
             return True
         except bt.btcommon.BluetoothError:
             # TODO: Log bluetooth connection error
+            self.bt_sock.close()
             return False
 
     @staticmethod
@@ -53,22 +164,112 @@ class BluetoothClient:
             return len(signal.decode()) == nh.HARDWARE_SIGNAL_LENGTH
         except AttributeError:
             return len(signal) == nh.HARDWARE_SIGNAL_LENGTH
+        except UnicodeDecodeError:
+            return False
+
+    def _handle_bytes(self, data):
+        for signal in self.__framer.feed(data):
+            if not self._is_valid_signal_received(signal):
+                # TODO: Log invalid signal received over bluetooth
+                self.rejected += 1
+            elif self.__recent is not None and self.__recent.is_duplicate(signal):
+                # TODO: Log repeated Bluetooth frame.
+                pass
+            elif self._put_signal_onto_queue(signal):
+                self.received += 1
+            else:
+                # TODO: Log Bluetooth signal dropped.
+                self.dropped += 1
+
+    @staticmethod
+    def _reconnect_delay(failures):
+        """
+        Exponential delay, of which a random half is left out so that retries do not fall in step.
+        Exponent is capped, a long outage must not overflow the float multiply (2 ** 1024).
+        """
+        delay = min(nh.BLUETOOTH_RECONNECT_MIN_DELAY * 2 ** min(failures, _MAX_BACKOFF_EXPONENT),
+                    nh.BLUETOOTH_RECONNECT_MAX_DELAY)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _on_connected(self):
+        now = time.monotonic()
+        self.connects += 1
+        self.state = STATE_CONNECTED
+        if self.__disconnected_at is not None:
+            self.last_recovery_seconds = now - self.__disconnected_at
+            self.max_recovery_seconds = max(self.max_recovery_seconds, self.last_recovery_seconds)
+            self.__disconnected_at = None
 
     def receive_signal(self):
-        if self._connect_to_hardware():
-            while True:
-                try:
-                    signal_received = self.bt_sock.recv(nh.BLUETOOTH_SIGNAL_LIMIT)
-                    self._put_signal_onto_queue(signal_received) if self._is_valid_signal_received(
-                        signal_received) else ""
-                    sleep(nh.BLUETOOTH_SIGNAL_WAIT_TIME)
-
-                except bt.btcommon.BluetoothError:
-                    # TODO: Log error while receiving signal over bluetooth
-                    self.terminate_connection()
-        else:
-            # TODO: Log error in attempting Bluetooth connection.
-            pass
+        """
+        Receives signals till connection is terminated, connecting again whenever link is lost.
+        :return: None
+        """
+        failures = 0
+        while not self.__stop_event.is_set():
+            self.state = STATE_CONNECTING
+            if not self._connect_to_hardware():
+                # TODO: Log error in attempting Bluetooth connection.
+                self.failed_attempts += 1
+                self.state = STATE_DISCONNECTED
+                if self.__disconnected_at is None:
+                    self.__disconnected_at = time.monotonic()
+                self.__stop_event.wait(self._reconnect_delay(failures))
+                failures += 1
+                continue
+
+            failures = 0
+            self._on_connected()
+            self._receive_until_broken()
+            self.bt_sock.close()
+            self.state = STATE_DISCONNECTED
+            self.__disconnected_at = time.monotonic()
+        self.state = STATE_STOPPED
+
+    def _receive_until_broken(self):
+        """Reads current connection till it breaks, goes silent or reception is stopped."""
+        self.__framer = SignalFramer()  # Partial signal of a broken link is not completed by next one.
+        poller = select.poll()
+        poller.register(self.bt_sock.fileno(), select.POLLIN)
+        timeout = int(nh.BLUETOOTH_POLL_TIMEOUT * 1000)
+        last_read = time.monotonic()
+        while not self.__stop_event.is_set():
+            try:
+                if not poller.poll(timeout):
+                    if nh.BLUETOOTH_LINK_TIMEOUT and time.monotonic() - last_read > nh.BLUETOOTH_LINK_TIMEOUT:
+                        # TODO: Log silent Bluetooth link.
+                        return
+                    continue
+                data = self.bt_sock.recv(nh.BLUETOOTH_SIGNAL_LIMIT)
+            except (bt.btcommon.BluetoothError, OSError, ValueError):
+                # TODO: Log error while receiving signal over bluetooth
+                return
+            if not data:
+                # TODO: Log Bluetooth connection closed by hardware.
+                return
+            last_read = time.monotonic()
+            self._handle_bytes(data)
+
+    def connection_stats(self):
+        """
+        :return: dict with connection state, number of (failed) connection attempts, recovery times (seconds)
+            and number of received/rejected/duplicate/dropped signals.
+        """
+        return {
+            "state": self.state,
+            "connects": self.connects,
+            "failed_attempts": self.failed_attempts,
+            "last_recovery_seconds": self.last_recovery_seconds,
+            "max_recovery_seconds": self.max_recovery_seconds,
+            "down_seconds": time.monotonic() - self.__disconnected_at if self.__disconnected_at else 0.0,
+            "received": self.received,
+            "rejected": self.rejected,
+            "duplicates": self.__recent.duplicates if self.__recent is not None else 0,
+            "dropped": self.dropped,
+        }
 
     def terminate_connection(self):
-        self.bt_sock.close()
+        """Stops reception for good."""
+        self.__stop_event.set()
+        if self.bt_sock is not None:
+            self.bt_sock.close()
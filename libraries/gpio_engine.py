@@ -0,0 +1,156 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Access to GPIO pins, on a Raspberry Pi (RPi.GPIO) or simulated (any Linux box, for benchmarks).
+Backend is selected by environment variable GPIO_BACKEND ("rpi" by default or "simulated").
+Both backends provide same functions as RPi.GPIO (setmode, setup, output, input, add_event_detect ...).
+"""
+
+import os
+import time
+from collections import deque
+from threading import Lock
+
+import name_helper as nh
+
+# Same values as in RPi.GPIO
+LOW = 0
+HIGH = 1
+
+_gpio = None
+
+
+def get_gpio():
+    """
+    :return: GPIO backend of this process (RPi.GPIO module or SimulatedGpio object).
+    """
+    global _gpio
+    if _gpio is None:
+        if os.environ.get("GPIO_BACKEND", nh.GPIO_BACKEND_RPI) == nh.GPIO_BACKEND_SIMULATED:
+            _gpio = SimulatedGpio()
+        else:
+            import RPi.GPIO as GPIO
+            _gpio = GPIO
+    return _gpio
+
+
+class OutputBus:
+    """
+    Group of output pins written together as one value (bit i of value on i-th pin), with one GPIO call.
+    """
+
+    def __init__(self, gpio, channels):
+        """
+        :param gpio: GPIO backend (see get_gpio).
+        :param channels: list of pin numbers, least significant bit first.
+        """
+        self.channels = [int(channel) for channel in channels]
+        self._output = gpio.output
+        # Levels of every pin for every value, so that a write does not compute bits.
+        self._levels = [tuple((value >> bit) & 1 for bit in range(len(self.channels)))
+                        for value in range(1 << len(self.channels))]
+        gpio.setup(self.channels, gpio.OUT)
+
+    def write(self, value):
+        self._output(self.channels, self._levels[value])
+
+
+class SimulatedGpio:
+    """
+    Pure python GPIO. Every level change of a pin is recorded in 'edges' as (perf_counter_ns, channel, level).
+    Levels of input pins are changed with 'drive', which calls callbacks added by add_event_detect.
+    """
+
+    BOARD = 10
+    BCM = 11
+    OUT = 0
+    IN = 1
+    LOW = LOW
+    HIGH = HIGH
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+
+    def __init__(self, max_edges=nh.SIMULATED_GPIO_MAX_EDGES):
+        self.mode = None
+        self.writes = 0  # Number of output calls.
+        self.edges = deque(maxlen=max_edges)
+        self._directions = {}
+        self._levels = {}
+        self._callbacks = {}  # channel: (edge, callback)
+        self._lock = Lock()
+        # A thread of parent process (e.g. LCD) may hold the lock while a child process is forked.
+        os.register_at_fork(after_in_child=self._new_lock)
+
+    def _new_lock(self):
+        self._lock = Lock()
+
+    @staticmethod
+    def _as_list(channel):
+        return list(channel) if isinstance(channel, (list, tuple)) else [channel]
+
+    def setmode(self, mode):
+        self.mode = mode
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, channel, direction, pull_up_down=None, initial=None):
+        for pin in self._as_list(channel):
+            self._directions[pin] = direction
+            self._levels.setdefault(pin, LOW)
+            if direction == self.OUT and initial is not None:
+                self.output(pin, initial)
+
+    def _set_level(self, pin, level, timestamp):
+        level = HIGH if level else LOW
+        if self._levels.get(pin, LOW) != level:
+            self._levels[pin] = level
+            self.edges.append((timestamp, pin, level))
+            return True
+        return False
+
+    def output(self, channel, value):
+        timestamp = time.perf_counter_ns()
+        pins = self._as_list(channel)
+        values = self._as_list(value) if isinstance(value, (list, tuple)) else [value] * len(pins)
+        if len(values) != len(pins):
+            raise RuntimeError("Number of channels != number of values")
+
+        with self._lock:
+            self.writes += 1
+            for pin, level in zip(pins, values):
+                if self._directions.get(pin) != self.OUT:
+                    raise RuntimeError("The GPIO channel has not been set up as an OUTPUT")
+                self._set_level(pin, level, timestamp)
+
+    def input(self, channel):
+        return self._levels.get(channel, LOW)
+
+    def drive(self, channel, level):
+        """
+        Changes level of an input pin, as an external device would.
+        :return: None
+        """
+        with self._lock:
+            changed = self._set_level(channel, level, time.perf_counter_ns())
+            edge, callback = self._callbacks.get(channel, (None, None))
+        if changed and callback is not None and \
+                (edge == self.BOTH or edge == (self.RISING if level else self.FALLING)):
+            callback(channel)
+
+    def add_event_detect(self, channel, edge, callback=None, bouncetime=None):
+        if self._directions.get(channel) != self.IN:
+            raise RuntimeError("You must setup() the GPIO channel as an input first")
+        self._callbacks[channel] = (edge, callback)
+
+    def remove_event_detect(self, channel):
+        self._callbacks.pop(channel, None)
+
+    def cleanup(self, channel=None):
+        pins = self._as_list(channel) if channel is not None else list(self._directions)
+        for pin in pins:
+            self._directions.pop(pin, None)
+            self._levels.pop(pin, None)
+            self._callbacks.pop(pin, None)
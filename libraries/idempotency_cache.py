@@ -0,0 +1,126 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Identity of received signals.
+SequenceCounter numbers signals of one source (stored as "name" in signal file).
+IdempotencyCache remembers recently received signals, so that a redelivered MQTT message or a repeated Bluetooth
+frame / rf433 code is dropped at reception, before it is logged or processed again.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+import name_helper as nh
+
+
+class SequenceCounter:
+    """
+    Monotonic sequence numbers of one source. Counting starts at current time in microseconds or, for a named
+    counter, after the last number it may have issued before, whichever is higher. Raspberry Pi has no real time
+    clock, its time can be behind after a reboot (till it is synced), so the clock alone does not keep numbers
+    growing across restarts.
+    A named counter reserves numbers in blocks (SEQUENCE_RESERVE_BLOCK) and saves end of the block in
+    HOME_DIR/SEQUENCE_DIR/<name> before issuing from it, so the file is written once per block, not per signal.
+    """
+
+    def __init__(self, name=None):
+        """
+        :param name: Name of source (e.g. "mqtt"), None for a counter which is not saved.
+        """
+        self.__file_name = os.path.join(os.environ['HOME_DIR'], nh.SEQUENCE_DIR, name) if name else None
+        self.__next = None  # Counting starts with first number, a client which receives nothing writes nothing.
+        self.__reserved = None
+
+    def __read_reserved(self):
+        try:
+            with open(self.__file_name) as reserved_file:
+                return int(reserved_file.read().strip() or 0)
+        except (OSError, ValueError):
+            # TODO: Log unreadable sequence file.
+            return 0
+
+    def __reserve(self):
+        self.__reserved = self.__next + nh.SEQUENCE_RESERVE_BLOCK
+        if not self.__file_name:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.__file_name), exist_ok=True)
+            temp_file = "%s.%d.tmp" % (self.__file_name, os.getpid())
+            with open(temp_file, "w") as reserved_file:
+                reserved_file.write(str(self.__reserved))
+                reserved_file.flush()
+                os.fsync(reserved_file.fileno())  # Power may be cut, not just the app.
+            os.replace(temp_file, self.__file_name)
+        except OSError:
+            # TODO: Log error while saving sequence, numbers keep growing till restart anyway.
+            pass
+
+    def next(self):
+        if self.__next is None:
+            self.__next = time.time_ns() // 1000
+            if self.__file_name:
+                self.__next = max(self.__next, self.__read_reserved())
+            self.__reserve()
+        elif self.__next >= self.__reserved:
+            self.__reserve()
+        number = self.__next
+        self.__next += 1
+        return number
+
+
+class IdempotencyCache:
+    """
+    Bounded LRU cache of keys seen in last ttl seconds. Key of a signal is its sequence number, if its source sends
+    one, or hash of its content (see content_key).
+    A key is remembered for ttl seconds from its first sighting, repeats do not extend that time. Expired and
+    (beyond capacity) least recently seen keys are forgotten.
+    """
+
+    def __init__(self, ttl, capacity=nh.IDEMPOTENCY_CACHE_SIZE):
+        """
+        :param ttl: Seconds for which a repeat of a key is taken as duplicate.
+        :param capacity: Maximum number of keys remembered.
+        """
+        self.ttl = ttl
+        self.capacity = capacity
+        self.__expiry = OrderedDict()  # key: time (monotonic) it expires at, least recently seen first.
+        self.duplicates = 0
+
+    @staticmethod
+    def content_key(*parts):
+        """
+        :param parts: str or bytes which make a signal (e.g. topic and payload).
+        :return: 16 bytes digest of parts.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(part.encode() if isinstance(part, str) else part)
+            digest.update(b"\0")
+        return digest.digest()
+
+    def is_duplicate(self, key):
+        """
+        :param key: key of received signal.
+        :return: True if key was seen in last ttl seconds, else key is remembered and False is returned.
+        """
+        now = time.monotonic()
+        expiry = self.__expiry.get(key)
+        if expiry is not None and expiry > now:
+            self.__expiry.move_to_end(key)
+            self.duplicates += 1
+            return True
+
+        self.__expiry[key] = now + self.ttl
+        self.__expiry.move_to_end(key)
+        while self.__expiry:
+            oldest_key, oldest_expiry = next(iter(self.__expiry.items()))
+            if oldest_expiry > now and len(self.__expiry) <= self.capacity:
+                break
+            del self.__expiry[oldest_key]
+        return False
+
+    def __len__(self):
+        return len(self.__expiry)
@@ -8,8 +8,78 @@ This module provides a way to publish and subscribe messages using MQTT protocol
 
 import time
 import os
+from threading import Event, Lock
 
 from execute.cutiepi_exceptions import CloudConnectionError
+import name_helper as nh
+import trace_helper
+from .idempotency_cache import IdempotencyCache, SequenceCounter
+from .shared_ring_buffer import offer_signal
+
+
+_ROUTES = None  # Key of route indexes in a node of topic trie (topic levels are strings).
+
+
+class TopicRouter:
+    """
+    Maps topic of a received message to its destinations, by MQTT topic filters ("+" and "#" wildcards allowed).
+    Routing table is compiled once: filters without wildcard go to a dict, others to a trie of topic levels.
+    Result for each topic is cached, so a topic seen before is routed with one dict lookup.
+    """
+
+    def __init__(self, routes):
+        """
+        :param routes: list of (topic filter, destination), destination is a queue (put) or a callable.
+        """
+        self.__routes = list(routes)
+        self.__exact = {}
+        self.__trie = {}
+        self.__cache = {}
+        for index, (topic_filter, _) in enumerate(self.__routes):
+            levels = topic_filter.split("/")
+            if any(("+" in level or "#" in level) and len(level) > 1 for level in levels) or \
+                    "#" in levels[:-1]:
+                raise ValueError("Invalid topic filter: %s" % topic_filter)
+
+            if "+" in levels or "#" in levels:
+                node = self.__trie
+                for level in levels:
+                    node = node.setdefault(level, {})
+                node.setdefault(_ROUTES, []).append(index)
+            else:
+                self.__exact.setdefault(topic_filter, []).append(index)
+
+    def topic_filters(self):
+        """:return: list of topic filters to subscribe (without duplicates)."""
+        return list(dict.fromkeys(topic_filter for topic_filter, _ in self.__routes))
+
+    def route(self, topic):
+        """
+        :param topic: topic of received message.
+        :return: tuple of destinations (in order of routes, without duplicates), empty if no filter matches.
+        """
+        destinations = self.__cache.get(topic)
+        if destinations is None:
+            indexes = set(self.__exact.get(topic, ()))
+            self.__match(self.__trie, topic.split("/"), 0, indexes)
+            destinations = tuple(dict.fromkeys(self.__routes[index][1] for index in sorted(indexes)))
+            if len(self.__cache) >= nh.MQTT_ROUTE_CACHE_SIZE:
+                self.__cache.clear()
+            self.__cache[topic] = destinations
+        return destinations
+
+    def __match(self, node, levels, depth, indexes):
+        # Wildcards do not match topics starting with "$" (broker's own topics) at first level.
+        wildcards = depth > 0 or not levels[0].startswith("$")
+        if wildcards and "#" in node:
+            # "#" matches rest of levels, including none ("a/#" matches "a").
+            indexes.update(node["#"][_ROUTES])
+        if depth == len(levels):
+            indexes.update(node.get(_ROUTES, ()))
+            return
+        for key in (levels[depth], "+") if wildcards else (levels[depth],):
+            if key in node:
+                self.__match(node[key], levels, depth + 1, indexes)
 
 
 class MqttClient:
@@ -25,10 +95,26 @@ class MqttClient:
         self.__sub_msgs = []
         self.__qos = 0
         self.__output_queue = None
+        self.__router = None
+        self.unrouted = 0  # Messages on a topic without any route.
+        self.dropped = 0  # Messages not handed over (not text, queue full or too big).
+        self.__sequence = SequenceCounter("mqtt")
+        self.__recent = IdempotencyCache(nh.CLOUD_DUPLICATE_TTL)
 
     def set_output_queue(self, output_queue):
         self.__output_queue = output_queue
 
+    def set_router(self, router):
+        """
+        :param router: TopicRouter object, received messages go to its destinations instead of output queue.
+        """
+        self.__router = router
+
+    @property
+    def duplicates(self):
+        """Number of messages dropped as duplicates."""
+        return self.__recent.duplicates
+
     def __on_connect(self, client, userdata, flags, rc):
         if rc != 0:
             raise CloudConnectionError("MQTT Broker connection failed.")
@@ -51,17 +137,45 @@ class MqttClient:
     def __on_message(self, client, userdata, message):
         """
         It puts the received messages onto output_queue.
+        A message received again on same topic (redelivery) is dropped, a new command is a new (encrypted) payload.
+        A message which can not be handed over (not text, queue full or too big) is dropped and counted, it must
+        not stop network thread of MQTT client.
         :param message: Message received from Broker.
         :return: None
         """
+        if self.__recent.is_duplicate(IdempotencyCache.content_key(message.topic, message.payload)):
+            # TODO: Log duplicate message received from cloud.
+            return
         self.__sub_msgs.append(str(message.payload))
+        try:
+            payload = message.payload.decode()
+        except UnicodeDecodeError:
+            # TODO: Log message received from cloud which is not text.
+            self.dropped += 1
+            return
         signal_received = {
-            "message": message.payload.decode(),
+            "message": payload,
             "protocol": "MQTT",
-            "source_type": "Remote_MQTT_Broker"
+            "source_type": "Remote_MQTT_Broker",
+            "topic": message.topic,
+            "sequence": self.__sequence.next(),
+            "trace": trace_helper.start_trace()
         }
-        if self.__output_queue:
-            self.__output_queue.put(signal_received)
+        if self.__router is None:
+            if self.__output_queue is not None and not offer_signal(self.__output_queue, signal_received):
+                self.dropped += 1
+            return
+
+        destinations = self.__router.route(message.topic)
+        if not destinations:
+            # TODO: Log message received on a topic without route.
+            self.unrouted += 1
+        for destination in destinations:
+            if hasattr(destination, "put"):
+                if not offer_signal(destination, signal_received):
+                    self.dropped += 1
+            else:
+                destination(signal_received)
 
     def __connect_to_cloud(self):
         """
@@ -86,8 +200,6 @@ class MqttClient:
         except:
             raise CloudConnectionError("MQTT Broker connection failed.")
 
-        time.sleep(0.2)
-
     def transmit_signal(self, channel, message):
         self.__connect_to_cloud()
 
@@ -102,9 +214,16 @@ class MqttClient:
             raise CloudConnectionError("Error occurred during transmission of signal to channel: ", channel)
 
     def receive_signal(self, channel):
+        """
+        Subscribes and receives messages till disconnected.
+        :param channel: topic (filter) or list of them.
+        """
         self.__connect_to_cloud()
         try:
-            self.mqtt_client.subscribe(channel, qos=self.__qos)
+            if isinstance(channel, (list, tuple)):
+                self.mqtt_client.subscribe([(topic, self.__qos) for topic in channel])
+            else:
+                self.mqtt_client.subscribe(channel, qos=self.__qos)
             self.mqtt_client.loop_forever()
         except:
             self.disconnect_from_cloud()
@@ -113,3 +232,117 @@ class MqttClient:
     def disconnect_from_cloud(self):
         self.mqtt_client.disconnect()
         time.sleep(0.1)
+
+
+class MqttPublisher:
+    """
+    Long lived publisher. It connects once to MQTT Broker and reuses that connection for every signal.
+    Delivery is confirmed by "on_publish" callback (instead of fixed sleeps) and paho's network loop
+    reconnects on its own if connection to broker is lost.
+    """
+
+    def __init__(self, mqtt_client, qos=nh.MQTT_PUBLISHER_QOS, publish_timeout=nh.MQTT_PUBLISH_TIMEOUT):
+        """
+        :param mqtt_client: paho.mqtt.client.Client object
+        :param qos: QoS level for published messages.
+        :param publish_timeout: Seconds to wait for broker connection and delivery confirmation.
+        """
+        self.mqtt_client = mqtt_client
+        self.__qos = qos
+        self.__publish_timeout = publish_timeout
+        self.__started = False
+        self.__connected = Event()
+        self.__lock = Lock()
+        self.__pending = {}  # message id -> Event, set when broker confirms delivery.
+        self.__confirmed_early = set()  # message ids confirmed before publish() registered them.
+        self.__timed_out = set()  # message ids given up on, their late confirmation is ignored.
+        self.published_count = 0
+
+    def __on_connect(self, client, userdata, flags, rc):
+        if rc == 0:
+            self.__connected.set()
+
+    def __on_disconnect(self, client, userdata, rc):
+        # Do not stop the loop here, it keeps on reconnecting in background.
+        self.__connected.clear()
+
+    def __on_publish(self, client, userdata, mid):
+        with self.__lock:
+            delivered = self.__pending.pop(mid, None)
+            if delivered is None:
+                if mid in self.__timed_out:
+                    # Late confirmation, it must not confirm a later message reusing this id.
+                    self.__timed_out.discard(mid)
+                else:
+                    self.__confirmed_early.add(mid)
+        if delivered is not None:
+            delivered.set()
+
+    def start(self):
+        """
+        Connects to MQTT broker (only once) and starts network loop in a background thread.
+        :return: None
+        """
+        with self.__lock:
+            if self.__started:
+                return
+
+            self.mqtt_client.username_pw_set(os.environ['MQTT_USERNAME'], os.environ['MQTT_PASSWORD'])
+            self.mqtt_client.on_connect = self.__on_connect
+            self.mqtt_client.on_disconnect = self.__on_disconnect
+            self.mqtt_client.on_publish = self.__on_publish
+            self.mqtt_client.reconnect_delay_set(min_delay=nh.MQTT_RECONNECT_MIN_DELAY,
+                                                 max_delay=nh.MQTT_RECONNECT_MAX_DELAY)
+            try:
+                self.mqtt_client.connect_async(
+                    os.environ['MQTT_HOST'],
+                    int(os.environ['MQTT_PORT']),
+                    int(os.environ['MQTT_KEEPALIVE'])
+                )
+                self.mqtt_client.loop_start()
+            except Exception:
+                raise CloudConnectionError("MQTT Broker connection failed.")
+            self.__started = True
+
+    def is_connected(self):
+        return self.__connected.is_set()
+
+    def transmit_signal(self, channel, message):
+        """
+        Publishes message on channel and blocks until broker confirms the delivery.
+        :param channel: topic to publish on.
+        :param message: message to publish.
+        :return: None
+        """
+        self.start()
+        if not self.__connected.wait(self.__publish_timeout):
+            raise CloudConnectionError("MQTT Broker is not reachable.")
+
+        message_info = self.mqtt_client.publish(topic=channel, payload=str(message), qos=self.__qos)
+        if message_info.rc != 0:  # paho.mqtt.client.MQTT_ERR_SUCCESS
+            raise CloudConnectionError("Error occurred during transmission of signal to channel: ", channel)
+
+        delivered = Event()
+        with self.__lock:
+            self.__timed_out.discard(message_info.mid)  # Id is reused (ids wrap), it belongs to this message now.
+            if message_info.mid in self.__confirmed_early:
+                self.__confirmed_early.discard(message_info.mid)
+                delivered.set()
+            else:
+                self.__pending[message_info.mid] = delivered
+
+        if not delivered.wait(self.__publish_timeout):
+            with self.__lock:
+                if self.__pending.pop(message_info.mid, None) is not None:
+                    self.__timed_out.add(message_info.mid)
+            raise CloudConnectionError("Delivery not confirmed for signal on channel: ", channel)
+        self.published_count += 1
+
+    def stop(self):
+        with self.__lock:
+            if not self.__started:
+                return
+            self.__started = False
+        self.mqtt_client.disconnect()
+        self.mqtt_client.loop_stop()
+        self.__connected.clear()
@@ -0,0 +1,64 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Low jitter timing for bit-banged waveforms.
+Deadlines are measured (with perf_counter_ns) from the start of a frame, so error of one pulse does not add up
+to next pulses. Waiting sleeps for most of the time and spins only for the last few microseconds.
+"""
+
+import time
+
+SPIN_THRESHOLD_NS = 200000  # Last 200 us before a deadline are spent spinning, not sleeping.
+
+
+class PrecisionTimer:
+    def __init__(self, spin_threshold_ns=SPIN_THRESHOLD_NS):
+        self.spin_threshold_ns = spin_threshold_ns
+        self._deadline = 0
+        # Lateness (actual - deadline) statistics, in nanoseconds.
+        self._count = 0
+        self._sum = 0
+        self._sum_of_squares = 0
+        self._max = 0
+
+    def start_frame(self):
+        """Marks start of a frame, following waits are measured from now."""
+        self._deadline = time.perf_counter_ns()
+
+    def wait(self, duration_us):
+        """
+        Waits until end of next pulse of the frame.
+        :param duration_us: Pulse duration in microseconds.
+        :return: None
+        """
+        self._deadline += duration_us * 1000
+        deadline = self._deadline
+        remaining = deadline - time.perf_counter_ns()
+        if remaining > self.spin_threshold_ns:
+            time.sleep((remaining - self.spin_threshold_ns) / 1e9)
+
+        now = time.perf_counter_ns()
+        while now < deadline:
+            now = time.perf_counter_ns()
+
+        lateness = now - deadline
+        self._count += 1
+        self._sum += lateness
+        self._sum_of_squares += lateness * lateness
+        if lateness > self._max:
+            self._max = lateness
+
+    def jitter(self):
+        """
+        :return: dict with number of waits, mean, standard deviation and maximum lateness in microseconds.
+        """
+        if not self._count:
+            return {"waits": 0, "mean_us": 0.0, "stdev_us": 0.0, "max_us": 0.0}
+        mean = self._sum / self._count
+        variance = max(0.0, self._sum_of_squares / self._count - mean * mean)
+        return {"waits": self._count, "mean_us": mean / 1000, "stdev_us": variance ** 0.5 / 1000,
+                "max_us": self._max / 1000}
+
+    def reset_jitter(self):
+        self._count = self._sum = self._sum_of_squares = self._max = 0
@@ -7,10 +7,17 @@ import time
 import json
 import os
 from collections import namedtuple
+from functools import lru_cache
 
-from RPi import GPIO
+import name_helper as nh
+import trace_helper
+from .gpio_engine import get_gpio, HIGH, LOW
+from .idempotency_cache import IdempotencyCache, SequenceCounter
+from .precision_timer import PrecisionTimer
+from .shared_ring_buffer import offer_signal
 
 MAX_CHANGES = 67
+WAVEFORM_CACHE_SIZE = 256  # Number of compiled (code, protocol, pulse length, code length, repeat) waveforms
 
 Protocol = namedtuple('Protocol', ['pulselength', 'sync_high', 'sync_low', 'zero_high',
                                    'zero_low', 'one_high', 'one_low'])
@@ -23,11 +30,50 @@ PROTOCOLS = (None,
              Protocol(200, 1, 10, 1, 5, 1, 1))
 
 
+@lru_cache(maxsize=WAVEFORM_CACHE_SIZE)
+def compile_waveform(code, tx_proto, tx_pulselength, tx_length, tx_repeat):
+    """
+    Compiles a code to the pulses of a complete transmission (all repeats).
+    Protocol must be valid (0 < tx_proto < len(PROTOCOLS)).
+    :return: tuple of (level, duration in microseconds) pairs, levels alternate between HIGH and LOW.
+    """
+    protocol = PROTOCOLS[tx_proto]
+    raw_binary_str = "{0:b}".format(code).zfill(tx_length)[:tx_length]
+    if tx_proto == 6:
+        raw_binary_str = "".join("01" if bit == "0" else "10" for bit in raw_binary_str)
+
+    sync = ((HIGH, protocol.sync_high * tx_pulselength), (LOW, protocol.sync_low * tx_pulselength))
+    bits = {"0": ((HIGH, protocol.zero_high * tx_pulselength), (LOW, protocol.zero_low * tx_pulselength)),
+            "1": ((HIGH, protocol.one_high * tx_pulselength), (LOW, protocol.one_low * tx_pulselength))}
+
+    frame = []
+    if tx_proto == 6:
+        frame.extend(sync)
+    for bit in raw_binary_str:
+        frame.extend(bits[bit])
+    frame.extend(sync)
+    return tuple(frame) * tx_repeat
+
+
+@lru_cache(maxsize=1)
+def _rx_protocol_table():
+    """
+    Timings of PROTOCOLS (without None) as numpy arrays, to match all protocols at once while receiving.
+    bit_values: value of each bit position, for longest possible code (MSB first).
+    """
+    import numpy as np
+    table = {field: np.array([getattr(protocol, field) for protocol in PROTOCOLS[1:]], dtype=np.int64)
+             for field in ('sync_low', 'zero_high', 'zero_low', 'one_high', 'one_low')}
+    table["bit_values"] = np.left_shift(np.int64(1), np.arange(MAX_CHANGES // 2, -1, -1, dtype=np.int64))
+    return table
+
+
 class RadioSignalClient:
     """Representation of a GPIO RF device."""
 
     def __init__(self, tx_proto=1, tx_pulselength=None, tx_repeat=3, tx_length=24, rx_tolerance=80):
         """Initialize the RF device."""
+        self.gpio = get_gpio()
         self.target_pin = None
         self.tx_enabled = False
         self.tx_proto = tx_proto
@@ -35,10 +81,12 @@ class RadioSignalClient:
 
         self.tx_repeat = tx_repeat
         self.tx_length = tx_length
+        self.timer = PrecisionTimer()
         self.rx_enabled = False
         self.rx_tolerance = rx_tolerance
         # internal values
-        self._rx_timings = [0] * (MAX_CHANGES + 1)
+        self._rx_timings = None  # Allocated when reception is enabled.
+        self._rx_output_queue = None
         self._rx_last_timestamp = 0
         self._rx_change_count = 0
         self._rx_repeat_count = 0
@@ -48,6 +96,16 @@ class RadioSignalClient:
         self.rx_proto = None
         self.rx_bitlength = None
         self.rx_pulselength = None
+        self.rx_decoded = 0
+        self.rx_rejected = 0
+        self.rx_dropped = 0  # Decoded codes not handed over (queue full).
+        self._rx_sequence = SequenceCounter("rf433")
+        self._rx_recent = IdempotencyCache(nh.RF433_DUPLICATE_TTL)
+
+    @property
+    def rx_duplicates(self):
+        """Number of decoded codes dropped as repeats (see RF433_DUPLICATE_TTL)."""
+        return self._rx_recent.duplicates
 
     def enable_transmission(self):
         """
@@ -60,7 +118,7 @@ class RadioSignalClient:
             with open(os.path.join(os.environ["CONFIG_DIR"], 'rf433_config.json')) as rf_conn:
                 rf_config = json.load(rf_conn)
                 self.target_pin = int(rf_config["tx_pin"])
-                GPIO.setup(self.target_pin, GPIO.OUT)
+                self.gpio.setup(self.target_pin, self.gpio.OUT)
                 self.tx_enabled = True
         return self.tx_enabled
 
@@ -68,7 +126,7 @@ class RadioSignalClient:
         """Disable TX, reset GPIO."""
         if self.tx_enabled:
             # set up GPIO pin as input for safety
-            GPIO.setup(self.target_pin, GPIO.IN)
+            self.gpio.setup(self.target_pin, self.gpio.IN)
             self.tx_enabled = False
         return not self.tx_enabled
 
@@ -95,90 +153,70 @@ class RadioSignalClient:
         else:
             self.tx_length = 24
 
-        raw_binary_str = "{0:b}".format(code).zfill(self.tx_length)
-
+        code_length = self.tx_length
         if self.tx_proto == 6:
-            nexa_code = ""
-            for bit in raw_binary_str:
-                if bit == '0':
-                    nexa_code = nexa_code + "01"
-                if bit == '1':
-                    nexa_code = nexa_code + "10"
-            raw_binary_str = nexa_code
-            self.tx_length = 64
-        return self._transmit_binary(raw_binary_str)
-
-    def _transmit_binary(self, raw_binary_str):
-        """Send a binary code."""
-        for _ in range(0, self.tx_repeat):
-            if self.tx_proto == 6:
-                if not self._tx_sync():
-                    return False
-            for byte in range(0, self.tx_length):
-                if raw_binary_str[byte] == '0':
-                    if not self._tx_l0():
-                        return False
-                else:
-                    if not self._tx_l1():
-                        return False
-            if not self._tx_sync():
-                return False
-        return True
+            self.tx_length = code_length * 2  # Every bit is sent as two bits.
 
-    def _tx_l0(self):
-        """Send a '0' bit."""
         if not 0 < self.tx_proto < len(PROTOCOLS):
             return False
-        return self._tx_waveform(PROTOCOLS[self.tx_proto].zero_high,
-                                 PROTOCOLS[self.tx_proto].zero_low)
+        return self._transmit_waveform(compile_waveform(code, self.tx_proto, self.tx_pulselength,
+                                                        code_length, self.tx_repeat))
 
-    def _tx_l1(self):
-        """Send a '1' bit."""
-        if not 0 < self.tx_proto < len(PROTOCOLS):
-            return False
-        return self._tx_waveform(PROTOCOLS[self.tx_proto].one_high,
-                                 PROTOCOLS[self.tx_proto].one_low)
-
-    def _tx_sync(self):
-        """Send a sync."""
-        if not 0 < self.tx_proto < len(PROTOCOLS):
-            return False
-        return self._tx_waveform(PROTOCOLS[self.tx_proto].sync_high,
-                                 PROTOCOLS[self.tx_proto].sync_low)
-
-    def _tx_waveform(self, highpulses, lowpulses):
-        """Send basic waveform."""
+    def _transmit_waveform(self, pulses):
+        """
+        Send compiled pulses.
+        :param pulses: tuple of (level, duration in microseconds) pairs (see compile_waveform).
+        """
         if not self.tx_enabled:
             return False
-        GPIO.output(self.target_pin, GPIO.HIGH)
-        self._sleep((highpulses * self.tx_pulselength) / 1000000)
-        GPIO.output(self.target_pin, GPIO.LOW)
-        self._sleep((lowpulses * self.tx_pulselength) / 1000000)
+        output, wait, target_pin = self.gpio.output, self.timer.wait, self.target_pin
+        self.timer.start_frame()
+        for level, duration in pulses:
+            output(target_pin, level)
+            wait(duration)
         return True
 
     # For Reception....
+    @staticmethod
+    def reception_configured():
+        """
+        :return: True if rf433 receiver is enabled in rf433_config.json ("rx_enabled": true or "true").
+        """
+        with open(os.path.join(os.environ["CONFIG_DIR"], 'rf433_config.json')) as rf_conn:
+            return str(json.load(rf_conn).get("rx_enabled", False)).lower() == "true"
+
+    def set_output_queue(self, output_queue):
+        """
+        :param output_queue: Queue where received codes are put (same format as other hardware signals).
+        """
+        self._rx_output_queue = output_queue
+
     def enable_reception(self):
         """Enable RX, set up GPIO and add event detection."""
         if self.tx_enabled:
             return False
         if not self.rx_enabled:
+            import numpy as np
+            # Preallocated, edge timings are written in place by rx_callback.
+            self._rx_timings = np.zeros(MAX_CHANGES + 1, dtype=np.int64)
             with open(os.path.join(os.environ["CONFIG_DIR"], 'rf433_config.json')) as rf_conn:
                 rf_config = json.load(rf_conn)
                 self.target_pin = int(rf_config["rx_pin"])
-                GPIO.setup(self.target_pin, GPIO.OUT)
+                self.gpio.setup(self.target_pin, self.gpio.IN)
+                self.gpio.add_event_detect(self.target_pin, self.gpio.BOTH, callback=self.rx_callback)
                 self.rx_enabled = True
         return self.rx_enabled
 
     def _disable_reception(self):
         """Disable RX, remove GPIO event detection."""
         if self.rx_enabled:
-            GPIO.remove_event_detect(self.target_pin)
+            self.gpio.remove_event_detect(self.target_pin)
             self.rx_enabled = False
         return True
 
     def rx_callback(self, target_pin):
         """RX callback for GPIO event detection. Handle basic signal detection."""
-        timestamp = int(time.perf_counter() * 1000000)
+        timestamp = time.perf_counter_ns() // 1000
         duration = timestamp - self._rx_last_timestamp
 
         if duration > 5000:
@@ -186,9 +224,7 @@ class RadioSignalClient:
                 self._rx_repeat_count += 1
                 self._rx_change_count -= 1
                 if self._rx_repeat_count == 2:
-                    for pnum in range(1, len(PROTOCOLS)):
-                        if self._rx_waveform(pnum, self._rx_change_count, timestamp):
-                            break
+                    self._rx_decode(self._rx_change_count, timestamp)
                     self._rx_repeat_count = 0
             self._rx_change_count = 0
 
@@ -199,32 +235,51 @@ class RadioSignalClient:
         self._rx_change_count += 1
         self._rx_last_timestamp = timestamp
 
-    def _rx_waveform(self, pnum, change_count, timestamp):
-        """Detect waveform and format code."""
-        code = 0
-        delay = int(self._rx_timings[0] / PROTOCOLS[pnum].sync_low)
-        delay_tolerance = delay * self.rx_tolerance / 100
-
-        for i in range(1, change_count, 2):
-            if (abs(self._rx_timings[i] - delay * PROTOCOLS[pnum].zero_high) < delay_tolerance and
-               abs(self._rx_timings[i + 1] - delay * PROTOCOLS[pnum].zero_low) < delay_tolerance):
-                code <<= 1
-            elif (abs(self._rx_timings[i] - delay * PROTOCOLS[pnum].one_high) < delay_tolerance and
-                  abs(self._rx_timings[i + 1] - delay * PROTOCOLS[pnum].one_low) < delay_tolerance):
-                code <<= 1
-                code |= 1
-            else:
-                return False
-
-        if self._rx_change_count > 6 and code != 0:
-            self.rx_code = code
-            self.rx_code_timestamp = timestamp
-            self.rx_bitlength = int(change_count / 2)
-            self.rx_pulselength = delay
-            self.rx_proto = pnum
-            return True
-
-        return False
+    def _rx_decode(self, change_count, timestamp):
+        """
+        Detect waveform and format code. All protocols are matched at once, first matching protocol wins.
+        :return: True if a code is decoded.
+        """
+        import numpy as np
+        table = _rx_protocol_table()
+
+        timings = self._rx_timings
+        highs = timings[1:change_count:2]
+        lows = timings[2:change_count + 1:2]
+        delays = timings[0] // table["sync_low"]  # one per protocol
+        tolerances = (delays * self.rx_tolerance / 100)[:, None]
+        delays = delays[:, None]
+
+        zeros = (np.abs(highs - delays * table["zero_high"][:, None]) < tolerances) & \
+                (np.abs(lows - delays * table["zero_low"][:, None]) < tolerances)
+        ones = (np.abs(highs - delays * table["one_high"][:, None]) < tolerances) & \
+               (np.abs(lows - delays * table["one_low"][:, None]) < tolerances)
+        bits = ones & ~zeros
+        codes = (bits * table["bit_values"][-len(highs):]).sum(axis=1) if len(highs) else np.zeros(len(delays), int)
+        matched = np.flatnonzero((zeros | ones).all(axis=1) & (codes != 0))
+
+        if change_count <= 6 or not len(matched):
+            self.rx_rejected += 1
+            return False
+
+        index = matched[0]
+        self.rx_code = int(codes[index])
+        self.rx_code_timestamp = timestamp
+        self.rx_bitlength = int(change_count / 2)
+        self.rx_pulselength = int(delays[index, 0])
+        self.rx_proto = int(index) + 1
+        self.rx_decoded += 1
+        if self._rx_output_queue is not None and not self._rx_recent.is_duplicate(self.rx_code):
+            if not offer_signal(self._rx_output_queue, {
+                "message": str(self.rx_code),
+                "protocol": "RF433",
+                "source_type": "RF433_Receiver",
+                "sequence": self._rx_sequence.next(),
+                "trace": trace_helper.start_trace()
+            }):
+                # TODO: Log rf433 code dropped.
+                self.rx_dropped += 1
+        return True
 
     def cleanup(self):
         """Disable TX and RX and clean up GPIO."""
@@ -232,10 +287,3 @@ class RadioSignalClient:
             self._disable_transmission()
         if self.rx_enabled:
             self._disable_reception()
-
-    @staticmethod
-    def _sleep(delay):
-        _delay = delay / 100
-        end = time.time() + delay - _delay
-        while time.time() < end:
-            time.sleep(_delay)
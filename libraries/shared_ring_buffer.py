@@ -0,0 +1,217 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Signal transport between processes over shared memory (multiprocessing.shared_memory).
+SharedRingBuffer is a ring of fixed size records (bytes), written by any number of producers (threads or
+processes) and read by one consumer. A record is copied into shared memory once, there is no feeder thread and
+no pipe per record. A sleeping consumer (or producer waiting for space) is woken through a pipe, only when it
+is actually waiting.
+SharedRingQueue adapts it to put/get of python objects (pickled), as multiprocessing.Queue, so that it can be
+used in its place. Its "_reader" can be waited upon with multiprocessing.connection.wait, by a consumer which has
+found the ring empty (read/get_nowait) since it started: a consumer which died while ring was not empty leaves no
+wake up call for the one started after it.
+Listeners hand over signals with offer_signal, which never blocks or raises into them.
+"""
+
+import os
+import pickle
+import queue as qq
+import struct
+import time
+from multiprocessing import Lock, Pipe
+from multiprocessing.context import assert_spawning
+from multiprocessing import shared_memory
+
+import name_helper as nh
+
+# Header: records written, records read, consumer waiting (0/1), producers waiting (0/1).
+_HEADER = struct.Struct("<QQQQ")
+_HEAD, _TAIL, _CONSUMER_WAITING, _PRODUCERS_WAITING = (8 * field for field in range(4))  # offsets
+_HEADER_SIZE = _HEADER.size
+_COUNTER = struct.Struct("<Q")
+_LENGTH = struct.Struct("<I")
+_PRODUCER_RECHECK = 0.05  # in seconds, several producers may wait for space but one is woken at a time.
+
+
+class SharedRingBuffer:
+    """
+    Multi-producer, single-consumer ring of records of at most record_size bytes.
+    Writes block while ring is full, reads block while it is empty (both with optional timeout).
+    """
+
+    def __init__(self, capacity=nh.SHARED_RING_CAPACITY, record_size=nh.SHARED_RING_RECORD_SIZE):
+        """
+        :param capacity: Number of records ring can hold.
+        :param record_size: Maximum size of a record in bytes.
+        """
+        self.capacity = capacity
+        self.record_size = record_size
+        self._slot_size = _LENGTH.size + record_size
+        self._memory = shared_memory.SharedMemory(create=True, size=_HEADER_SIZE + capacity * self._slot_size)
+        self._owner_pid = os.getpid()
+        self._lock = Lock()
+        self._reader, self._notify = Pipe(duplex=False)  # records available (rung only for waiting consumer)
+        self._space_reader, self._space_notify = Pipe(duplex=False)  # space available (for waiting producers)
+        # Ringing never blocks: a full doorbell pipe already holds wake up calls (e.g. of producers which gave up).
+        for doorbell in (self._notify, self._space_notify):
+            os.set_blocking(doorbell.fileno(), False)
+        self._attach()
+        # Consumer has not read yet, it may be waiting on _reader (without a read call): first write wakes it.
+        self._set(_CONSUMER_WAITING, 1)
+
+    def _attach(self):
+        # Only memoryview of SharedMemory itself is kept, so that it can always be closed (no other exports).
+        self._buffer = self._memory.buf
+        self._armed = False  # Consumer asked to be woken (consumer side only).
+
+    def __getstate__(self):
+        assert_spawning(self)
+        state = self.__dict__.copy()
+        del state["_buffer"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._attach()
+
+    def _set(self, field, value):
+        _COUNTER.pack_into(self._buffer, field, value)
+
+    def __len__(self):
+        """Number of records waiting (approximate when others are writing or reading)."""
+        head, tail = _HEADER.unpack_from(self._buffer)[:2]
+        return head - tail
+
+    def write(self, record, timeout=None):
+        """
+        :param record: bytes (or bytes like), at most record_size long.
+        :param timeout: Seconds to wait for space when ring is full, None to wait as long as needed, 0 not to wait.
+        :return: True if written, False if ring stayed full.
+        """
+        size = len(record)
+        if size > self.record_size:
+            raise ValueError("Record of %d bytes does not fit in ring of %d bytes records." % (size, self.record_size))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                head, tail, consumer_waiting, _ = _HEADER.unpack_from(self._buffer)
+                if head - tail < self.capacity:
+                    offset = _HEADER_SIZE + (head % self.capacity) * self._slot_size
+                    _LENGTH.pack_into(self._buffer, offset, size)
+                    self._buffer[offset + _LENGTH.size:offset + _LENGTH.size + size] = record
+                    self._set(_HEAD, head + 1)
+                    if consumer_waiting:
+                        self._set(_CONSUMER_WAITING, 0)
+                    break
+                remaining = _PRODUCER_RECHECK if deadline is None else \
+                    min(deadline - time.monotonic(), _PRODUCER_RECHECK)
+                if remaining <= 0:
+                    return False  # Not waiting (e.g. timeout 0), consumer is not asked to ring.
+                self._set(_PRODUCERS_WAITING, 1)
+
+            if self._space_reader.poll(remaining):
+                # Every wake up call received so far, stale ones (of producers which gave up) included.
+                while self._space_reader.poll():
+                    self._space_reader.recv_bytes()
+
+        if consumer_waiting:
+            self._ring(self._notify)
+        return True
+
+    def read(self, timeout=None):
+        """
+        :param timeout: Seconds to wait when ring is empty, None to wait as long as needed, 0 not to wait.
+        :return: bytes of oldest record, None if ring stayed empty.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._armed:
+                # Drop wake up calls already received, before checking the ring again.
+                while self._reader.poll():
+                    self._reader.recv_bytes()
+                self._armed = False
+
+            with self._lock:
+                head, tail, _, producers_waiting = _HEADER.unpack_from(self._buffer)
+                if head != tail:
+                    offset = _HEADER_SIZE + (tail % self.capacity) * self._slot_size
+                    size = _LENGTH.unpack_from(self._buffer, offset)[0]
+                    record = bytes(self._buffer[offset + _LENGTH.size:offset + _LENGTH.size + size])
+                    self._set(_TAIL, tail + 1)
+                    if producers_waiting:
+                        self._set(_PRODUCERS_WAITING, 0)
+                    break
+                # Empty: next write wakes consumer, also when it waits on _reader by itself.
+                self._set(_CONSUMER_WAITING, 1)
+                self._armed = True
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            if not self._reader.poll(remaining):
+                return None
+
+        if producers_waiting:
+            self._ring(self._space_notify)
+        return record
+
+    @staticmethod
+    def _ring(doorbell):
+        try:
+            doorbell.send_bytes(b"\0")
+        except BlockingIOError:
+            pass  # Pipe is full of wake up calls already.
+
+    def close(self):
+        """Releases shared memory of this process, creator also frees it for good."""
+        self._buffer = None
+        self._memory.close()
+        if os.getpid() == self._owner_pid:
+            self._memory.unlink()
+
+
+class SharedRingQueue(SharedRingBuffer):
+    """
+    put/get of python objects over SharedRingBuffer, same calls as multiprocessing.Queue.
+    Unlike multiprocessing.Queue it is bounded: put blocks while ring is full, a too big object raises ValueError.
+    """
+
+    def put(self, obj, block=True, timeout=None):
+        if not self.write(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL), timeout if block else 0):
+            raise qq.Full
+
+    def put_nowait(self, obj):
+        self.put(obj, block=False)
+
+    def get(self, block=True, timeout=None):
+        record = self.read(timeout if block else 0)
+        if record is None:
+            raise qq.Empty
+        return pickle.loads(record)
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def qsize(self):
+        return len(self)
+
+    def empty(self):
+        return len(self) == 0
+
+
+def offer_signal(signal_queue, signal):
+    """
+    Puts a received signal onto queue without waiting, for listeners which must not block or fail (e.g. network
+    thread of MQTT client): signal is dropped when queue is full, closed or signal is too big for it.
+    :param signal_queue: SharedRingQueue, multiprocessing.Queue or queue.Queue object
+    :param signal: signal (dict)
+    :return: True if queued, False if dropped.
+    """
+    try:
+        signal_queue.put(signal, block=False)
+        return True
+    except (qq.Full, ValueError):
+        # TODO: Log signal dropped (queue full or signal too big).
+        return False
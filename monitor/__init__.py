@@ -7,5 +7,6 @@ For example: LCD (16*2), LED's, Seven Segment Displays
 """
 
 from .lcd_engine import LcdEngine
+from .lcd_display_service import LcdDisplayService
 from .leds_engine import Led
 from .seven_segment import SevenSegment
@@ -0,0 +1,100 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Non-blocking display of messages on LCD.
+Callers post messages and return immediately, a dedicated thread renders them. Only the latest posted message
+is drawn, older ones which were not drawn yet are dropped. Messages longer than screen are paged or scrolled
+until next message is posted.
+"""
+
+from threading import Thread, Condition
+
+from execute.cutiepi_exceptions import MonitorOperationError
+import name_helper as nh
+from .lcd_engine import LCD_CELLS
+
+
+class LcdDisplayService(Thread):
+    def __init__(self, lcd, long_message_mode=nh.LCD_LONG_MESSAGE_MODE):
+        """
+        :param lcd: Prepared LcdEngine object, used only by this thread from now on.
+        :param long_message_mode: "page" or "scroll"
+        """
+        if long_message_mode not in ("page", "scroll"):
+            raise ValueError("Invalid mode. Mode should be 'page' or 'scroll'.")
+
+        self._lcd = lcd
+        self._long_message_mode = long_message_mode
+        self._condition = Condition()
+        self._message = None  # Latest posted message, not rendered yet.
+        self._stopping = False
+        self.rendered = 0
+        self.dropped = 0
+        Thread.__init__(self, name="lcd_display", daemon=True)
+
+    def post(self, message):
+        """
+        Schedules message for display and returns immediately. Replaces a message which is still waiting.
+        :param message: message to display.
+        :return: None
+        """
+        with self._condition:
+            if self._message is not None:
+                self.dropped += 1
+            self._message = str(message)
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+
+    def _frames(self, message):
+        """:return: list of screen contents (at most 32 characters each) to show message."""
+        if len(message) <= LCD_CELLS:
+            return [message]
+        if self._long_message_mode == "page":
+            return [message[start:start + LCD_CELLS] for start in range(0, len(message), LCD_CELLS)]
+
+        text = message + " " * nh.LCD_SCROLL_STEP
+        return [(text + text)[start:start + LCD_CELLS] for start in range(0, len(text), nh.LCD_SCROLL_STEP)]
+
+    def _next_message(self, timeout=None):
+        """
+        Waits for a posted message (at most timeout seconds, if given).
+        :return: message, or None if there is no new message (or service is stopping).
+        """
+        with self._condition:
+            if self._message is None and not self._stopping:
+                self._condition.wait(timeout)
+            if self._stopping:
+                return None
+            message, self._message = self._message, None
+            return message
+
+    def _render(self, frame):
+        try:
+            self._lcd.display_message(frame)
+            self.rendered += 1
+        except MonitorOperationError:
+            # TODO: Log error during message display on LCD.
+            pass
+
+    def run(self):
+        message = self._next_message()
+        while message is not None:
+            frames = self._frames(message)
+            self._render(frames[0])
+            if len(frames) == 1:
+                message = self._next_message()
+                continue
+
+            # Long message keeps on paging/scrolling till a new message is posted.
+            interval = nh.LCD_PAGE_TIME if self._long_message_mode == "page" else nh.LCD_SCROLL_INTERVAL
+            index = 0
+            message = self._next_message(interval)
+            while message is None and not self._stopping:
+                index = (index + 1) % len(frames)
+                self._render(frames[index])
+                message = self._next_message(interval)
@@ -3,23 +3,35 @@
 
 """
 With the help of this we can display data on the 16*2 LCD.
+A shadow copy of the screen is kept, so a new message only rewrites the characters which changed.
 """
 
 import json
 import os
 import time
 
-import RPi.GPIO as GPIO
-
 from execute.cutiepi_exceptions import MonitorOperationError
+from libraries.gpio_engine import get_gpio, OutputBus
+
+LCD_COLUMNS = 16
+LCD_ROWS = 2
+LCD_CELLS = LCD_COLUMNS * LCD_ROWS
+LCD_ROW_ADDRESSES = (0x00, 0x40)  # DDRAM address of first cell of each row.
 
 
 class LcdEngine:
     def __init__(self):
         with open(os.path.join(os.environ["CONFIG_DIR"], 'lcd_connection.json')) as lcd_conn:
-            self.__pins = json.load(lcd_conn)
-        for pin in self.__pins.keys():
-            GPIO.setup(int(self.__pins[pin]), GPIO.OUT)
+            pins = json.load(lcd_conn)
+        self.__gpio = get_gpio()
+        # Pin numbers are resolved once, data pins are written together as one byte.
+        self.__rs = int(pins["rs"])
+        self.__en = int(pins["en"])
+        self.__gpio.setup([self.__rs, self.__en], self.__gpio.OUT)
+        self.__data = OutputBus(self.__gpio, [pins["d" + str(i)] for i in range(8)])
+
+        self.__shadow = None  # Characters on screen (row by row), None when unknown.
+        self.__address = None  # DDRAM address where next character is written, None when unknown.
 
     def prepare(self):
         if self.lcd_start() and self.lcd_clear() and self.cursor_blink() and self.go_to_first_line():
@@ -27,51 +39,86 @@ class LcdEngine:
         return False
 
     def command(self, command):
-        GPIO.output(int(self.__pins["rs"]), False)
-        write_ok = self.write_to_lcd_8_bits(bin(command))
+        self.__gpio.output(self.__rs, False)
+        write_ok = self.write_to_lcd_8_bits(command)
         self.signal_green()
+        self._track_command(command)
         return write_ok
 
     def display_message(self, message):
-        message = str(message)  # Making message string explicitly.
-        self.lcd_clear()  # Clear LCD screen before displaying any message.
-        count_chars = 0
-        for i in message:
-            if count_chars == 16:
-                self.go_to_second_line()
-            if count_chars == 32:
-                self.go_to_first_line()
-                count_chars = 0
-
-            if self.display_char(i):
-                count_chars += 1
-            else:
+        """
+        Displays message (first 16 characters on first line, next 16 on second line). Characters beyond 32
+        overwrite the screen again from first line. Only the cells which differ from screen are written.
+        """
+        # LCD takes one byte per character, characters beyond Latin-1 are shown as "?".
+        message = str(message).encode("latin-1", "replace").decode("latin-1")
+        frame = [" "] * LCD_CELLS
+        for index, char in enumerate(message):
+            frame[index % LCD_CELLS] = char
+
+        if self.__shadow is None:
+            changed = [index for index in range(LCD_CELLS) if frame[index] != " "]
+            self.lcd_clear()
+        else:
+            changed = [index for index in range(LCD_CELLS) if frame[index] != self.__shadow[index]]
+            not_blank = [index for index in range(LCD_CELLS) if frame[index] != " "]
+            # A clear (one command) is cheaper only when it saves writing more than one cell.
+            if len(changed) > len(not_blank) + 1:
+                self.lcd_clear()
+                changed = not_blank
+
+        for index in changed:
+            address = self._cell_address(index)
+            if address != self.__address:
+                self.command(0x80 | address)
+                self.__address = address
+
+            if not self.display_char(frame[index]):
                 raise MonitorOperationError("Error occurred during message display on LCD.")
 
+    @staticmethod
+    def _cell_address(index):
+        return LCD_ROW_ADDRESSES[index // LCD_COLUMNS] + index % LCD_COLUMNS
+
+    def _track_command(self, command):
+        """Keeps shadow screen and cursor address in line with command sent to LCD."""
+        if command == 0x01:  # Clear
+            self.__shadow = [" "] * LCD_CELLS
+            self.__address = 0
+        elif command & 0x80:  # Set DDRAM address
+            self.__address = command & 0x7f
+        elif command in (0x1c, 0x18):  # Display shift, cells no longer map to shadow.
+            self.__shadow = None
+            self.__address = None
+
+    def _track_char(self, char):
+        if self.__address is None:
+            return
+        for row, row_address in enumerate(LCD_ROW_ADDRESSES):
+            if self.__shadow is not None and row_address <= self.__address < row_address + LCD_COLUMNS:
+                self.__shadow[row * LCD_COLUMNS + self.__address - row_address] = char
+        self.__address += 1
+
     def display_char(self, char):
         assert len(char) == 1
-        GPIO.output(int(self.__pins["rs"]), True)
-        disp_ok = self.write_to_lcd_8_bits(bin(ord(char)))
+        self.__gpio.output(self.__rs, True)
+        disp_ok = self.write_to_lcd_8_bits(ord(char))
         self.signal_green()
+        self._track_char(char)
         return disp_ok
 
-    def write_to_lcd_8_bits(self, bits):
-        bits = self.pad_bits(bits)
-        bits = bits[::-1]
-        for i in range(8):
-            GPIO.output(int(self.__pins["d" + str(i)]), bool(int(bits[i])))
+    def write_to_lcd_8_bits(self, byte):
+        """
+        :param byte: int (0 to 255), bit i is written on pin d<i>.
+        """
+        assert 0 <= byte <= 0xff
+        self.__data.write(byte)
         return True
 
-    @staticmethod
-    def pad_bits(bits):
-        raw_bits = bits.lstrip('0b')
-        assert (8 - len(raw_bits)) >= 0
-        return '0' * (8 - len(raw_bits)) + raw_bits
-
     def signal_green(self):
-        GPIO.output(int(self.__pins["en"]), True)
+        self.__gpio.output(self.__en, True)
         time.sleep(0.01)
-        GPIO.output(int(self.__pins["en"]), False)
+        self.__gpio.output(self.__en, False)
 
     # Utility methods.
     def lcd_start(self):
@@ -95,6 +142,5 @@ class LcdEngine:
     def left_shift(self):
         return self.command(0x18)
 
-    @staticmethod
-    def clean():
-        GPIO.cleanup()
+    def clean(self):
+        self.__gpio.cleanup()
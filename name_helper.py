@@ -5,8 +5,20 @@
 This file is for removing hard codded values of some file names, signal names etc..
 """
 
-SIGNAL_FILE = "all_signals.h5"
+SIGNAL_FILE_DIR = "signals"  # in HOME_DIR, signal files are named signals_<YYYYMMDD>_<NNN>.h5
+SIGNAL_FILE_PREFIX = "signals_"
 SIGNAL_FILE_TITLE = "Signal File"
+SIGNAL_FILE_DAMAGED_SUFFIX = ".damaged"  # added to name of a signal file which can not be opened or has other tables
+SIGNAL_FILE_ROTATE_DAILY = True  # A new signal file every day (local time).
+# in seconds, rows buffered around midnight may be written to file of other day (must exceed writer's flush interval)
+SIGNAL_FILE_DAY_SLACK = 60
+SIGNAL_FILE_MAX_SIZE = 64 * 1024 * 1024  # in bytes, a new signal file once active one is this big (None: no limit)
+SIGNAL_FILE_RETENTION_DAYS = 90  # Older signal files are deleted (None: keep all).
+SIGNAL_FILES_MAX_TOTAL_SIZE = 2 * 1024 * 1024 * 1024  # in bytes, oldest signal files are deleted beyond it.
+SIGNAL_FILE_COMPLIB = "blosc:lz4"  # Falls back to "zlib" if PyTables is built without Blosc.
+SIGNAL_FILE_COMPLEVEL = 5  # 0 for no compression
+SIGNAL_FILE_CHUNK_BYTES = 64 * 1024  # Size of a chunk of signal tables (rows per chunk = this / row size).
+SIGNAL_FILE_NODE_CACHE_SLOTS = 256  # PyTables node cache, must hold all index nodes or every append reloads them.
 
 CLOUD_SIGNAL_PREFIX = "cloud"
 CLOUD_SIGNAL_GROUP_NAME = "cloud"
@@ -24,6 +36,53 @@ HARDWARE_SIGNAL_LENGTH = 9
 
 QUEUE_WAIT_TIME = 0.01  # In seconds
 
+# between listeners, logger and processor: "queue" (multiprocessing.Queue) or "shared_memory" (faster, but bounded
+# and a process killed while holding the ring's lock blocks every producer of that ring).
+SIGNAL_QUEUE_TRANSPORT = "queue"
+SHARED_RING_CAPACITY = 1024  # records in a shared memory ring (see libraries.shared_ring_buffer)
+SHARED_RING_RECORD_SIZE = 1024  # in bytes, largest signal (pickled) a ring can carry
+
+SIGNAL_WRITER_BUFFER_SIZE = 64  # rows per table, buffered before writing to signal file
+SIGNAL_WRITER_FLUSH_INTERVAL = 1.0  # In seconds, maximum time a row can wait in buffer
+
+SIGNAL_INDEXED_COLUMNS = ("incoming_time", "name", "zone", "entity", "device_id")  # where present in table
+SIGNAL_QUERY_CHUNK_SIZE = 1024  # rows per chunk of query results
+SIGNAL_QUERY_WINDOW_ROWS = 65536  # rows of table searched at once, up to 8 bytes per row held for matches
+
+IDEMPOTENCY_CACHE_SIZE = 4096  # Keys of recently received signals remembered per source.
+SEQUENCE_DIR = "sequences"  # in HOME_DIR, last reserved sequence number of every source.
+SEQUENCE_RESERVE_BLOCK = 100000  # Sequence numbers reserved per write of sequence file.
+CLOUD_DUPLICATE_TTL = 60  # in seconds, a repeat of a cloud message within this time is dropped (MQTT redelivery).
+# in seconds, for repeated Bluetooth frames. None (default): frames carry no sequence number and a sensor may report
+# same value again, set it only for hardware which resends its frames (same frame within TTL is then dropped).
+BLUETOOTH_DUPLICATE_TTL = None
+RF433_DUPLICATE_TTL = 1  # in seconds, a remote keeps sending its code while button is held.
+
+TRACE_ENABLED = True  # Signals carry a trace of their stages (see trace_helper).
+TRACE_SNAPSHOT_DIR = "metrics"  # in HOME_DIR, latency snapshot of every process.
+TRACE_SNAPSHOT_INTERVAL = 10  # in seconds, None for no snapshot file.
+TRACE_STAGE_RECEIVED = "received"  # by MQTT, Bluetooth or rf433 receiver
+TRACE_STAGE_LOGGED = "logged"  # saved by ReceivedSignalsLogger
+TRACE_STAGE_DISPATCHED = "dispatched"  # decrypted/decoded and given to a worker by OutputSignalQueueProcessor
+TRACE_STAGE_PROCESSING = "processing"  # taken up by the worker
+TRACE_STAGE_TX_START = "tx_start"  # rf433 transmitter started sending the code
+TRACE_STAGE_TRANSMITTED = "transmitted"  # rf433 code sent
+TRACE_STAGE_PUBLISHED = "published"  # delivery to MQTT Broker confirmed
+TRACE_FINAL_STAGES = (TRACE_STAGE_TRANSMITTED, TRACE_STAGE_PUBLISHED)
+
+PROFILE_ENV_VARIABLE = "CUTIEPI_PROFILE"  # Set it to profile every process from its start (see profile_helper).
+PROFILE_DIR = "profiles"  # in HOME_DIR
+PROFILE_WINDOW = 30  # in seconds, profiling stops by itself after this time.
+PROFILE_SAMPLE_INTERVAL = 0.01  # in seconds, between two samples of thread stacks.
+PROFILE_TRACEMALLOC_FRAMES = 10  # frames kept per traced allocation
+PROFILE_TOP_ALLOCATIONS = 50  # lines in memory report
+
+SIGNAL_PROCESSOR_WORKERS = 2  # worker processes of OutputSignalQueueProcessor
+SIGNAL_DECODER_PROCESSES = 2  # decrypt/decode signals for OutputSignalQueueProcessor, in parallel
+SIGNAL_DECODER_BACKLOG = 16  # signals per decoder process waiting to be decoded, more block the dispatcher
+SIGNAL_DECODE_TIMEOUT = 5  # In seconds, a signal not decoded in this time (e.g. its decoder crashed) is rejected
+SIGNAL_PROCESSOR_STOP_TIMEOUT = 5  # In seconds, time given to workers to finish queued signals
+
 CLOUD_SIGNAL_NO_OF_PARTS = 5
 
 CLOUD_SIGNAL_LIGHT_ENTITY = "light"
@@ -39,5 +98,37 @@ CLOUD_SIGNAL_MOTOR_ENTITY_NUMBER = 4
 ON = "on"
 OFF = "off"
 
-BLUETOOTH_SIGNAL_LIMIT = 100
-BLUETOOTH_SIGNAL_WAIT_TIME = 1  # in seconds
+BLUETOOTH_SIGNAL_LIMIT = 100  # in bytes, maximum read from Bluetooth socket at once.
+BLUETOOTH_SIGNAL_DELIMITER = None  # bytes ending each signal (e.g. b"\n"), None for fixed length signals.
+BLUETOOTH_BUFFER_SIZE = 4096  # in bytes, received bytes not framed yet.
+BLUETOOTH_POLL_TIMEOUT = 0.5  # in seconds, receiver checks for stop at least this often.
+# in seconds, link without any byte for this long is taken as dead. None (default) as hardware sends only on events
+# and may be quiet for long, set it (a few heartbeat intervals) only for hardware which sends heartbeats.
+BLUETOOTH_LINK_TIMEOUT = None
+BLUETOOTH_RECONNECT_MIN_DELAY = 0.5  # in seconds
+BLUETOOTH_RECONNECT_MAX_DELAY = 5  # in seconds, bounds time to recover after hardware is back
+
+MQTT_PUBLISHER_QOS = 1
+MQTT_PUBLISH_TIMEOUT = 5  # in seconds
+MQTT_RECONNECT_MIN_DELAY = 1  # in seconds
+MQTT_RECONNECT_MAX_DELAY = 30  # in seconds
+MQTT_ROUTE_CACHE_SIZE = 1024  # Topics whose routes are remembered by TopicRouter.
+
+SUPERVISOR_RESTART_MIN_DELAY = 1  # in seconds
+SUPERVISOR_RESTART_MAX_DELAY = 60  # in seconds
+SUPERVISOR_STABLE_RUN_TIME = 60  # in seconds, worker running this long is considered recovered
+SUPERVISOR_THREAD_CHECK_INTERVAL = 1  # in seconds, threads can not be waited upon like processes
+SUPERVISOR_DRAIN_TIMEOUT = 5  # in seconds, maximum wait for a worker's input to be drained at shutdown
+
+CIPHER_MODE_FERNET = "fernet"
+CIPHER_MODE_AESGCM = "aesgcm"
+AESGCM_NONCE_SIZE = 12  # in bytes
+
+LCD_LONG_MESSAGE_MODE = "page"  # "page" or "scroll", for messages longer than LCD screen.
+LCD_PAGE_TIME = 2.0  # in seconds, each page of a long message is shown for this time.
+LCD_SCROLL_INTERVAL = 0.4  # in seconds, between two steps of a scrolling message.
+LCD_SCROLL_STEP = 1  # characters moved per scroll step.
+
+GPIO_BACKEND_RPI = "rpi"
+GPIO_BACKEND_SIMULATED = "simulated"
+SIMULATED_GPIO_MAX_EDGES = 100000  # Edges kept by simulated GPIO, older ones are dropped.
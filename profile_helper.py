@@ -0,0 +1,150 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+On-demand profiling of CutiePi processes, without restart.
+Every process calls install() at its start. Profiling of a process is then toggled by SIGUSR1
+(e.g. "pkill -USR1 -f start.py" reaches all processes of the app) or started with the process when environment
+variable CUTIEPI_PROFILE is set (to number of seconds, or any value for PROFILE_WINDOW).
+While profiling (till PROFILE_WINDOW seconds pass or SIGUSR1 comes again), stacks of all threads are sampled every
+PROFILE_SAMPLE_INTERVAL seconds and memory allocations are traced (tracemalloc). Results go to PROFILE_DIR in
+HOME_DIR, files are labelled with process name, pid and (for stacks) thread name:
+    stacks_<process>_<pid>_<thread>_<time>.folded: sampled stacks in "folded" format (one line per stack,
+        root first, followed by number of samples), input of flame graph tools.
+    memory_<process>_<pid>_<time>.txt: allocations made during the window and still alive, biggest first.
+    memory_<process>_<pid>_<time>.tracemalloc: tracemalloc snapshot (tracemalloc.Snapshot.load) at end of window.
+"""
+
+import multiprocessing
+import os
+import signal as os_signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from os import environ as env
+
+import name_helper as nh
+
+PROFILE_SIGNAL = os_signal.SIGUSR1
+
+_profiler = None
+_profiler_pid = None
+
+
+class Profiler(threading.Thread):
+    """
+    Samples stacks and traces memory of its process in windows, a window is started or stopped by toggle().
+    """
+
+    def __init__(self, window=nh.PROFILE_WINDOW, sample_interval=nh.PROFILE_SAMPLE_INTERVAL):
+        self.window = window
+        self.sample_interval = sample_interval
+        self.windows = 0  # Number of windows profiled.
+        self.__toggled = threading.Event()
+        threading.Thread.__init__(self, name="profiler", daemon=True)
+
+    def toggle(self):
+        """Starts a window, or stops the running one. Safe to call from a signal handler."""
+        self.__toggled.set()
+
+    def run(self):
+        while True:
+            self.__toggled.wait()
+            self.__toggled.clear()
+            try:
+                self.profile(self.window)
+            except OSError:
+                # TODO: Log error while writing profile.
+                pass
+
+    def profile(self, window):
+        """
+        Profiles this process for window seconds or till toggled again.
+        :return: list of files written.
+        """
+        tracemalloc.start(nh.PROFILE_TRACEMALLOC_FRAMES)
+        memory_at_start = tracemalloc.take_snapshot()
+        stacks = {}  # thread ident: Counter of folded stacks
+        deadline = time.monotonic() + window
+        while time.monotonic() < deadline and not self.__toggled.is_set():
+            self._sample(stacks)
+            time.sleep(self.sample_interval)
+        self.__toggled.clear()
+        memory_at_end = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        self.windows += 1
+        return self._dump(stacks, memory_at_start, memory_at_end)
+
+    def _sample(self, stacks):
+        for ident, frame in sys._current_frames().items():
+            if ident == self.ident:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append("%s (%s)" % (code.co_name, os.path.basename(code.co_filename)))
+                frame = frame.f_back
+            stacks.setdefault(ident, Counter())[";".join(reversed(names))] += 1
+
+    @staticmethod
+    def _label(text):
+        return "".join(character if character.isalnum() or character in "-." else "_" for character in text)
+
+    def _dump(self, stacks, memory_at_start, memory_at_end):
+        directory = os.path.join(env["HOME_DIR"], nh.PROFILE_DIR)
+        os.makedirs(directory, exist_ok=True)
+        prefix = "%s_%d" % (self._label(multiprocessing.current_process().name), os.getpid())
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        files = []
+
+        for ident, samples in stacks.items():
+            file_name = os.path.join(directory, "stacks_%s_%s_%s.folded" % (
+                prefix, self._label(thread_names.get(ident, str(ident))), stamp))
+            with open(file_name, "w") as stacks_file:
+                for stack, count in samples.most_common():
+                    stacks_file.write("%s %d\n" % (stack, count))
+            files.append(file_name)
+
+        file_name = os.path.join(directory, "memory_%s_%s" % (prefix, stamp))
+        with open(file_name + ".txt", "w") as memory_file:
+            for statistic in memory_at_end.compare_to(memory_at_start, "lineno")[:nh.PROFILE_TOP_ALLOCATIONS]:
+                memory_file.write("%s\n" % statistic)
+        memory_at_end.dump(file_name + ".tracemalloc")
+        files.extend([file_name + ".txt", file_name + ".tracemalloc"])
+        return files
+
+
+def get_profiler():
+    """
+    Returns profiler of current process, it is started on first use.
+    A profiler inherited from parent process (after fork) is not reused, its thread does not exist here.
+    :return: Profiler object
+    """
+    global _profiler, _profiler_pid
+    if _profiler is None or _profiler_pid != os.getpid():
+        _profiler = Profiler()
+        _profiler_pid = os.getpid()
+        _profiler.start()
+    return _profiler
+
+
+def install():
+    """
+    Makes current process profile on PROFILE_SIGNAL. Must be called from main thread of the process.
+    If CUTIEPI_PROFILE is set, a window (of that many seconds) starts now.
+    :return: None
+    """
+    profiler = get_profiler()
+    os_signal.signal(PROFILE_SIGNAL, lambda signum, frame: profiler.toggle())
+
+    window = env.get(nh.PROFILE_ENV_VARIABLE)
+    if window:
+        try:
+            profiler.window = float(window)
+        except ValueError:
+            pass
+        profiler.toggle()
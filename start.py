@@ -14,7 +14,6 @@ from execute import Initiation
 
 if __name__ == "__main__":
     print("Hello..! Let's get started.")
-    Initiation().initiate()  # Initiate different parts of system.
-
-    while True:
-        pass
+    cutie_pi = Initiation()
+    cutie_pi.initiate()  # Initiate different parts of system.
+    cutie_pi.supervise()  # Keep running until SIGTERM or SIGINT.
@@ -0,0 +1,15 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Tests run without Pi hardware, MQTT Broker or env_settings: local stand-ins of benchmarks are installed.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import stand_ins  # noqa: E402
+
+stand_ins.install()
@@ -0,0 +1,11 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+import name_helper as nh
+from libraries.bluetooth_engine import BluetoothClient
+
+
+def test_reconnect_delay_stays_bounded_in_long_outage():
+    for failures in (0, 3, 1024, 10 ** 6):
+        delay = BluetoothClient._reconnect_delay(failures)
+        assert nh.BLUETOOTH_RECONNECT_MIN_DELAY / 2 <= delay <= nh.BLUETOOTH_RECONNECT_MAX_DELAY
@@ -0,0 +1,85 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+import queue as qq
+import types
+
+import pytest
+
+import name_helper as nh
+from libraries import idempotency_cache
+from libraries.bluetooth_engine import BluetoothClient, SignalFramer
+from libraries.idempotency_cache import IdempotencyCache, SequenceCounter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(idempotency_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_repeat_within_ttl_is_duplicate(clock):
+    cache = IdempotencyCache(ttl=2)
+    assert not cache.is_duplicate(b"a")
+    clock[0] += 1.9
+    assert cache.is_duplicate(b"a")
+    assert cache.duplicates == 1
+
+
+def test_key_expires_after_ttl_from_first_sighting(clock):
+    cache = IdempotencyCache(ttl=2)
+    assert not cache.is_duplicate(b"a")
+    clock[0] += 1.5
+    assert cache.is_duplicate(b"a")  # Does not extend ttl.
+    clock[0] += 0.6
+    assert not cache.is_duplicate(b"a")
+
+
+def test_expired_and_least_recent_keys_are_forgotten(clock):
+    cache = IdempotencyCache(ttl=2, capacity=2)
+    cache.is_duplicate(b"a")
+    cache.is_duplicate(b"b")
+    cache.is_duplicate(b"c")
+    assert len(cache) == 2 and not cache.is_duplicate(b"a")
+    clock[0] += 3
+    cache.is_duplicate(b"d")
+    assert len(cache) == 1
+
+
+def _bluetooth_client():
+    client = BluetoothClient()
+    client.set_output_queue(qq.Queue())
+    client._BluetoothClient__framer = SignalFramer()
+    return client
+
+
+def test_repeated_bluetooth_telemetry_is_kept_by_default(monkeypatch):
+    monkeypatch.setattr(nh, "TRACE_ENABLED", False)
+    client = _bluetooth_client()
+    client._handle_bytes(b"011001025")
+    client._handle_bytes(b"011001025")
+    assert client.connection_stats()["received"] == 2
+
+
+def test_repeated_bluetooth_frame_is_dropped_when_enabled(monkeypatch):
+    monkeypatch.setattr(nh, "TRACE_ENABLED", False)
+    monkeypatch.setattr(nh, "BLUETOOTH_DUPLICATE_TTL", 2)
+    client = _bluetooth_client()
+    client._handle_bytes(b"011001025011001025")
+    stats = client.connection_stats()
+    assert (stats["received"], stats["duplicates"]) == (1, 1)
+
+
+def test_named_sequence_keeps_growing_when_clock_is_behind_after_restart(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME_DIR", str(tmp_path))
+    monkeypatch.setattr(nh, "SEQUENCE_RESERVE_BLOCK", 3)
+    now = [10 ** 15]
+    monkeypatch.setattr(idempotency_cache, "time", types.SimpleNamespace(time_ns=lambda: now[0]))
+    counter = SequenceCounter("mqtt")
+    issued = [counter.next() for _ in range(5)]
+    assert issued == list(range(issued[0], issued[0] + 5))
+
+    now[0] -= 3600 * 10 ** 9  # Rebooted without network, clock is an hour behind.
+    assert SequenceCounter("mqtt").next() > issued[-1]
+    assert SequenceCounter().next() < issued[0]  # Unnamed counter follows the clock only.
@@ -0,0 +1,31 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+import time
+
+import execute  # Imported first, as in app (monitor and execute import each other).
+from monitor import LcdEngine
+from monitor.lcd_display_service import LcdDisplayService
+
+
+def _wait_rendered(service, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while service.rendered < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return service.rendered
+
+
+def test_characters_beyond_latin_1_do_not_stop_rendering():
+    lcd = LcdEngine()
+    lcd.prepare()
+    service = LcdDisplayService(lcd)
+    service.start()
+    try:
+        service.post("Temp 21°C ✓")
+        assert _wait_rendered(service, 1) == 1
+        service.post("Fan ON")
+        assert _wait_rendered(service, 2) == 2
+        assert service.is_alive()
+    finally:
+        service.stop()
+        service.join(1)
@@ -0,0 +1,55 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+import types
+
+import pytest
+
+from execute.cutiepi_exceptions import CloudConnectionError
+from libraries.mqtt_engine import MqttPublisher
+
+
+class _Client:
+    """Connects at once, hands out given message ids and confirms only when told to."""
+
+    def __init__(self, mids, confirm_at_once=()):
+        self.mids = list(mids)
+        self.confirm_at_once = set(confirm_at_once)
+
+    def username_pw_set(self, username, password=None):
+        pass
+
+    def reconnect_delay_set(self, min_delay=1, max_delay=120):
+        pass
+
+    def connect_async(self, host, port, keepalive):
+        pass
+
+    def loop_start(self):
+        self.on_connect(self, None, {}, 0)
+
+    def publish(self, topic, payload=None, qos=0):
+        mid = self.mids.pop(0)
+        if mid in self.confirm_at_once:
+            self.on_publish(self, None, mid)  # Network thread was faster than publish() returning.
+        return types.SimpleNamespace(rc=0, mid=mid)
+
+
+def test_late_confirmation_does_not_confirm_reused_message_id():
+    client = _Client([7, 7])
+    publisher = MqttPublisher(client, publish_timeout=0.1)
+    with pytest.raises(CloudConnectionError):
+        publisher.transmit_signal("cloud/1", "first")
+    client.on_publish(client, None, 7)  # Arrives after first publish gave up.
+    with pytest.raises(CloudConnectionError):
+        publisher.transmit_signal("cloud/1", "second")
+    assert publisher.published_count == 0
+    assert not publisher._MqttPublisher__confirmed_early
+
+
+def test_confirmation_before_registration_counts():
+    client = _Client([3], confirm_at_once=[3])
+    publisher = MqttPublisher(client, publish_timeout=0.1)
+    publisher.transmit_signal("cloud/1", "signal")
+    assert publisher.published_count == 1
+    assert not publisher._MqttPublisher__confirmed_early
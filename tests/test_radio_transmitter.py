@@ -0,0 +1,41 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+import queue as qq
+
+from hw_controller import RadioTransmitter
+
+ON, OFF, OTHER = 1361, 1364, 4433
+
+
+def _collected(*codes):
+    transmitter = RadioTransmitter(qq.Queue())
+    for code in codes:
+        transmitter.submit(code, trace=code)
+    transmitter._collect(block=False)
+    return transmitter
+
+
+def test_repeated_code_is_coalesced():
+    transmitter = _collected(ON, ON)
+    assert list(transmitter._pending.items()) == [(ON, [ON, ON])]
+    assert transmitter.stats()["coalesced"] == 1
+
+
+def test_last_command_is_transmitted_last():
+    # ON, OFF, ON must leave device ON.
+    transmitter = _collected(ON, OFF, ON)
+    assert list(transmitter._pending) == [OFF, ON]
+
+
+def test_codes_of_other_devices_keep_their_order():
+    transmitter = _collected(ON, OTHER, OFF, ON)
+    assert list(transmitter._pending) == [OTHER, OFF, ON]
+
+
+def test_stop_is_seen_after_pending_codes():
+    transmitter = RadioTransmitter(qq.Queue())
+    transmitter.submit(ON)
+    transmitter.stop()
+    assert transmitter._collect(block=False) is False
+    assert list(transmitter._pending) == [ON]
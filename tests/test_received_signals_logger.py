@@ -0,0 +1,32 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+import queue as qq
+
+import name_helper as nh
+from core.received_signals_logger import ReceivedSignalsLogger
+
+
+class _Writer:
+    def __init__(self):
+        self.rows = []
+
+    def save_cloud_signal(self, *row):
+        self.rows.append(row)
+
+    save_hardware_signal = save_cloud_signal
+
+
+def test_signal_without_sequence_and_trace_is_logged_and_passed_on():
+    to_process = qq.Queue()
+    logger = ReceivedSignalsLogger(qq.Queue(), qq.Queue(), to_process)
+    writer = _Writer()
+    cloud_signal = {"message": "token", "protocol": "MQTT", "source_type": "MQTT_Broker"}
+    hw_signal = {"message": "011001025", "protocol": "BLUETOOTH", "source_type": "Bluetooth_Device"}
+
+    logger._log_cloud_signal(writer, cloud_signal)
+    logger._log_hardware_signal(writer, hw_signal)
+
+    assert writer.rows == [(0, "token", "MQTT", "MQTT_Broker"), (0, "011001025", "BLUETOOTH", "Bluetooth_Device")]
+    assert to_process.get_nowait() == (nh.CLOUD_SIGNAL_PREFIX, cloud_signal)
+    assert to_process.get_nowait() == (nh.HARDWARE_SIGNAL_PREFIX, hw_signal)
@@ -0,0 +1,184 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+import os
+import queue as qq
+import signal as os_signal
+import time
+import types
+from multiprocessing import Event, Process, Queue
+from multiprocessing.connection import wait
+from threading import Thread
+
+import pytest
+
+import name_helper as nh
+from libraries.bluetooth_engine import BluetoothClient, SignalFramer
+from libraries.mqtt_engine import MqttClient
+from libraries.shared_ring_buffer import SharedRingQueue, offer_signal
+
+
+@pytest.fixture
+def ring():
+    rings = []
+
+    def new_ring(capacity=8, record_size=256):
+        rings.append(SharedRingQueue(capacity, record_size))
+        return rings[-1]
+
+    yield new_ring
+    for signal_queue in rings:
+        signal_queue.close()
+
+
+def _hardware_signal(number):
+    return {"message": "0110%05d" % number, "protocol": "BLUETOOTH", "source_type": "Bluetooth_Device"}
+
+
+def _produce(signal_queue, producer, count):
+    for number in range(count):
+        signal_queue.put((producer, number))
+
+
+def test_signals_of_every_producer_arrive_in_order(ring):
+    signal_queue = ring(capacity=16)
+    producers = [Process(target=_produce, args=(signal_queue, producer, 500)) for producer in range(3)]
+    for producer in producers:
+        producer.start()
+    last = {}
+    for _ in range(1500):
+        producer, number = signal_queue.get(timeout=5)
+        assert number == last.get(producer, -1) + 1
+        last[producer] = number
+    for producer in producers:
+        producer.join()
+    assert signal_queue.empty()
+
+
+def test_consumer_waiting_on_reader_is_woken(ring):
+    signal_queue = ring()
+    # A new ring wakes its consumer on first put, it has not read yet.
+    signal_queue.put(1)
+    assert wait([signal_queue._reader], timeout=1)
+    assert signal_queue.get_nowait() == 1
+    with pytest.raises(qq.Empty):
+        signal_queue.get_nowait()
+    signal_queue.put(2)
+    assert wait([signal_queue._reader], timeout=1)
+    assert signal_queue.get_nowait() == 2
+
+
+def _consume_one_and_die(signal_queue, armed):
+    # As logger: drain, wait, drain. Killed after reading one signal, before it finds ring empty again,
+    # so no wake up call is left for next consumer.
+    with pytest.raises(qq.Empty):
+        signal_queue.get_nowait()
+    armed.set()
+    wait([signal_queue._reader])
+    signal_queue.get_nowait()
+    os.kill(os.getpid(), os_signal.SIGKILL)
+
+
+def test_restarted_logger_gets_signals_left_by_killed_one(ring, tmp_path, monkeypatch):
+    pytest.importorskip("tables")
+    from core import ReceivedSignalsLogger
+
+    monkeypatch.setenv("HOME_DIR", str(tmp_path))
+    cloud_queue, hardware_queue, to_process_queue = ring(), ring(), Queue()
+    armed = Event()
+    dying = Process(target=_consume_one_and_die, args=(hardware_queue, armed))
+    dying.start()
+    assert armed.wait(5)
+    hardware_queue.put(_hardware_signal(0))
+    dying.join(5)
+    assert dying.exitcode == -os_signal.SIGKILL
+    hardware_queue.put(_hardware_signal(1))
+    hardware_queue.put(_hardware_signal(2))
+
+    logger = ReceivedSignalsLogger(cloud_queue, hardware_queue, to_process_queue)
+    logger.start()
+    try:
+        received = [to_process_queue.get(timeout=3)[1]["message"] for _ in range(2)]
+    finally:
+        logger.terminate()
+        logger.join(5)
+    assert received == ["011000001", "011000002"]
+
+
+def test_put_fails_when_ring_stays_full(ring):
+    signal_queue = ring(capacity=2)
+    signal_queue.put(1)
+    signal_queue.put(2)
+    with pytest.raises(qq.Full):
+        signal_queue.put_nowait(3)
+    started = time.monotonic()
+    with pytest.raises(qq.Full):
+        signal_queue.put(3, timeout=0.1)
+    assert time.monotonic() - started >= 0.1
+    assert signal_queue.get_nowait() == 1
+    signal_queue.put_nowait(3)
+    assert [signal_queue.get_nowait(), signal_queue.get_nowait()] == [2, 3]
+
+
+def test_producer_waiting_for_space_is_woken(ring):
+    signal_queue = ring(capacity=1)
+    signal_queue.put(1)
+    producer = Thread(target=signal_queue.put, args=(2,))
+    producer.start()
+    time.sleep(0.1)
+    assert producer.is_alive()
+    assert signal_queue.get(timeout=1) == 1
+    producer.join(1)
+    assert not producer.is_alive()
+    assert signal_queue.get(timeout=1) == 2
+
+
+def test_oversized_signal_is_refused(ring):
+    signal_queue = ring(record_size=64)
+    with pytest.raises(ValueError):
+        signal_queue.put("x" * 100)
+    assert signal_queue.empty()
+
+
+def test_offer_drops_signal_instead_of_raising(ring):
+    signal_queue = ring(capacity=1, record_size=64)
+    assert not offer_signal(signal_queue, "x" * 100)
+    assert offer_signal(signal_queue, 1)
+    assert not offer_signal(signal_queue, 2)  # Full, does not wait.
+    assert signal_queue.get_nowait() == 1
+
+
+def test_dropping_on_full_ring_never_blocks_consumer(ring):
+    # Each failed offer used to leave a wake up call for producers nobody waited for, till the pipe was full.
+    signal_queue = ring(capacity=1, record_size=64)
+
+    def overload():
+        for _ in range(30000):
+            offer_signal(signal_queue, 1)
+            offer_signal(signal_queue, 2)
+            signal_queue.get_nowait()
+
+    consumer = Thread(target=overload, daemon=True)
+    consumer.start()
+    consumer.join(30)
+    assert not consumer.is_alive()
+
+
+def test_listeners_count_signals_they_can_not_hand_over(ring, monkeypatch):
+    monkeypatch.setattr(nh, "TRACE_ENABLED", False)
+    signal_queue = ring(capacity=1, record_size=512)
+
+    mqtt_client = MqttClient(None)
+    mqtt_client.set_output_queue(signal_queue)
+    on_message = mqtt_client._MqttClient__on_message
+    for payload in (b"x" * 600, b"\xff\xfe", b"token"):
+        on_message(None, None, types.SimpleNamespace(topic="cloud/1", payload=payload))
+    assert mqtt_client.dropped == 2
+    assert signal_queue.get_nowait()["message"] == "token"
+
+    bt_client = BluetoothClient()
+    bt_client.set_output_queue(signal_queue)
+    bt_client._BluetoothClient__framer = SignalFramer()
+    bt_client._handle_bytes(b"011001025011001026")
+    stats = bt_client.connection_stats()
+    assert (stats["received"], stats["dropped"]) == (1, 1)
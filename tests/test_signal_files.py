@@ -0,0 +1,68 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+import os
+import time
+
+import pytest
+
+tb = pytest.importorskip("tables")
+
+import name_helper as nh  # noqa: E402
+from core.signal_package import SignalFileHandler  # noqa: E402
+from core.signal_package.signal_query import SignalQuery  # noqa: E402
+
+
+def _file(directory, day, sequence):
+    file_name = os.path.join(directory, "%s%s_%03d.h5" % (nh.SIGNAL_FILE_PREFIX, day, sequence))
+    SignalFileHandler.create_file(file_name, chunk_bytes=None)
+    return file_name
+
+
+def test_files_are_ordered_by_sequence_number(tmp_path, monkeypatch):
+    monkeypatch.setattr(nh, "SIGNAL_FILE_MAX_SIZE", None)
+    day = time.strftime("%Y%m%d")
+    names = [_file(str(tmp_path), day, sequence) for sequence in (998, 999, 1000)]
+    handler = SignalFileHandler(str(tmp_path))
+    assert handler.signal_files() == names
+    # Latest file is kept, not computed again and replaced.
+    assert handler.active_file() == names[-1]
+
+
+def test_query_finds_rows_flushed_into_next_days_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME_DIR", str(tmp_path))
+    handler = SignalFileHandler()
+    os.makedirs(handler.directory)
+    midnight = handler.day_start("20260102")
+    _file(handler.directory, "20260101", 0)
+    next_day_file = _file(handler.directory, "20260102", 0)
+    with tb.open_file(next_day_file, "a") as signals_file:
+        table = signals_file.get_node("/%s/%s" % (nh.HARDWARE_SIGNAL_GROUP_NAME, nh.HARDWARE_SIGNAL_TABLE_NAME))
+        row = table.row
+        row["name"], row["message"], row["incoming_time"] = 1, "011001001", midnight - 0.5
+        row.append()
+
+    with SignalQuery() as query:
+        assert query.count(query.hardware_signals(start=midnight - 3600, end=midnight)) == 1
+
+
+def test_query_reads_matches_in_chunks_and_skips_file_being_written(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME_DIR", str(tmp_path))
+    monkeypatch.setattr(nh, "SIGNAL_FILE_MAX_SIZE", None)
+    monkeypatch.setattr(nh, "SIGNAL_QUERY_WINDOW_ROWS", 7)
+    handler = SignalFileHandler()
+    os.makedirs(handler.directory)
+    yesterday = time.strftime("%Y%m%d", time.localtime(time.time() - 86400))
+    for day in (yesterday, time.strftime("%Y%m%d")):
+        with tb.open_file(_file(handler.directory, day, 0), "a") as signals_file:
+            table = signals_file.get_node("/%s/%s" % (nh.HARDWARE_SIGNAL_GROUP_NAME, nh.HARDWARE_SIGNAL_TABLE_NAME))
+            for name in range(20):
+                row = table.row
+                row["name"], row["zone"], row["incoming_time"] = name, name % 2, time.time() - 3600
+                row.append()
+
+    assert handler.written_file() == handler.signal_files()[-1]
+    with SignalQuery(chunk_size=3) as query:
+        chunks = list(query.hardware_signals(zone=1))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1, 3]  # 3, 4 and 3 matches per window of 7 rows.
+    assert [int(name) for chunk in chunks for name in chunk["name"]] == list(range(1, 20, 2))
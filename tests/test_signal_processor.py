@@ -0,0 +1,43 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+import time
+from multiprocessing import Queue
+
+import name_helper as nh
+from core.signal_processor import output_queue_processor
+from core.signal_processor.output_queue_processor import OutputSignalQueueProcessor
+
+
+def _slow_decode(prefix, message):
+    # Runs in decoder processes (forked after patch). One slow signal, others take a while too.
+    time.sleep(1.0 if message == "slow" else 0.2)
+    if message == "bad":
+        raise ValueError("Can not decode")
+    return message, ("01", "1", message)
+
+
+def test_signals_are_decoded_in_parallel_and_routed_in_order(monkeypatch):
+    dispatched = Queue()
+    monkeypatch.setattr(output_queue_processor, "_decode_signal", _slow_decode)
+    monkeypatch.setattr(OutputSignalQueueProcessor, "_dispatch",
+                        lambda self, prefix, signal_text, device_key, trace=None: dispatched.put(signal_text))
+    signals = Queue()
+    processor = OutputSignalQueueProcessor(signals, workers=1, decoders=2)
+    processor.start()
+    try:
+        time.sleep(0.5)  # Decoders started.
+        messages = ["slow", "a", "bad", "b", "c", "d", "e"]
+        started = time.monotonic()
+        for message in messages:
+            signals.put((nh.CLOUD_SIGNAL_PREFIX, {"message": message}))
+        signals.put(("unknown", {"message": "x"}))
+        received = [dispatched.get(timeout=5) for _ in range(6)]
+        elapsed = time.monotonic() - started
+    finally:
+        processor.terminate()
+        processor.join(10)
+
+    assert received == ["slow", "a", "b", "c", "d", "e"]
+    assert elapsed < 1.6  # Decoded one after the other it takes 2.2 s.
+    assert processor.rejected() == 2
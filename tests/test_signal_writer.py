@@ -0,0 +1,29 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+import pytest
+
+tb = pytest.importorskip("tables")
+
+import name_helper as nh  # noqa: E402
+from core.signal_package import SignalFileHandler, SignalWriter  # noqa: E402
+
+
+def test_odd_text_is_stored_without_failing_batch(tmp_path):
+    file_name = str(tmp_path / "signals.h5")
+    SignalFileHandler.create_file(file_name, chunk_bytes=None)
+    with SignalWriter(file_name, buffer_size=4) as signal_writer:
+        signal_writer.save_cloud_signal(1, "cloud/1/light/1/on", "MQTT", "Remote_MQTT_Broker")
+        signal_writer.save_cloud_signal(2, "lumière ☃ 灯", "MQTT", "Remote_MQTT_Broker")
+        signal_writer.save_cloud_signal(3, "☃" * 100, "MQTT", "Remote_MQTT_Broker")  # 300 bytes in 128
+        signal_writer.save_hardware_signal(4, "01100102²", "BLUETOOTH", "Bluetooth_Device")
+
+    with tb.open_file(file_name) as signals_file:
+        cloud = signals_file.get_node("/%s/%s" % (nh.CLOUD_SIGNAL_GROUP_NAME, nh.CLOUD_SIGNAL_TABLE_NAME)).read()
+        hardware = signals_file.get_node("/%s/%s" % (nh.HARDWARE_SIGNAL_GROUP_NAME,
+                                                     nh.HARDWARE_SIGNAL_TABLE_NAME)).read()
+    messages = [message.decode("utf-8") for message in cloud["message"]]
+    assert messages[:2] == ["cloud/1/light/1/on", "lumière ☃ 灯"]
+    assert messages[2] == "☃" * 42  # Cut at a whole character.
+    assert hardware["message"][0].decode("utf-8") == "01100102²"
+    assert hardware["zone"][0] == 0
@@ -0,0 +1,207 @@
+# Author: Saurav Gupta
+# Date Created: Oct. 18, 2026
+
+"""
+Latency tracing of signals, from reception till transmission to hardware (rf433) or cloud (MQTT).
+A trace is a dict which travels with its signal through queues of all processes. It holds an id and monotonic
+timestamps (time.monotonic_ns, same clock in all processes) of stages passed so far.
+Every process keeps histograms of time taken to reach each stage from previous one (and of whole way, from
+reception to a final stage) and writes their summary to a snapshot file every TRACE_SNAPSHOT_INTERVAL seconds:
+    <HOME_DIR>/<TRACE_SNAPSHOT_DIR>/latency_<process name>.json
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+from os import environ as env
+
+import name_helper as nh
+
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS  # Buckets per power of two, a value is reported within 1/64 of its true value.
+
+_tracer = None
+_tracer_pid = None
+_tracer_lock = threading.Lock()
+_current = threading.local()
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations in nanoseconds (as in HdrHistogram): fixed memory, constant time to record.
+    """
+
+    def __init__(self):
+        self.counts = {}  # bucket: count
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _bucket(value):
+        if value < 2 * _SUB_BUCKETS:
+            return max(value, 0)
+        shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+        return shift * _SUB_BUCKETS + (value >> shift)
+
+    @staticmethod
+    def _bucket_middle(bucket):
+        if bucket < 2 * _SUB_BUCKETS:
+            return bucket
+        shift = bucket // _SUB_BUCKETS - 1
+        return ((bucket - shift * _SUB_BUCKETS) << shift) + (1 << shift) // 2
+
+    def record(self, value):
+        """:param value: duration in nanoseconds."""
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """:return: duration (nanoseconds) below which given percent of recorded durations lie, 0 if none."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self._bucket_middle(bucket), self.max)
+        return self.max
+
+    def summary(self):
+        """:return: dict with count and mean, p50, p95, p99, max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count / 1e6 if self.count else 0.0,
+            "p50_ms": self.percentile(50) / 1e6,
+            "p95_ms": self.percentile(95) / 1e6,
+            "p99_ms": self.percentile(99) / 1e6,
+            "max_ms": self.max / 1e6,
+        }
+
+
+class LatencyTracer:
+    """
+    Stage latencies and counters of one process. Thread safe.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__histograms = {}  # stage: LatencyHistogram
+        self.__counters = {}
+        self.__started_at = time.time()
+
+    def record(self, stage, duration_ns):
+        with self.__lock:
+            histogram = self.__histograms.get(stage)
+            if histogram is None:
+                histogram = self.__histograms[stage] = LatencyHistogram()
+            histogram.record(duration_ns)
+
+    def increment(self, counter, amount=1):
+        with self.__lock:
+            self.__counters[counter] = self.__counters.get(counter, 0) + amount
+
+    def snapshot(self):
+        """:return: dict with summary of every stage histogram and all counters (JSON serializable)."""
+        with self.__lock:
+            return {
+                "process": multiprocessing.current_process().name,
+                "pid": os.getpid(),
+                "started_at": self.__started_at,
+                "time": time.time(),
+                "stages": {stage: histogram.summary() for stage, histogram in self.__histograms.items()},
+                "counters": dict(self.__counters),
+            }
+
+    @staticmethod
+    def snapshot_file():
+        return os.path.join(env["HOME_DIR"], nh.TRACE_SNAPSHOT_DIR,
+                            "latency_%s.json" % multiprocessing.current_process().name)
+
+    def write_snapshot(self, file_name=None):
+        """
+        Writes snapshot as JSON. File is replaced at once, a reader never sees half written file.
+        :return: Path of snapshot file.
+        """
+        file_name = file_name or self.snapshot_file()
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        temp_file = "%s.%d.tmp" % (file_name, os.getpid())
+        with open(temp_file, "w") as snapshot_file:
+            json.dump(self.snapshot(), snapshot_file, indent=2, sort_keys=True)
+        os.replace(temp_file, file_name)
+        return file_name
+
+    def _write_periodically(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.write_snapshot()
+            except OSError:
+                # TODO: Log error while writing latency snapshot.
+                pass
+
+
+def get_tracer():
+    """
+    Returns tracer of current process. Its snapshot writer thread is started on first use.
+    A tracer inherited from parent process (after fork) is not reused, its writer thread does not exist here.
+    :return: LatencyTracer object
+    """
+    global _tracer, _tracer_pid
+    with _tracer_lock:
+        if _tracer is None or _tracer_pid != os.getpid():
+            _tracer = LatencyTracer()
+            _tracer_pid = os.getpid()
+            if nh.TRACE_SNAPSHOT_INTERVAL:
+                threading.Thread(target=_tracer._write_periodically, args=(nh.TRACE_SNAPSHOT_INTERVAL,),
+                                 name="latency_snapshot", daemon=True).start()
+        return _tracer
+
+
+def start_trace():
+    """
+    Starts trace of a received signal.
+    :return: trace (dict), None if tracing is disabled.
+    """
+    if not nh.TRACE_ENABLED:
+        return None
+    get_tracer().increment(nh.TRACE_STAGE_RECEIVED)
+    return {"id": os.urandom(8).hex(), "stages": [(nh.TRACE_STAGE_RECEIVED, time.monotonic_ns())]}
+
+
+def mark(trace, stage):
+    """
+    Records that signal of trace reached stage now, latency from previous stage is added to stage's histogram
+    (and from reception to "total_<stage>" for final stages).
+    :param trace: trace of signal or None (not traced).
+    :param stage: name of stage.
+    :return: None
+    """
+    if trace is None:
+        return
+    now = time.monotonic_ns()
+    tracer = get_tracer()
+    tracer.record(stage, now - trace["stages"][-1][1])
+    if stage in nh.TRACE_FINAL_STAGES:
+        tracer.record("total_" + stage, now - trace["stages"][0][1])
+    trace["stages"].append((stage, now))
+
+
+def set_current(trace):
+    """
+    Makes trace the trace of signal being handled by this thread, so that code deep down (transmitters) can mark
+    its stages without trace being passed to every call.
+    """
+    _current.trace = trace
+
+
+def current():
+    """:return: trace set by set_current in this thread, None if there is none."""
+    return getattr(_current, "trace", None)